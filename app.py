@@ -2,11 +2,25 @@
 Основной класс приложения
 """
 
+import time
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk
-from config import WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_TITLE, COLORS, FONTS
-from data.loader import DataLoader
-from data.progress import ProgressManager
+from config import (WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_TITLE, COLORS, FONTS, DATA_FILES,
+                    LOAD_POLL_INTERVAL_MS, WATCH_INTERVAL_MS)
+from data.backend import get_data_loader, get_progress_manager, uses_text_files
+from data.cache import DataCache
+from data.cross_reference import CrossReference
+from data.exercise_bank import ExerciseBank
+from data.exercise_sampler import ExerciseSampler
+from data.item_stats import ItemStats
+from data.rule_book import RuleBook
+from data.scheduler import ReviewScheduler
+from data.store import WordStore
+from data.watcher import FileWatcher
+from utils.aho_corasick import DictionaryHighlighter
+from utils.search_index import WordSearchIndex
+from utils.text_index import TextIndex
 from ui.words_tab import WordsTab
 from ui.exercises_tab import ExercisesTab
 from ui.rules_tab import RulesTab
@@ -17,20 +31,36 @@ class EnglishLearningApp:
     
     def __init__(self, root):
         self.root = root
+        self.data_loader = get_data_loader()
+        self.progress_manager = get_progress_manager()
+        self.startup_started = time.perf_counter()
+        self.startup_timings = {}
         self.setup_window()
         
-        # Загрузка данных
-        self.words_data = DataLoader.load_words()
-        self.exercises_data = DataLoader.load_exercises()
-        self.rules_data = DataLoader.load_rules()
+        # Пустые данные до окончания фоновой загрузки
+        self.words_data = WordStore()
+        self.word_index = WordSearchIndex()
+        self.word_highlighter = DictionaryHighlighter()
+        self.exercises_data = ExerciseBank({}, lambda topic: [])
+        self.rules_data = RuleBook([], lambda index: '')
+        self.exercises_search = TextIndex()
+        self.rules_search = TextIndex()
+        self.cross_reference = CrossReference()
+        self.scheduler = ReviewScheduler()
+        self.item_stats = ItemStats()
+        self.exercise_sampler = ExerciseSampler(self.exercises_data)
+        self.progress_data = {'score': 0, 'total_attempts': 0}
+        self.score = 0
+        self.total_attempts = 0
+        self.loaded_sources = set()
+        self.data_watcher = None
         
-        # Загрузка прогресса
-        self.progress_data = ProgressManager.load()
-        self.score = self.progress_data.get('score', 0)
-        self.total_attempts = self.progress_data.get('total_attempts', 0)
-        
-        # Создание интерфейса
+        # Создание интерфейса сразу, вкладки заполнятся по мере загрузки
         self.create_widgets()
+        self.record_timing('widgets')
+        
+        # Параллельная загрузка данных
+        self.start_loading()
         
         # Сохранение прогресса при закрытии
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -51,11 +81,211 @@ class EnglishLearningApp:
     def on_closing(self):
         """Обработка закрытия приложения"""
         self.save_progress()
+        if self.data_watcher:
+            self.data_watcher.stop()
+        self.loading_executor.shutdown(wait=False)
         self.root.destroy()
     
     def save_progress(self):
         """Сохранение прогресса"""
-        ProgressManager.save(self.score, self.total_attempts)
+        # Пока прогресс не загружен, запись затерла бы сохраненный файл
+        if 'progress' not in self.loaded_sources:
+            return
+        self.progress_manager.save(self.score, self.total_attempts)
+        if 'schedule' in self.loaded_sources:
+            self.scheduler.save()
+        if 'item_stats' in self.loaded_sources:
+            self.item_stats.save()
+    
+    def record_timing(self, phase):
+        """Запомнить время от начала запуска до завершения этапа"""
+        self.startup_timings[phase] = time.perf_counter() - self.startup_started
+    
+    def start_loading(self):
+        """Запуск загрузки данных, прогресса, расписания повторений и истории ответов в пуле потоков"""
+        self.data_loader.ensure_data_files()
+        
+        self.loaders = {
+            'words': self.load_words_indexed,
+            'exercises': self.data_loader.load_exercises,
+            'rules': self.data_loader.load_rules,
+            'progress': self.progress_manager.load,
+            'schedule': ReviewScheduler.load,
+            'item_stats': ItemStats.load
+        }
+        self.loading_executor = ThreadPoolExecutor(
+            max_workers=len(self.loaders), thread_name_prefix='loader'
+        )
+        self.loading_futures = {}
+        self.loading_poll_scheduled = False
+        
+        for name in self.loaders:
+            self.submit_loading(name)
+    
+    def load_words_indexed(self):
+        """Загрузка слов, построение поискового индекса и автомата подсветки (в фоновом потоке)"""
+        words = self.data_loader.load_words()
+        return words, WordSearchIndex(words), DictionaryHighlighter(words)
+    
+    def submit_loading(self, name, loader=None):
+        """
+        Запуск (пере)загрузки одного источника в фоновом потоке
+        
+        loader по умолчанию берется из self.loaders; поисковые индексы
+        передают свой построитель, так как строятся по уже загруженным данным.
+        """
+        loader = loader or self.loaders[name]
+        is_startup = 'ready' not in self.startup_timings
+        
+        def timed():
+            started = time.perf_counter()
+            result = loader()
+            if is_startup:
+                self.startup_timings[f'{name}_load'] = time.perf_counter() - started
+            return result
+        
+        self.loading_futures[name] = self.loading_executor.submit(timed)
+        if not self.loading_poll_scheduled:
+            self.loading_poll_scheduled = True
+            self.root.after(LOAD_POLL_INTERVAL_MS, self.poll_loading)
+    
+    def poll_loading(self):
+        """Проверка завершенных загрузок (выполняется в потоке Tk)"""
+        for name, future in list(self.loading_futures.items()):
+            if not future.done():
+                continue
+            del self.loading_futures[name]
+            
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Ошибка загрузки ({name}): {e}")
+                continue
+            
+            is_startup = 'ready' not in self.startup_timings
+            self.apply_loaded_data(name, result)
+            if is_startup:
+                self.record_timing(f'{name}_ready')
+        
+        if self.loading_futures:
+            self.root.after(LOAD_POLL_INTERVAL_MS, self.poll_loading)
+            return
+        
+        self.loading_poll_scheduled = False
+        # Кэш разобранных файлов записывается один раз за цикл загрузки
+        self.loading_executor.submit(DataCache.flush)
+        if 'ready' not in self.startup_timings:
+            self.record_timing('ready')
+            self.print_startup_timings()
+            self.start_watching()
+    
+    def apply_loaded_data(self, name, result):
+        """
+        Подстановка загруженных данных и обновление соответствующей вкладки
+        
+        Данные заменяются на месте, поэтому вкладки, уже получившие ссылки
+        на words_data, exercises_data и rules_data, видят новое содержимое.
+        """
+        self.loaded_sources.add(name)
+        
+        if name == 'words':
+            words, self.word_index, self.word_highlighter = result
+            self.words_data.replace(words)
+            self.scheduler.sync(self.words_data)
+            # Карточка перерисовывается: слово могло измениться или удалиться
+            self.words_tab.show_word()
+            self.words_tab.update_search_results()
+            self.rules_tab.refresh_word_links()
+            self.exercises_tab.refresh_word_links()
+            self.stats_tab.update_words()
+        elif name == 'exercises':
+            self.exercises_data.replace(result)
+            self.exercise_sampler.invalidate()
+            self.exercises_tab.populate_topics()
+            self.submit_loading('exercises_search', lambda: TextIndex.for_exercises(result))
+            self.submit_cross_reference()
+        elif name == 'rules':
+            self.rules_data.replace(result)
+            self.rules_tab.populate_rules()
+            self.submit_loading('rules_search', lambda: TextIndex.for_rules(result))
+            self.submit_cross_reference()
+        elif name == 'word_highlighter':
+            # Автомат мог устареть, если словарь за это время перезагрузился
+            highlighter, rebuilt = result
+            if highlighter is self.word_highlighter:
+                highlighter.finish_rebuild(rebuilt)
+        elif name == 'exercises_search':
+            self.exercises_search = result
+        elif name == 'rules_search':
+            self.rules_search = result
+        elif name == 'cross_reference':
+            self.cross_reference = result
+            self.words_tab.refresh_cross_reference()
+        elif name == 'progress':
+            # Ответы, данные до окончания загрузки, прибавляются к сохраненным
+            self.progress_data = result
+            self.score += result.get('score', 0)
+            self.total_attempts += result.get('total_attempts', 0)
+            self.stats_tab.update()
+        elif name == 'schedule':
+            # Ответы, данные до окончания загрузки, заменяют сохраненное состояние слов
+            result.merge(self.scheduler)
+            self.scheduler = result
+            self.scheduler.sync(self.words_data)
+        elif name == 'item_stats':
+            # Ответы, данные до окончания загрузки, добавляются к сохраненным
+            result.merge(self.item_stats)
+            self.item_stats = result
+            self.exercise_sampler.invalidate()
+    
+    def rebuild_word_highlighter(self):
+        """Перестройка автомата подсветки с добавленными словами в фоновом потоке"""
+        highlighter = self.word_highlighter
+        build = highlighter.start_rebuild()
+        self.submit_loading('word_highlighter', lambda: (highlighter, build()))
+    
+    def submit_cross_reference(self):
+        """Построение связи слов с упражнениями и правилами, когда загружены и те, и другие"""
+        if not {'exercises', 'rules'} <= self.loaded_sources:
+            return
+        exercises, rules = self.exercises_data, self.rules_data
+        self.submit_loading(
+            'cross_reference', lambda: self.data_loader.load_cross_reference(exercises, rules)
+        )
+    
+    def start_watching(self):
+        """Запуск отслеживания изменений файлов данных"""
+        if WATCH_INTERVAL_MS <= 0 or not uses_text_files():
+            return
+        
+        self.data_watcher = FileWatcher(
+            self.root,
+            {name: DATA_FILES[name] for name in ('words', 'exercises', 'rules')},
+            self.on_data_file_changed
+        )
+        self.data_watcher.start()
+    
+    def on_data_file_changed(self, name):
+        """Перезагрузка измененного файла данных"""
+        print(f"Файл данных изменен, перезагрузка: {DATA_FILES[name]}")
+        self.submit_loading(name)
+    
+    def mark_data_saved(self, name):
+        """Отметить, что файл данных изменило само приложение (перезагрузка не нужна)"""
+        if self.data_watcher:
+            self.data_watcher.acknowledge(name)
+    
+    def print_startup_timings(self):
+        """
+        Вывод времени этапов запуска
+        
+        *_load - длительность загрузки источника в фоновом потоке,
+        остальные этапы - время от начала запуска до их завершения.
+        """
+        phases = ', '.join(
+            f"{phase}: {seconds * 1000:.1f} мс" for phase, seconds in self.startup_timings.items()
+        )
+        print(f"Время запуска - {phases}")
     
     def create_widgets(self):
         """Создание виджетов интерфейса"""
@@ -90,19 +320,19 @@ class EnglishLearningApp:
     def create_tabs(self):
         """Создание всех вкладок"""
         # Вкладка изучения слов (с встроенным тестом)
-        words_frame = tk.Frame(self.notebook, bg=COLORS['light'])
-        self.notebook.add(words_frame, text='📖 Словарь')
-        self.words_tab = WordsTab(words_frame, self)
+        self.words_frame = tk.Frame(self.notebook, bg=COLORS['light'])
+        self.notebook.add(self.words_frame, text='📖 Словарь')
+        self.words_tab = WordsTab(self.words_frame, self)
         
         # Вкладка упражнений
-        exercises_frame = tk.Frame(self.notebook, bg=COLORS['light'])
-        self.notebook.add(exercises_frame, text='✏️ Упражнения')
-        self.exercises_tab = ExercisesTab(exercises_frame, self)
+        self.exercises_frame = tk.Frame(self.notebook, bg=COLORS['light'])
+        self.notebook.add(self.exercises_frame, text='✏️ Упражнения')
+        self.exercises_tab = ExercisesTab(self.exercises_frame, self)
         
         # Вкладка правил
-        rules_frame = tk.Frame(self.notebook, bg=COLORS['light'])
-        self.notebook.add(rules_frame, text='📋 Правила')
-        self.rules_tab = RulesTab(rules_frame, self)
+        self.rules_frame = tk.Frame(self.notebook, bg=COLORS['light'])
+        self.notebook.add(self.rules_frame, text='📋 Правила')
+        self.rules_tab = RulesTab(self.rules_frame, self)
         
         # Вкладка статистики
         stats_frame = tk.Frame(self.notebook, bg=COLORS['light'])
@@ -0,0 +1,5 @@
+"""
+Бенчмарки производительности
+
+Запуск из корня проекта: python -m benchmarks.<имя_модуля>
+"""
@@ -0,0 +1,72 @@
+"""
+Пакетная проверка журнала ответов против проверки по одной строке,
+с построчной сверкой результатов
+
+Запуск: python -m benchmarks.bench_batch_grading
+"""
+
+import random
+import time
+from benchmarks.bench_grading import make_attempts
+from utils import helpers
+from utils.helpers import check_answer_match, compile_answer, grade_answers_batch
+
+LOG_ROWS = 1_000_000
+
+def make_log(rows, rng):
+    """Журнал: ответы пользователя, номера правильных ответов и сами ответы"""
+    attempts = make_attempts(rng)
+    correct_answers = sorted({correct for _, correct in attempts})
+    answer_ids = {answer: answer_id for answer_id, answer in enumerate(correct_answers)}
+    
+    # Ответы с опечатками, чтобы проверить и вердикт «почти правильно»
+    attempts += [(user[:-2] + user[-1:], correct) for user, correct in attempts if len(user) > 5]
+    
+    sample = [rng.choice(attempts) for _ in range(rows)]
+    return ([user for user, _ in sample],
+            [answer_ids[correct] for _, correct in sample],
+            correct_answers)
+
+def mismatches(batch_result, expected):
+    """Количество строк, где пакетная проверка разошлась с построчной"""
+    return sum(got != want for got, want in zip(list(batch_result), expected))
+
+def main():
+    user_answers, answer_ids, correct_answers = make_log(LOG_ROWS, random.Random(5))
+    print(f"Строк в журнале: {len(user_answers):,}, правильных ответов: {len(correct_answers):,}")
+    
+    started = time.perf_counter()
+    expected = [
+        check_answer_match(user, correct_answers[answer_id])
+        for user, answer_id in zip(user_answers, answer_ids)
+    ]
+    scalar = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    matched = grade_answers_batch(user_answers, answer_ids, correct_answers)
+    batch = time.perf_counter() - started
+    
+    engine = "NumPy" if helpers.np is not None else "списки"
+    print(f"check_answer_match по строкам: {scalar:>7.2f} с")
+    print(f"grade_answers_batch ({engine}): {batch:>7.2f} с ({scalar / batch:.1f}x)")
+    print(f"Расхождений с check_answer_match: {mismatches(matched, expected)}")
+    
+    expected_verdicts = [
+        compile_answer(correct_answers[answer_id]).grade(user)
+        for user, answer_id in zip(user_answers, answer_ids)
+    ]
+    verdicts = grade_answers_batch(user_answers, answer_ids, correct_answers, verdicts=True)
+    print(f"Расхождений с AnswerMatcher.grade: {mismatches(verdicts, expected_verdicts)}")
+    
+    # Тот же журнал без NumPy
+    numpy_module, helpers.np = helpers.np, None
+    try:
+        fallback = grade_answers_batch(user_answers, answer_ids, correct_answers)
+        fallback_verdicts = grade_answers_batch(user_answers, answer_ids, correct_answers, verdicts=True)
+    finally:
+        helpers.np = numpy_module
+    print(f"Без NumPy расхождений: {mismatches(fallback, expected)}, "
+          f"вердиктов: {mismatches(fallback_verdicts, expected_verdicts)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Задержка поиска с опечатками: обход дерева против перебора словаря
+
+Запуск: python -m benchmarks.bench_fuzzy
+"""
+
+import random
+from benchmarks.bench_search import make_words, average_ms
+from config import FUZZY_MAX_DISTANCE
+from utils.search_index import WordSearchIndex
+
+SIZES = (10_000, 100_000, 500_000)
+QUERIES = 50
+BRUTE_FORCE_QUERIES = 2
+
+def misspell(word, rng):
+    """Одна случайная опечатка: пропуск, замена или перестановка букв"""
+    position = rng.randrange(len(word) - 1)
+    kind = rng.choice(('delete', 'replace', 'swap'))
+    if kind == 'delete':
+        return word[:position] + word[position + 1:]
+    if kind == 'replace':
+        return word[:position] + rng.choice('aeioukrst') + word[position + 1:]
+    return word[:position] + word[position + 1] + word[position] + word[position + 2:]
+
+def edit_distance(first, second):
+    """Расстояние Левенштейна (полная таблица)"""
+    previous_row = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        row = [i]
+        for j, second_char in enumerate(second, 1):
+            row.append(min(row[j - 1] + 1, previous_row[j] + 1,
+                           previous_row[j - 1] + (first_char != second_char)))
+        previous_row = row
+    return previous_row[-1]
+
+def main():
+    rng = random.Random(7)
+    print(f"Максимальное число опечаток: {FUZZY_MAX_DISTANCE}")
+    print(f"{'слов':>8} | {'дерево, мс':>10} | {'перебор, мс':>11} | {'найдено':>7}")
+    for size in SIZES:
+        words = make_words(size, rng)
+        index = WordSearchIndex(words)
+        targets = rng.sample(range(size), QUERIES)
+        queries = [misspell(words[target].word, rng) for target in targets]
+        
+        found = sum(
+            target in index.fuzzy_search(query)
+            for target, query in zip(targets, queries)
+        )
+        fuzzy_ms = average_ms(index.fuzzy_search, queries)
+        brute_force_ms = average_ms(
+            lambda query: [i for i, word in enumerate(words)
+                           if edit_distance(query, word.word) <= FUZZY_MAX_DISTANCE],
+            queries[:BRUTE_FORCE_QUERIES]
+        )
+        print(f"{size:>8} | {fuzzy_ms:>10.2f} | {brute_force_ms:>11.1f} | {found:>4}/{QUERIES}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Скорость проверки ответов: разбор правильного ответа при каждой проверке
+против заранее разобранных вариантов
+
+Запуск: python -m benchmarks.bench_grading
+"""
+
+import random
+import time
+from data.loader import DataLoader
+from utils.helpers import check_answer_match, compile_answer
+
+ROUNDS = 20
+
+def legacy_normalize_answer(answer):
+    """Прежняя нормализация (список артиклей создается при каждом вызове)"""
+    normalized = ' '.join(answer.lower().strip().split())
+    articles = ['a ', 'an ', 'the ']
+    for article in articles:
+        if normalized.startswith(article):
+            normalized = normalized[len(article):]
+            break
+    return normalized.rstrip('.')
+
+def legacy_parse_answer_variants(answer_string):
+    """Прежний разбор вариантов ответа"""
+    separators = [',', '/', ';']
+    variants = [answer_string]
+    for separator in separators:
+        if separator in answer_string:
+            variants = answer_string.split(separator)
+            break
+    return [normalized for normalized in map(legacy_normalize_answer, variants) if normalized]
+
+def legacy_check_answer_match(user_answer, correct_answer):
+    """Прежняя проверка: правильный ответ разбирается заново при каждом вызове"""
+    correct_variants = legacy_parse_answer_variants(correct_answer)
+    user_variants = legacy_parse_answer_variants(user_answer)
+    if len(user_variants) == 1:
+        return user_variants[0] in correct_variants
+    user_set = set(user_variants)
+    return user_set.issubset(set(correct_variants)) and len(user_set) > 0
+
+def make_attempts(rng):
+    """Пары (ответ пользователя, правильный ответ) по словарю и упражнениям"""
+    answers = [word.translation for word in DataLoader.load_words()]
+    answers += [word.word for word in DataLoader.load_words()]
+    exercises = DataLoader.load_exercises()
+    for topic in exercises:
+        answers.extend(exercise.answer for exercise in exercises[topic])
+    
+    attempts = []
+    for answer in answers:
+        variants = legacy_parse_answer_variants(answer) or ['']
+        attempts.append((rng.choice(variants).upper() + '.', answer))
+        attempts.append((rng.choice(answers), answer))
+    return attempts
+
+def rate(function, attempts):
+    """Проверок в секунду"""
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for user_answer, correct_answer in attempts:
+            function(user_answer, correct_answer)
+    return ROUNDS * len(attempts) / (time.perf_counter() - started)
+
+def main():
+    attempts = make_attempts(random.Random(3))
+    
+    mismatches = sum(
+        legacy_check_answer_match(user, correct) != check_answer_match(user, correct)
+        for user, correct in attempts
+    )
+    print(f"Проверок в наборе: {len(attempts)}, расхождений с прежней проверкой: {mismatches}")
+    
+    for _, correct_answer in attempts:
+        compile_answer(correct_answer)
+    matchers = [(user, compile_answer(correct)) for user, correct in attempts]
+    
+    legacy = rate(legacy_check_answer_match, attempts)
+    cached = rate(check_answer_match, attempts)
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for user_answer, matcher in matchers:
+            matcher.matches(user_answer)
+    precompiled = ROUNDS * len(matchers) / (time.perf_counter() - started)
+    
+    print(f"Прежняя проверка:            {legacy:>12,.0f} проверок/с")
+    print(f"check_answer_match (кэш):    {cached:>12,.0f} проверок/с ({cached / legacy:.1f}x)")
+    print(f"AnswerMatcher.matches:       {precompiled:>12,.0f} проверок/с ({precompiled / legacy:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+История ответов на сотни тысяч элементов: обновление в памяти,
+сохранение и загрузка файла
+
+Запуск: python -m benchmarks.bench_item_stats
+"""
+
+import os
+import random
+import tempfile
+import time
+import config
+from data.item_stats import ItemStats
+
+ITEM_COUNT = 300_000
+UPDATES = 1_000_000
+
+def main():
+    rng = random.Random(13)
+    item_ids = [ItemStats.item_id(f"word:item{number}") for number in range(ITEM_COUNT)]
+    stats = ItemStats()
+    
+    started = time.perf_counter()
+    for _ in range(UPDATES):
+        stats.record(rng.choice(item_ids), rng.random() < 0.7)
+    updates = time.perf_counter() - started
+    print(f"{UPDATES:,} ответов по {len(stats):,} элементам: {updates / UPDATES * 1e6:.2f} мкс на ответ")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        config.DATA_FILES['item_stats'] = os.path.join(directory, 'item_stats.bin')
+        
+        started = time.perf_counter()
+        stats.save()
+        saved = time.perf_counter() - started
+        size = os.path.getsize(config.DATA_FILES['item_stats'])
+        
+        started = time.perf_counter()
+        loaded = ItemStats.load()
+        loading = time.perf_counter() - started
+        
+        sample = rng.sample(item_ids, 1000)
+        same = all(loaded.get(item_id) == stats.get(item_id) for item_id in sample)
+    
+    print(f"Файл: {size / 1024 / 1024:.1f} МБ, запись {saved * 1000:.1f} мс, "
+          f"загрузка {loading * 1000:.1f} мс, данные совпадают: {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Сравнение памяти: список словарей против компактного хранилища
+
+Запуск: python -m benchmarks.bench_memory [количество слов]
+"""
+
+import gc
+import sys
+import tracemalloc
+from data.store import WordStore, WordEntry, ExerciseEntry
+
+TOPICS = ['Present Simple', 'Past Simple', 'Future Simple', 'Present Continuous',
+          'Past Continuous', 'Present Perfect', 'Present Perfect Continuous',
+          'Past Perfect', 'Future Continuous']
+
+def make_word_rows(count):
+    """Синтетические строки словаря"""
+    for i in range(count):
+        yield (f"word{i}", f"перевод{i}", f"[wɜːd{i}]",
+               f"This is example sentence number {i}.", f"Это пример номер {i}.")
+
+def make_exercise_rows(count):
+    """Синтетические строки упражнений (название темы создается заново, как при разборе)"""
+    for i in range(count):
+        topic = ''.join(TOPICS[i % len(TOPICS)])
+        yield topic, f"She ___ (go) to place number {i} every day", "goes", "Добавьте -s"
+
+def measure(build):
+    """Объем памяти, занятой результатом build()"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, result
+
+def word_dicts(count):
+    fields = ('word', 'translation', 'transcription', 'example', 'example_translation')
+    return [dict(zip(fields, row)) for row in make_word_rows(count)]
+
+def word_store(count):
+    return WordStore(WordEntry(*row) for row in make_word_rows(count))
+
+def exercise_dicts(count):
+    return [{'rule': topic, 'sentence': sentence, 'answer': answer, 'hint': hint}
+            for topic, sentence, answer, hint in make_exercise_rows(count)]
+
+def exercise_entries(count):
+    return [ExerciseEntry(*row) for row in make_exercise_rows(count)]
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    
+    print(f"Записей: {count}")
+    for title, baseline, compact in (
+        ("Слова", word_dicts, word_store),
+        ("Упражнения", exercise_dicts, exercise_entries),
+    ):
+        base_size, base = measure(lambda: baseline(count))
+        del base
+        compact_size, compact_result = measure(lambda: compact(count))
+        del compact_result
+        print(f"{title}:")
+        print(f"  список словарей:   {base_size / 2**20:8.1f} МБ ({base_size / count:.0f} байт/запись)")
+        print(f"  компактное хранение: {compact_size / 2**20:6.1f} МБ ({compact_size / count:.0f} байт/запись)")
+        print(f"  экономия: {(1 - compact_size / base_size) * 100:.0f}%")
+
+if __name__ == "__main__":
+    main()
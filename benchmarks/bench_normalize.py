@@ -0,0 +1,62 @@
+"""
+Скорость нормализации ответов: прежняя функция против новой (таблица
+str.translate и одно регулярное выражение)
+
+Запуск: python -m benchmarks.bench_normalize
+"""
+
+import random
+import time
+from benchmarks.bench_grading import legacy_normalize_answer, make_attempts
+from utils.helpers import normalize_answer
+
+ROUNDS = 20
+REPEATS = 15
+
+# Написания, которые прежняя функция считала разными
+VARIANT_SPELLINGS = [
+    ("don’t", "don't"),
+    ("надёжный", "надежный"),
+    ("«Go!»", "go"),
+    ("double–checked", "double-checked"),
+    ("ﬁne", "fine"),
+    ("the  end ...", "end"),
+]
+
+def rates(functions, answers):
+    """
+    Нормализаций в секунду для каждой функции (лучший из REPEATS замеров;
+    функции замеряются поочередно, чтобы фоновая нагрузка влияла на всех)
+    """
+    best = [float('inf')] * len(functions)
+    for _ in range(REPEATS):
+        for number, function in enumerate(functions):
+            started = time.perf_counter()
+            for _ in range(ROUNDS):
+                for answer in answers:
+                    function(answer)
+            best[number] = min(best[number], time.perf_counter() - started)
+    return [ROUNDS * len(answers) / seconds for seconds in best]
+
+def main():
+    answers = [answer for attempt in make_attempts(random.Random(3)) for answer in attempt]
+    print(f"Строк в наборе: {len(answers)}")
+    
+    groups = [
+        ("все строки", answers),
+        ("ASCII", [answer for answer in answers if answer.isascii()]),
+        ("не ASCII", [answer for answer in answers if not answer.isascii()]),
+        ("с заменами", [typed for typed, _ in VARIANT_SPELLINGS] * 100),
+    ]
+    for name, group in groups:
+        legacy, current = rates((legacy_normalize_answer, normalize_answer), group)
+        print(f"{name:<11} ({len(group):>5}): прежняя {legacy:>11,.0f} строк/с, "
+              f"normalize_answer {current:>11,.0f} строк/с ({current / legacy:.2f}x)")
+    
+    for typed, stored in VARIANT_SPELLINGS:
+        before = legacy_normalize_answer(typed) == legacy_normalize_answer(stored)
+        after = normalize_answer(typed) == normalize_answer(stored)
+        print(f"  {typed!r:>18} = {stored!r:<18} прежде: {before!s:<5} теперь: {after}")
+
+if __name__ == "__main__":
+    main()
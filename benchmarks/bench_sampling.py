@@ -0,0 +1,95 @@
+"""
+Выбор упражнений: перемешивание всех упражнений выбранных тем против
+таблиц псевдонимов с весами по истории ответов
+
+Запуск: python -m benchmarks.bench_sampling
+"""
+
+import random
+import time
+from data.exercise_bank import ExerciseBank
+from data.exercise_sampler import ExerciseSampler
+from data.item_stats import ItemStats
+from data.store import ExerciseEntry
+
+BANK_SIZES = (10_000, 100_000, 1_000_000)
+TOPIC_COUNT = 20
+DRAW_COUNT = 20
+SESSIONS = 200
+SHUFFLE_SESSIONS = 5
+ANSWERED_SHARE = 0.2
+
+def make_bank(size):
+    """Банк из TOPIC_COUNT тем с синтетическими упражнениями"""
+    per_topic = size // TOPIC_COUNT
+    topics = {
+        f"Тема {number}": [
+            ExerciseEntry(f"Тема {number}", f"Sentence {number}-{index} ___", 'answer')
+            for index in range(per_topic)
+        ]
+        for number in range(TOPIC_COUNT)
+    }
+    return ExerciseBank({topic: len(items) for topic, items in topics.items()}, topics.__getitem__)
+
+def make_stats(bank, rng):
+    """История: часть упражнений решалась, у «трудных» - одни ошибки"""
+    stats = ItemStats()
+    hard = set()
+    now = time.time()
+    for topic in bank:
+        for exercise in rng.sample(bank[topic], int(len(bank[topic]) * ANSWERED_SHARE)):
+            is_hard = rng.random() < 0.1
+            if is_hard:
+                hard.add(ItemStats.exercise_id(exercise))
+            for _ in range(3):
+                stats.record(ItemStats.exercise_id(exercise), not is_hard, now)
+    return stats, hard
+
+def shuffle_all(bank, topics, count):
+    """Прежний выбор: все упражнения тем, перемешивание, первые count"""
+    exercises = []
+    for topic in topics:
+        exercises.extend(bank[topic])
+    random.shuffle(exercises)
+    return exercises[:count]
+
+def main():
+    rng = random.Random(17)
+    for size in BANK_SIZES:
+        bank = make_bank(size)
+        stats, hard = make_stats(bank, rng)
+        topics = list(bank)
+        sampler = ExerciseSampler(bank)
+        
+        started = time.perf_counter()
+        sampler.draw(topics, DRAW_COUNT, stats, rng)
+        build = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        for _ in range(SHUFFLE_SESSIONS):
+            shuffle_all(bank, topics, DRAW_COUNT)
+        shuffled = (time.perf_counter() - started) / SHUFFLE_SESSIONS
+        
+        started = time.perf_counter()
+        drawn_hard = 0
+        for _ in range(SESSIONS):
+            for exercise in sampler.draw(topics, DRAW_COUNT, stats, rng):
+                drawn_hard += ItemStats.exercise_id(exercise) in hard
+        drawn = (time.perf_counter() - started) / SESSIONS
+        
+        # Ответ меняет один вес: перестраиваются его блок и верхняя таблица темы
+        exercise = bank[topics[0]][0]
+        started = time.perf_counter()
+        stats.record_exercise(exercise, False)
+        sampler.update(exercise, stats)
+        sampler.draw(topics, DRAW_COUNT, stats, rng)
+        rebuild = time.perf_counter() - started
+        
+        print(f"{size:>9,} упражнений: перемешивание {shuffled * 1000:8.2f} мс, "
+              f"таблицы {drawn * 1000:6.3f} мс (построение {build:.2f} с, "
+              f"после ответа {rebuild * 1000:.2f} мс), "
+              f"трудные выбираются в {drawn_hard / (SESSIONS * DRAW_COUNT) / (len(hard) / size):.1f} раза "
+              f"чаще своей доли в банке")
+
+if __name__ == "__main__":
+    main()
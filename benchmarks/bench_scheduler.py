@@ -0,0 +1,47 @@
+"""
+Очередь повторения на большом словаре: время выбора слов для теста и
+обработки ответов не должно зависеть от размера словаря
+
+Запуск: python -m benchmarks.bench_scheduler
+"""
+
+import random
+import time
+from benchmarks.bench_search import make_words
+from data.scheduler import ReviewScheduler, QUALITY_BY_VERDICT, SECONDS_PER_DAY
+from utils.helpers import VERDICT_CORRECT, VERDICT_WRONG
+
+WORD_COUNTS = (10_000, 100_000)
+REVIEWED_SHARE = 0.5
+TEST_SIZE = 20
+TESTS = 200
+
+def make_scheduler(words, rng, now):
+    """Расписание, в котором половина слов уже повторялась в прошлые дни"""
+    scheduler = ReviewScheduler()
+    scheduler.sync(words)
+    for word in rng.sample(words, int(len(words) * REVIEWED_SHARE)):
+        verdict = rng.choice((VERDICT_CORRECT, VERDICT_WRONG))
+        scheduler.review(word, QUALITY_BY_VERDICT[verdict], now - rng.uniform(0, 30) * SECONDS_PER_DAY)
+    return scheduler
+
+def main():
+    rng = random.Random(11)
+    for count in WORD_COUNTS:
+        words = make_words(count, rng)
+        now = time.time()
+        started = time.perf_counter()
+        scheduler = make_scheduler(words, rng, now)
+        prepare = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        for _ in range(TESTS):
+            for word in scheduler.due_words(TEST_SIZE, now):
+                scheduler.review(word, QUALITY_BY_VERDICT[rng.choice((VERDICT_CORRECT, VERDICT_WRONG))], now)
+        queue = (time.perf_counter() - started) / TESTS
+        
+        print(f"{count:>7} слов: подготовка {prepare:.2f} с, "
+              f"тест из {TEST_SIZE} слов с ответами {queue * 1000:.2f} мс")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Задержка поиска по словарю: индекс против линейного поиска,
+а также обратного поиска по переводу
+
+Запуск: python -m benchmarks.bench_search
+"""
+
+import random
+import time
+from data.store import WordEntry
+from utils.helpers import search_in_list
+from utils.search_index import WordSearchIndex
+
+SIZES = (10_000, 50_000, 200_000)
+QUERIES = 200
+SYLLABLES = ['ka', 'lo', 'mi', 'ren', 'sto', 'vel', 'dor', 'pa', 'tri', 'zen', 'ul', 'fa']
+RU_SYLLABLES = ['ка', 'ло', 'ми', 'рен', 'сто', 'вел', 'дор', 'па', 'три', 'зен', 'ул', 'фа']
+
+def make_words(count, rng):
+    """Синтетический словарь из случайных слогов"""
+    words = []
+    for i in range(count):
+        length = rng.randint(2, 4)
+        word = ''.join(rng.choice(SYLLABLES) for _ in range(length)) + str(i)
+        translation = ''.join(rng.choice(RU_SYLLABLES) for _ in range(length))
+        words.append(WordEntry(word, translation, '[...]'))
+    return words
+
+def average_ms(function, queries):
+    """Среднее время одного запроса в миллисекундах"""
+    started = time.perf_counter()
+    for query in queries:
+        function(query)
+    return (time.perf_counter() - started) / len(queries) * 1000
+
+def main():
+    rng = random.Random(42)
+    print(f"{'слов':>8} | {'построение, с':>13} | {'индекс, мс':>10} | {'линейный, мс':>12} | "
+          f"{'рус→англ, мс':>12}")
+    for size in SIZES:
+        words = make_words(size, rng)
+        # Запросы: целые слова, их начала и фрагменты из середины
+        queries = []
+        for word in rng.sample(words, QUERIES):
+            text = word.word
+            queries.append(rng.choice([text, text[:4], text[2:6]]))
+        # Обратный поиск по переводу в другой форме: «-а» → «-у»
+        reverse_queries = [word.translation + 'у' for word in rng.sample(words, QUERIES)]
+        
+        started = time.perf_counter()
+        index = WordSearchIndex(words)
+        build_time = time.perf_counter() - started
+        
+        index_ms = average_ms(index.search, queries)
+        linear_ms = average_ms(
+            lambda query: search_in_list(query, words, ['word', 'translation']), queries[:20]
+        )
+        reverse_ms = average_ms(index.reverse_lookup, reverse_queries)
+        print(f"{size:>8} | {build_time:>13.2f} | {index_ms:>10.3f} | {linear_ms:>12.3f} | "
+              f"{reverse_ms:>12.4f}")
+
+if __name__ == "__main__":
+    main()
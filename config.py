@@ -21,9 +21,65 @@ DATA_FILES = {
     'words': os.path.join(DATA_FILES_DIR, 'words.txt'),
     'exercises': os.path.join(DATA_FILES_DIR, 'exercises.txt'),
     'rules': os.path.join(DATA_FILES_DIR, 'rules.txt'),
-    'progress': os.path.join(DATA_FILES_DIR, 'progress.json')
+    'progress': os.path.join(DATA_FILES_DIR, 'progress.json'),
+    'schedule': os.path.join(DATA_FILES_DIR, 'schedule.json'),
+    'item_stats': os.path.join(DATA_FILES_DIR, 'item_stats.bin'),
+    'cache': os.path.join(DATA_FILES_DIR, 'data_cache.bin'),
+    'words_journal': os.path.join(DATA_FILES_DIR, 'words.journal'),
+    'database': os.path.join(DATA_FILES_DIR, 'english.db')
 }
 
+# Хранилище данных: 'text' - текстовые файлы, 'sqlite' - база данных
+# (при первом запуске с 'sqlite' данные переносятся из текстовых файлов)
+STORAGE_BACKEND = 'text'
+
+# Настройки кэша загруженных данных
+# (увеличивайте версию при изменении формата разобранных данных)
+CACHE_ENABLED = True
+CACHE_VERSION = 5
+
+# Сколько текстов правил держать в памяти (LRU)
+RULES_CACHE_SIZE = 32
+
+# Максимальное число опечаток (вставка, удаление, замена, перестановка
+# соседних букв) при нечетком поиске в словаре (0 - не искать с опечатками)
+FUZZY_MAX_DISTANCE = 2
+
+# Сколько слов с опечатками предлагать, если точных совпадений нет
+FUZZY_SUGGESTIONS = 20
+
+# Задержка поиска по мере ввода после последнего нажатия клавиши (мс)
+SEARCH_DEBOUNCE_MS = 200
+
+# Количество видимых строк в списке результатов поиска
+SEARCH_VISIBLE_ROWS = 6
+
+# Допустимое число опечаток в «почти правильном» ответе в зависимости от длины
+# правильного ответа: пары (минимальная длина, опечаток); короче первой длины - 0
+# (другое окончание слова - -s, -es, -ed, -ing - опечаткой не считается)
+ALMOST_CORRECT_TYPOS = [(5, 1), (10, 2)]
+
+# Засчитывать ли «почти правильные» ответы (с опечаткой) в счет
+# (по умолчанию они только показываются и сохраняются в результатах)
+ALMOST_CORRECT_COUNTS = False
+
+# Засчитывать ли в тесте «русский → английский» синонимы: слова словаря
+# с тем же переводом
+ACCEPT_SYNONYMS = False
+
+# Сколько разобранных правильных ответов держать в памяти
+ANSWER_CACHE_SIZE = 4096
+
+# Количество слов в одном пакете записи при импорте
+IMPORT_BATCH_SIZE = 5000
+
+# Интервал опроса фоновой загрузки данных при запуске (мс)
+LOAD_POLL_INTERVAL_MS = 20
+
+# Интервал проверки изменений файлов данных для горячей перезагрузки (мс)
+# (0 - не отслеживать изменения)
+WATCH_INTERVAL_MS = 1000
+
 # Цвета
 COLORS = {
     'primary': '#3498db',
@@ -45,11 +101,22 @@ EXERCISE_MIN_COUNT = 5
 EXERCISE_MAX_COUNT = 30
 EXERCISE_DEFAULT_COUNT = 10
 
+# Выбор упражнений по истории ответов: через сколько дней без ответа
+# упражнение получает наибольший вес за давность
+SAMPLING_RECENCY_DAYS = 14
+
 # Настройки теста
 TEST_MIN_WORDS = 5
 TEST_MAX_WORDS = 50
 TEST_DEFAULT_WORDS = 10
 
+# Интервальное повторение слов в тестах (SM-2): начальная и минимальная
+# легкость, повтор после ошибки (мин) и наибольший интервал (дни)
+REVIEW_INITIAL_EASE = 2.5
+REVIEW_MIN_EASE = 1.3
+REVIEW_RELEARN_MINUTES = 10
+REVIEW_MAX_INTERVAL_DAYS = 365
+
 # Шрифты
 FONTS = {
     'header': ('Arial', 20, 'bold'),
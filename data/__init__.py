@@ -4,6 +4,19 @@
 
 from .loader import DataLoader
 from .progress import ProgressManager
+from .scheduler import ReviewScheduler
+from .item_stats import ItemStats
+from .exercise_sampler import ExerciseSampler
+from .cache import DataCache
+from .cross_reference import CrossReference
+from .exercise_bank import ExerciseBank
+from .rule_book import RuleBook
+from .store import WordEntry, ExerciseEntry, WordStore
+from .watcher import FileWatcher
+from .backend import get_data_loader, get_progress_manager
 from .sample_creator import SampleCreator
 
-__all__ = ['DataLoader', 'ProgressManager', 'SampleCreator']
+__all__ = ['DataLoader', 'ProgressManager', 'ReviewScheduler', 'ItemStats', 'ExerciseSampler', 'SampleCreator', 'DataCache', 'CrossReference',
+           'ExerciseBank', 'RuleBook',
+           'WordEntry', 'ExerciseEntry', 'WordStore', 'FileWatcher',
+           'get_data_loader', 'get_progress_manager']
@@ -0,0 +1,25 @@
+"""
+Выбор хранилища данных
+"""
+
+from config import STORAGE_BACKEND
+
+def get_data_loader():
+    """Загрузчик данных для хранилища, выбранного в config.STORAGE_BACKEND"""
+    if STORAGE_BACKEND == 'sqlite':
+        from data.sqlite_backend import SQLiteDataLoader
+        return SQLiteDataLoader
+    from data.loader import DataLoader
+    return DataLoader
+
+def get_progress_manager():
+    """Менеджер прогресса для хранилища, выбранного в config.STORAGE_BACKEND"""
+    if STORAGE_BACKEND == 'sqlite':
+        from data.sqlite_backend import SQLiteProgressManager
+        return SQLiteProgressManager
+    from data.progress import ProgressManager
+    return ProgressManager
+
+def uses_text_files():
+    """Хранятся ли данные в текстовых файлах (нужно ли следить за их изменением)"""
+    return STORAGE_BACKEND != 'sqlite'
@@ -0,0 +1,215 @@
+"""
+Бинарный кэш разобранных файлов данных
+"""
+
+import hashlib
+import os
+import pickle
+import struct
+import threading
+import zlib
+from config import DATA_FILES, CACHE_ENABLED, CACHE_VERSION
+
+class DataCache:
+    """
+    Кэш разобранных данных (слова, упражнения, правила)
+    
+    Все записи хранятся в одном файле DATA_FILES['cache'] и читаются
+    за одно обращение к диску. Каждая запись привязана к «отпечаткам»
+    исходных файлов: размер, mtime и хэш содержимого, снятым до разбора.
+    Если отпечаток не совпадает или файл кэша поврежден, запись считается
+    отсутствующей, и загрузчик возвращается к разбору текстового файла.
+    
+    put только обновляет записи в памяти, а файл переписывается один раз
+    за цикл загрузки (flush).
+    """
+    
+    MAGIC = b'ELAC'
+    # magic, версия формата, crc32 и длина полезной нагрузки
+    HEADER = struct.Struct('<4sIIQ')
+    
+    _entries = None
+    _dirty = False
+    # Загрузчики могут работать в нескольких потоках одновременно
+    _lock = threading.RLock()
+    
+    @staticmethod
+    def file_hash(path):
+        """Хэш содержимого файла"""
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    @staticmethod
+    def file_stamp(path):
+        """Отпечаток файла: (размер, mtime в наносекундах, хэш)"""
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns, DataCache.file_hash(path)
+    
+    @staticmethod
+    def stamps(sources):
+        """
+        Отпечатки файлов DATA_FILES[source] (снимаются до разбора файлов)
+        
+        Returns:
+            словарь {source: отпечаток} или None, если файл недоступен
+        """
+        if not CACHE_ENABLED:
+            return None
+        try:
+            return {source: DataCache.file_stamp(DATA_FILES[source]) for source in sources}
+        except OSError:
+            return None
+    
+    @staticmethod
+    def entry_stamps(keys):
+        """
+        Отпечатки, с которыми сохранены записи keys - версии файлов, из
+        которых разобраны эти данные (для записей, построенных из них)
+        
+        Returns:
+            словарь {key: отпечаток} или None, если какой-то записи нет
+        """
+        if not CACHE_ENABLED:
+            return None
+        entries = DataCache._load_entries()
+        stamps = {}
+        for key in keys:
+            entry = entries.get(key)
+            if entry is None or key not in entry['stamps']:
+                return None
+            stamps[key] = entry['stamps'][key]
+        return stamps
+    
+    @staticmethod
+    def _read():
+        """Чтение всего файла кэша за одно обращение"""
+        try:
+            with open(DATA_FILES['cache'], 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return {}
+        except OSError as e:
+            print(f"Ошибка чтения кэша: {e}")
+            return {}
+        
+        header_size = DataCache.HEADER.size
+        if len(raw) < header_size:
+            return {}
+        
+        magic, version, checksum, length = DataCache.HEADER.unpack_from(raw)
+        payload = memoryview(raw)[header_size:]
+        if magic != DataCache.MAGIC or version != CACHE_VERSION:
+            return {}
+        if length != len(payload) or zlib.crc32(payload) != checksum:
+            print("Предупреждение: файл кэша поврежден, он будет пересоздан")
+            return {}
+        
+        try:
+            entries = pickle.loads(payload)
+        except Exception as e:
+            print(f"Предупреждение: не удалось прочитать кэш ({e}), он будет пересоздан")
+            return {}
+        return entries if isinstance(entries, dict) else {}
+    
+    @staticmethod
+    def _write(entries):
+        """Атомарная запись кэша на диск"""
+        payload = pickle.dumps(entries, protocol=pickle.HIGHEST_PROTOCOL)
+        header = DataCache.HEADER.pack(
+            DataCache.MAGIC, CACHE_VERSION, zlib.crc32(payload), len(payload)
+        )
+        tmp_path = DATA_FILES['cache'] + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(header)
+                f.write(payload)
+            os.replace(tmp_path, DATA_FILES['cache'])
+        except OSError as e:
+            print(f"Ошибка записи кэша: {e}")
+    
+    @staticmethod
+    def _load_entries():
+        """Загруженные записи кэша (файл читается один раз)"""
+        with DataCache._lock:
+            if DataCache._entries is None:
+                DataCache._entries = DataCache._read()
+            return DataCache._entries
+    
+    @staticmethod
+    def _is_fresh(stamps, source):
+        """Не изменился ли файл DATA_FILES[source] с момента записи в кэш"""
+        try:
+            stat = os.stat(DATA_FILES[source])
+        except OSError:
+            return False
+        
+        size, mtime_ns, content_hash = stamps[source]
+        if stat.st_size != size:
+            return False
+        if stat.st_mtime_ns != mtime_ns:
+            # Файл мог быть просто «тронут» - сверяем содержимое
+            try:
+                if DataCache.file_hash(DATA_FILES[source]) != content_hash:
+                    return False
+            except OSError:
+                return False
+            stamps[source] = (size, stat.st_mtime_ns, content_hash)
+        return True
+    
+    @staticmethod
+    def get(key, sources=None):
+        """
+        Получить разобранные данные для файла DATA_FILES[key]
+        
+        Args:
+            key: ключ записи
+            sources: ключи DATA_FILES, из которых построены данные
+                (по умолчанию сам key); запись действительна, только
+                если не изменился ни один из этих файлов
+        
+        Returns:
+            сохраненные данные или None, если кэша нет или он устарел
+        """
+        if not CACHE_ENABLED:
+            return None
+        
+        entry = DataCache._load_entries().get(key)
+        if entry is None:
+            return None
+        
+        stamps = entry['stamps']
+        if set(stamps) != set(sources or (key,)):
+            return None
+        if not all(DataCache._is_fresh(stamps, source) for source in stamps):
+            return None
+        return entry['data']
+    
+    @staticmethod
+    def put(key, data, stamps):
+        """
+        Сохранить данные, разобранные из файлов с отпечатками stamps
+        
+        Args:
+            key: ключ записи
+            data: данные
+            stamps: результат DataCache.stamps (или entry_stamps), полученный
+                до разбора; None - не сохранять
+        """
+        if not CACHE_ENABLED or stamps is None:
+            return
+        
+        with DataCache._lock:
+            DataCache._load_entries()[key] = {'stamps': stamps, 'data': data}
+            DataCache._dirty = True
+    
+    @staticmethod
+    def flush():
+        """Записать кэш на диск, если с прошлой записи были новые данные"""
+        with DataCache._lock:
+            if not DataCache._dirty:
+                return
+            DataCache._dirty = False
+            DataCache._write(DataCache._entries)
@@ -0,0 +1,114 @@
+"""
+Связь слов словаря с упражнениями и правилами
+"""
+
+from array import array
+from bisect import bisect_right
+from utils.lemmas import lemma_candidates
+from utils.text_index import tokenize
+
+# Служебные слова, которые не ищутся, если в записи словаря есть другие
+STOP_WORDS = frozenset({'a', 'an', 'the', 'to'})
+
+class CrossReference:
+    """
+    Индекс «начальная форма → упражнения и правила, где она встречается»
+    
+    Слова предложений, подсказок и ответов упражнений и текстов правил
+    записываются под всеми своими возможными начальными формами
+    (went → go, books → book). Индекс строится по файлам упражнений и
+    правил и не зависит от словаря, поэтому ответ для любого слова,
+    в том числе только что добавленного, - это поиск по ключу.
+    
+    Упражнения хранятся сквозными номерами в array('I'), тема и номер
+    внутри темы восстанавливаются по количеству упражнений в темах.
+    """
+    
+    def __init__(self, topic_counts=None, exercise_postings=None, rule_postings=None):
+        """
+        Args:
+            topic_counts: список пар (тема, количество упражнений) в порядке банка
+            exercise_postings: {начальная форма: array сквозных номеров упражнений}
+            rule_postings: {начальная форма: array номеров правил}
+        """
+        self.topic_counts = list(topic_counts or [])
+        self.exercise_postings = exercise_postings or {}
+        self.rule_postings = rule_postings or {}
+        
+        self._topic_starts = []
+        start = 0
+        for _, count in self.topic_counts:
+            self._topic_starts.append(start)
+            start += count
+    
+    @staticmethod
+    def _index_text(postings, doc_number, text):
+        """Записать документ под начальными формами всех слов текста"""
+        lemmas = set()
+        for token in tokenize(text):
+            if token.isascii():
+                lemmas.update(lemma_candidates(token))
+        for lemma in lemmas:
+            numbers = postings.get(lemma)
+            if numbers is None:
+                numbers = postings[lemma] = array('I')
+            numbers.append(doc_number)
+    
+    @staticmethod
+    def build(exercise_bank, rule_book):
+        """Построение индекса по банку упражнений и книге правил"""
+        topic_counts = []
+        exercise_postings = {}
+        number = 0
+        for topic, exercises in exercise_bank.iter_topics():
+            topic_counts.append((topic, len(exercises)))
+            for exercise in exercises:
+                text = ' '.join((exercise['sentence'], exercise['hint'], exercise['answer']))
+                CrossReference._index_text(exercise_postings, number, text)
+                number += 1
+        
+        rule_postings = {}
+        for rule_index, (title, content) in enumerate(zip(rule_book.titles, rule_book.iter_contents())):
+            CrossReference._index_text(rule_postings, rule_index, f"{title}\n{content}")
+        
+        return CrossReference(topic_counts, exercise_postings, rule_postings)
+    
+    @staticmethod
+    def word_lemmas(word):
+        """Начальные формы слов записи словаря («to look up» → look, up)"""
+        tokens = [token for token in tokenize(word) if token.isascii()]
+        meaningful = [token for token in tokens if token not in STOP_WORDS]
+        return meaningful or tokens
+    
+    @staticmethod
+    def _lookup(postings, lemmas):
+        """Документы, в которых встречаются все начальные формы"""
+        if not lemmas:
+            return []
+        found = [postings.get(lemma) for lemma in lemmas]
+        if not all(found):
+            return []
+        found.sort(key=len)
+        if len(found) == 1:
+            return list(found[0])
+        common = set(found[0]).intersection(*found[1:])
+        return [number for number in found[0] if number in common]
+    
+    def exercise_refs(self, word):
+        """Упражнения со словом: список пар (тема, номер в теме)"""
+        refs = []
+        for number in CrossReference._lookup(self.exercise_postings, CrossReference.word_lemmas(word)):
+            topic_index = bisect_right(self._topic_starts, number) - 1
+            topic = self.topic_counts[topic_index][0]
+            refs.append((topic, number - self._topic_starts[topic_index]))
+        return refs
+    
+    def rule_refs(self, word):
+        """Номера правил, в которых встречается слово"""
+        return CrossReference._lookup(self.rule_postings, CrossReference.word_lemmas(word))
+    
+    def counts(self, word):
+        """(количество упражнений, количество правил) со словом"""
+        lemmas = CrossReference.word_lemmas(word)
+        return (len(CrossReference._lookup(self.exercise_postings, lemmas)),
+                len(CrossReference._lookup(self.rule_postings, lemmas)))
@@ -0,0 +1,67 @@
+"""
+Банк упражнений с ленивой загрузкой тем
+"""
+
+from collections.abc import Mapping
+
+class ExerciseBank(Mapping):
+    """
+    Словарь «тема → список упражнений», который разбирает темы по требованию
+    
+    Количество упражнений в каждой теме известно заранее из индекса,
+    поэтому интерфейс может показывать итоги, не разбирая сами упражнения.
+    Тело темы загружается при первом обращении к bank[topic].
+    """
+    
+    def __init__(self, topic_counts, topic_loader):
+        """
+        Args:
+            topic_counts: словарь {тема: количество упражнений} в порядке файла
+            topic_loader: функция topic -> список упражнений темы
+        """
+        self._topic_counts = dict(topic_counts)
+        self._topic_loader = topic_loader
+        self._loaded_topics = {}
+    
+    def __getitem__(self, topic):
+        if topic not in self._topic_counts:
+            raise KeyError(topic)
+        if topic not in self._loaded_topics:
+            self._loaded_topics[topic] = self._topic_loader(topic)
+        return self._loaded_topics[topic]
+    
+    def __iter__(self):
+        return iter(self._topic_counts)
+    
+    def __len__(self):
+        return len(self._topic_counts)
+    
+    def __contains__(self, topic):
+        return topic in self._topic_counts
+    
+    def topic_count(self, topic):
+        """Количество упражнений в теме без разбора ее тела"""
+        return self._topic_counts.get(topic, 0)
+    
+    def total_count(self, topics=None):
+        """Общее количество упражнений в указанных (или во всех) темах"""
+        if topics is None:
+            topics = self._topic_counts
+        return sum(self.topic_count(topic) for topic in topics)
+    
+    def iter_topics(self):
+        """
+        Пары (тема, упражнения) по всем темам
+        
+        Еще не загруженные темы разбираются, но не остаются в памяти банка
+        (для индексации всех упражнений).
+        """
+        for topic in list(self._topic_counts):
+            exercises = self._loaded_topics.get(topic)
+            yield topic, exercises if exercises is not None else self._topic_loader(topic)
+    
+    def replace(self, other):
+        """Заменить содержимое банка на месте (при перезагрузке файла)"""
+        self._topic_counts = dict(other._topic_counts)
+        self._topic_loader = other._topic_loader
+        self._loaded_topics = dict(other._loaded_topics)
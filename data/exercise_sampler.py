@@ -0,0 +1,175 @@
+"""
+Выбор упражнений с учетом ошибок и давности ответов
+"""
+
+import random
+import time
+from array import array
+from config import SAMPLING_RECENCY_DAYS
+from data.item_stats import ItemStats
+from utils.alias_table import AliasTable
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# Размер блока упражнений темы с отдельной таблицей псевдонимов
+SAMPLING_BLOCK_SIZE = 1024
+
+# Сколько повторных выборов (на одно упражнение) допускается из-за уже выбранных
+DRAW_ATTEMPTS_FACTOR = 20
+
+def exercise_weight(record, now):
+    """
+    Вес упражнения: доля ошибок со сглаживанием (у нерешавшихся - 1/2),
+    умноженная на множитель давности от 1 (ответ только что) до 2
+    (SAMPLING_RECENCY_DAYS дней назад и больше)
+    """
+    if record is None:
+        return 0.5
+    error_rate = (record['attempts'] - record['correct'] + 1) / (record['attempts'] + 2)
+    days = max(0.0, (now - record['last_seen']) / SECONDS_PER_DAY)
+    return error_rate * (1 + min(days, SAMPLING_RECENCY_DAYS) / SAMPLING_RECENCY_DAYS)
+
+class TopicTable:
+    """
+    Веса упражнений одной темы и двухуровневая таблица выбора
+    
+    Упражнения разбиты на блоки по SAMPLING_BLOCK_SIZE: у каждого блока
+    своя таблица псевдонимов, а верхняя таблица выбирает блок по сумме его
+    весов. Идентификаторы и веса упражнений считаются один раз, а после
+    ответа меняется один вес и перестраиваются только его блок и верхняя
+    таблица - O(SAMPLING_BLOCK_SIZE + число блоков) вместо O(размер темы).
+    """
+    
+    __slots__ = ('rows', 'duplicates', 'weights', 'blocks', 'top', 'dirty')
+    
+    def __init__(self, exercises, stats, now):
+        self.rows = {}
+        self.duplicates = {}
+        self.weights = array('d')
+        for row, exercise in enumerate(exercises):
+            item_id = ItemStats.exercise_id(exercise)
+            if self.rows.setdefault(item_id, row) != row:
+                # Одинаковые упражнения: общая статистика, общий вес
+                self.duplicates.setdefault(item_id, []).append(row)
+            self.weights.append(exercise_weight(stats.get(item_id), now))
+        
+        self.blocks = [
+            AliasTable(self.weights[start:start + SAMPLING_BLOCK_SIZE])
+            for start in range(0, len(self.weights), SAMPLING_BLOCK_SIZE)
+        ]
+        self.top = AliasTable(block.total for block in self.blocks)
+        self.dirty = set()
+    
+    def __len__(self):
+        return len(self.weights)
+    
+    @property
+    def total(self):
+        """Сумма весов упражнений темы"""
+        self.refresh()
+        return self.top.total
+    
+    def update(self, item_id, weight):
+        """Новый вес упражнения (таблицы перестраиваются при следующем выборе)"""
+        row = self.rows.get(item_id)
+        if row is None:
+            return
+        for row in [row] + self.duplicates.get(item_id, []):
+            self.weights[row] = weight
+            self.dirty.add(row // SAMPLING_BLOCK_SIZE)
+    
+    def refresh(self):
+        """Перестройка блоков с измененными весами и верхней таблицы"""
+        if not self.dirty:
+            return
+        for block in self.dirty:
+            start = block * SAMPLING_BLOCK_SIZE
+            self.blocks[block] = AliasTable(self.weights[start:start + SAMPLING_BLOCK_SIZE])
+        self.top = AliasTable(block.total for block in self.blocks)
+        self.dirty.clear()
+    
+    def draw(self, rng=random):
+        """Номер случайного упражнения темы с вероятностью, пропорциональной весу"""
+        self.refresh()
+        block = self.top.draw(rng)
+        return block * SAMPLING_BLOCK_SIZE + self.blocks[block].draw(rng)
+
+class ExerciseSampler:
+    """
+    Случайный выбор упражнений с весами по истории ответов
+    
+    Для каждой темы один раз строится TopicTable по весам ее упражнений,
+    после ответа (update) в ней меняется один вес, а выбор N упражнений
+    стоит O(N) независимо от размера банка (плюс O(число тем) на таблицу
+    выбора темы).
+    """
+    
+    def __init__(self, bank):
+        """
+        Args:
+            bank: банк упражнений (ExerciseBank)
+        """
+        self.bank = bank
+        self._tables = {}
+    
+    def invalidate(self, topic=None):
+        """Пометить таблицу темы (или всех тем) для полной перестройки"""
+        if topic is None:
+            self._tables.clear()
+        else:
+            self._tables.pop(topic, None)
+    
+    def update(self, exercise, stats):
+        """Пересчитать вес упражнения после ответа на него"""
+        table = self._tables.get(exercise['rule'])
+        if table is not None:
+            item_id = ItemStats.exercise_id(exercise)
+            table.update(item_id, exercise_weight(stats.get(item_id), time.time()))
+    
+    def _topic_table(self, topic, stats, now):
+        """Таблица темы (строится при первом выборе из темы)"""
+        table = self._tables.get(topic)
+        if table is None:
+            table = self._tables[topic] = TopicTable(self.bank[topic], stats, now)
+        return table
+    
+    def draw(self, topics, count, stats, rng=random):
+        """
+        До count разных упражнений из тем topics, чаще - с ошибками и давно не решавшихся
+        
+        Args:
+            topics: темы
+            count: количество упражнений
+            stats: история ответов (ItemStats)
+        """
+        now = time.time()
+        topics = [topic for topic in topics if topic in self.bank]
+        tables = [self._topic_table(topic, stats, now) for topic in topics]
+        available = sum(len(table) for table in tables)
+        
+        if available <= count:
+            exercises = [exercise for topic in topics for exercise in self.bank[topic]]
+            rng.shuffle(exercises)
+            return exercises
+        
+        topic_table = AliasTable(table.total for table in tables)
+        chosen = set()
+        exercises = []
+        attempts = 0
+        while len(exercises) < count and attempts < count * DRAW_ATTEMPTS_FACTOR:
+            attempts += 1
+            topic_index = topic_table.draw(rng)
+            number = tables[topic_index].draw(rng)
+            if (topic_index, number) not in chosen:
+                chosen.add((topic_index, number))
+                exercises.append(self.bank[topics[topic_index]][number])
+        
+        # Веса очень неравномерны: добираем недостающие подряд
+        for topic_index, topic in enumerate(topics):
+            for number, exercise in enumerate(self.bank[topic]):
+                if len(exercises) >= count:
+                    return exercises
+                if (topic_index, number) not in chosen:
+                    chosen.add((topic_index, number))
+                    exercises.append(exercise)
+        return exercises
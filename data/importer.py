@@ -0,0 +1,192 @@
+"""
+Массовый импорт слов из CSV, TSV и текстового экспорта Anki
+"""
+
+import csv
+import hashlib
+import html
+import os
+import re
+import time
+from config import IMPORT_BATCH_SIZE
+from data.backend import get_data_loader
+from data.store import WORD_FIELDS
+
+class ImportReport:
+    """Итоги импорта"""
+    
+    def __init__(self):
+        self.rows_read = 0
+        self.imported = 0
+        self.skipped = []
+        self.elapsed = 0.0
+    
+    def skip(self, row_number, reason):
+        """Отметить пропущенную строку"""
+        self.skipped.append((row_number, reason))
+    
+    @property
+    def rows_per_second(self):
+        """Скорость обработки строк"""
+        return self.rows_read / self.elapsed if self.elapsed > 0 else 0.0
+    
+    def summary(self, max_skipped=20):
+        """Текстовый отчет"""
+        lines = [
+            f"Прочитано строк: {self.rows_read}",
+            f"Импортировано слов: {self.imported}",
+            f"Пропущено строк: {len(self.skipped)}",
+            f"Время: {self.elapsed:.2f} с ({self.rows_per_second:,.0f} строк/с)",
+        ]
+        for row_number, reason in self.skipped[:max_skipped]:
+            lines.append(f"  строка {row_number}: {reason}")
+        if len(self.skipped) > max_skipped:
+            lines.append(f"  ... и еще {len(self.skipped) - max_skipped}")
+        return '\n'.join(lines)
+
+class WordImporter:
+    """
+    Потоковый импорт слов в словарь
+    
+    Строки читаются по одной, дубликаты отсеиваются по хэш-индексу слов
+    (уже имеющихся в словаре и встреченных в самом файле), а новые слова
+    записываются пакетами через save_words выбранного хранилища.
+    """
+    
+    FORMATS = ('csv', 'tsv', 'anki')
+    TAG_PATTERN = re.compile(r'<[^>]+>')
+    ANKI_SEPARATORS = {'tab': '\t', 'comma': ',', 'semicolon': ';', 'pipe': '|', 'space': ' '}
+    
+    def __init__(self, columns=WORD_FIELDS, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+        """
+        Args:
+            columns: поля словаря в порядке столбцов файла ('' - пропустить столбец)
+            batch_size: количество слов в одном пакете записи
+            dry_run: только проверить файл, ничего не записывая
+        """
+        self.columns = list(columns)
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.known_words = set()
+        self.data_loader = get_data_loader()
+    
+    @staticmethod
+    def word_key(word):
+        """Ключ слова в хэш-индексе (8 байт вместо самой строки)"""
+        digest = hashlib.blake2b(word.strip().lower().encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little')
+    
+    @staticmethod
+    def detect_format(path):
+        """Определение формата по первой строке и расширению файла"""
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            first_line = f.readline()
+        if first_line.startswith('#separator:') or first_line.startswith('#html:'):
+            return 'anki'
+        if os.path.splitext(path)[1].lower() == '.csv':
+            return 'csv'
+        return 'tsv'
+    
+    def index_existing_words(self, path=None):
+        """Построение хэш-индекса слов, уже имеющихся в словаре"""
+        for _, entry in self.data_loader.iter_words(path):
+            self.known_words.add(WordImporter.word_key(entry.word))
+    
+    def iter_rows(self, path, file_format):
+        """
+        Потоковое чтение строк файла
+        
+        Yields:
+            кортежи (номер строки, список полей)
+        """
+        delimiter = ',' if file_format == 'csv' else '\t'
+        strip_html = False
+        
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            if file_format == 'anki':
+                # Заголовки экспорта Anki: "#separator:tab", "#html:true" и т.п.
+                header_lines = 0
+                position = f.tell()
+                line = f.readline()
+                while line.startswith('#'):
+                    header_lines += 1
+                    key, _, value = line[1:].strip().partition(':')
+                    if key == 'separator':
+                        delimiter = WordImporter.ANKI_SEPARATORS.get(value.lower(), value[:1] or '\t')
+                    elif key == 'html':
+                        strip_html = value.lower() == 'true'
+                    position = f.tell()
+                    line = f.readline()
+                f.seek(position)
+            else:
+                header_lines = 0
+            
+            reader = csv.reader(f, delimiter=delimiter)
+            for row in reader:
+                if strip_html:
+                    row = [html.unescape(WordImporter.TAG_PATTERN.sub(' ', field)) for field in row]
+                yield header_lines + reader.line_num, row
+    
+    def row_to_word(self, row):
+        """Преобразование полей строки в словарь слова"""
+        word = dict.fromkeys(WORD_FIELDS, '')
+        for column, value in zip(self.columns, row):
+            if column in word:
+                word[column] = ' '.join(value.split())
+        return word
+    
+    def is_header(self, row):
+        """Является ли строка заголовком с именами полей"""
+        names = {value.strip().lower() for value in row}
+        return 'word' in names and 'translation' in names
+    
+    def import_file(self, path, file_format=None):
+        """
+        Импорт файла в словарь
+        
+        Returns:
+            ImportReport с итогами
+        """
+        report = ImportReport()
+        started = time.perf_counter()
+        file_format = file_format or WordImporter.detect_format(path)
+        
+        if not self.known_words:
+            self.index_existing_words()
+        
+        batch = []
+        for row_number, row in self.iter_rows(path, file_format):
+            if not any(field.strip() for field in row):
+                continue
+            if report.rows_read == 0 and self.is_header(row):
+                self.columns = [value.strip().lower() for value in row]
+                continue
+            
+            report.rows_read += 1
+            word = self.row_to_word(row)
+            if not word['word'] or not word['translation']:
+                report.skip(row_number, "нет слова или перевода")
+                continue
+            
+            key = WordImporter.word_key(word['word'])
+            if key in self.known_words:
+                report.skip(row_number, f"дубликат «{word['word']}»")
+                continue
+            self.known_words.add(key)
+            
+            batch.append(word)
+            if len(batch) >= self.batch_size:
+                report.imported += self.flush(batch)
+                batch = []
+        
+        report.imported += self.flush(batch)
+        report.elapsed = time.perf_counter() - started
+        return report
+    
+    def flush(self, batch):
+        """Запись пакета слов, возвращает количество записанных"""
+        if not batch or self.dry_run:
+            return len(batch)
+        if not self.data_loader.save_words(batch):
+            raise OSError("не удалось записать пакет слов в словарь")
+        return len(batch)
@@ -0,0 +1,185 @@
+"""
+История ответов по отдельным словам и упражнениям
+"""
+
+import hashlib
+import os
+import struct
+import sys
+import time
+from array import array
+from config import DATA_FILES
+from data.store import word_key, exercise_key
+
+# Столбцы статистики: имя и код типа array
+COLUMNS = (
+    ('ids', 'Q'),        # 8-байтовый хэш постоянного ключа
+    ('attempts', 'I'),   # всего ответов
+    ('correct', 'I'),    # правильных ответов
+    ('last_seen', 'I'),  # время последнего ответа (секунды Unix)
+    ('streak', 'I'),     # правильных ответов подряд
+)
+
+class ItemStats:
+    """
+    Статистика ответов по словам и упражнениям
+    
+    Данные хранятся столбцами в array (по 24 байта на элемент), а словарь
+    «идентификатор → номер строки» дает обновление за O(1). На диске
+    столбцы лежат подряд после заголовка, поэтому файл с сотнями тысяч
+    элементов читается несколькими вызовами frombytes.
+    """
+    
+    MAGIC = b'ISTS'
+    VERSION = 1
+    HEADER = struct.Struct('<4sII')  # сигнатура, версия, число элементов
+    
+    def __init__(self):
+        self.columns = {name: array(typecode) for name, typecode in COLUMNS}
+        self._rows = {}
+        self.dirty = False
+    
+    def __len__(self):
+        return len(self._rows)
+    
+    def __contains__(self, item_id):
+        return item_id in self._rows
+    
+    @staticmethod
+    def item_id(key):
+        """Идентификатор элемента по постоянному ключу (8 байт вместо строки)"""
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little')
+    
+    @staticmethod
+    def word_id(word):
+        """Идентификатор слова словаря"""
+        return ItemStats.item_id(f"word:{word_key(word)}")
+    
+    @staticmethod
+    def exercise_id(exercise):
+        """Идентификатор упражнения"""
+        return ItemStats.item_id(f"exercise:{exercise_key(exercise)}")
+    
+    def record(self, item_id, is_correct, now=None):
+        """Учесть ответ (O(1))"""
+        columns = self.columns
+        row = self._rows.get(item_id)
+        if row is None:
+            row = self._rows[item_id] = len(columns['ids'])
+            columns['ids'].append(item_id)
+            for name, _ in COLUMNS[1:]:
+                columns[name].append(0)
+        
+        columns['attempts'][row] += 1
+        columns['last_seen'][row] = int(time.time() if now is None else now)
+        if is_correct:
+            columns['correct'][row] += 1
+            columns['streak'][row] += 1
+        else:
+            columns['streak'][row] = 0
+        self.dirty = True
+    
+    def record_word(self, word, is_correct):
+        """Учесть ответ на слово в тесте"""
+        self.record(ItemStats.word_id(word), is_correct)
+    
+    def record_exercise(self, exercise, is_correct):
+        """Учесть ответ на упражнение"""
+        self.record(ItemStats.exercise_id(exercise), is_correct)
+    
+    def get(self, item_id):
+        """Статистика элемента: словарь attempts, correct, last_seen, streak или None"""
+        row = self._rows.get(item_id)
+        if row is None:
+            return None
+        return {name: self.columns[name][row] for name, _ in COLUMNS[1:]}
+    
+    def merge(self, other):
+        """
+        Добавить ответы из другой статистики (данные до окончания загрузки)
+        
+        Ответы other считаются более поздними: время последнего ответа
+        берется наибольшее, а серия продолжается, только если в other
+        не было ошибок.
+        """
+        columns = self.columns
+        for item_id, other_row in other._rows.items():
+            attempts, correct, last_seen, streak = (
+                other.columns[name][other_row] for name, _ in COLUMNS[1:]
+            )
+            row = self._rows.get(item_id)
+            if row is None:
+                row = self._rows[item_id] = len(columns['ids'])
+                columns['ids'].append(item_id)
+                for name, _ in COLUMNS[1:]:
+                    columns[name].append(0)
+            
+            columns['attempts'][row] += attempts
+            columns['correct'][row] += correct
+            columns['last_seen'][row] = max(columns['last_seen'][row], last_seen)
+            columns['streak'][row] = columns['streak'][row] + streak if streak == attempts else streak
+            self.dirty = True
+    
+    @staticmethod
+    def set_aside(path):
+        """Переименовать нечитаемый файл в .bak, чтобы следующая запись его не затерла"""
+        try:
+            os.replace(path, path + '.bak')
+            print(f"Файл сохранен как {path}.bak")
+        except OSError as e:
+            print(f"Не удалось сохранить копию файла {path}: {e}")
+    
+    @staticmethod
+    def load():
+        """
+        Загрузка статистики с диска
+        
+        Файл неизвестного формата или поврежденный откладывается в .bak,
+        и статистика начинается заново.
+        """
+        stats = ItemStats()
+        path = DATA_FILES['item_stats']
+        if not os.path.exists(path):
+            return stats
+        try:
+            with open(path, 'rb') as f:
+                magic, version, count = ItemStats.HEADER.unpack(f.read(ItemStats.HEADER.size))
+                if magic != ItemStats.MAGIC or version != ItemStats.VERSION:
+                    raise ValueError("неизвестный формат файла")
+                for name, typecode in COLUMNS:
+                    column = stats.columns[name]
+                    column.frombytes(f.read(count * column.itemsize))
+                    if len(column) != count:
+                        raise ValueError("файл статистики обрезан")
+                    if sys.byteorder == 'big':
+                        column.byteswap()
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Ошибка загрузки статистики ответов: {e}")
+            ItemStats.set_aside(path)
+            return ItemStats()
+        
+        stats._rows = dict(zip(stats.columns['ids'], range(count)))
+        return stats
+    
+    def save(self):
+        """Атомарная запись статистики (только если были новые ответы)"""
+        if not self.dirty:
+            return True
+        path = DATA_FILES['item_stats']
+        tmp_path = path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(ItemStats.HEADER.pack(ItemStats.MAGIC, ItemStats.VERSION, len(self._rows)))
+                for name, _ in COLUMNS:
+                    column = self.columns[name]
+                    if sys.byteorder == 'big':
+                        column = array(column.typecode, column)
+                        column.byteswap()
+                    column.tofile(f)
+            os.replace(tmp_path, path)
+            self.dirty = False
+            return True
+        except OSError as e:
+            print(f"Ошибка сохранения статистики ответов: {e}")
+            return False
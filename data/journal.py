@@ -0,0 +1,105 @@
+"""
+Журнал добавления слов для безопасной записи словаря
+"""
+
+import os
+import zlib
+from config import DATA_FILES
+
+class WordJournal:
+    """
+    Журнал пакета строк, добавляемых в words.txt
+    
+    Перед дописыванием пакета в словарь он целиком записывается в журнал:
+        
+        @<размер words.txt до записи>
+        <строка 1>
+        ...
+        #END <количество строк> <crc32 строк>
+    
+    На пакет приходится два fsync: журнала (до изменения словаря) и словаря
+    (до удаления журнала). Создание и удаление журнала дополнительно
+    сбрасываются fsync каталога, иначе после сбоя питания файл журнала
+    может оказаться не на диске или, наоборот, вернуться.
+    
+    Журнал удаляется после fsync словаря. Если приложение упало раньше,
+    при следующем запуске полный журнал воспроизводится, а недописанный
+    отбрасывается (словарь при этом еще не менялся).
+    """
+    
+    @staticmethod
+    def _fsync(f):
+        """Сброс буферов файла на диск"""
+        f.flush()
+        os.fsync(f.fileno())
+    
+    @staticmethod
+    def _fsync_directory():
+        """Сброс на диск каталога журнала (записи о создании или удалении файла)"""
+        if os.name == 'nt':  # В Windows каталог нельзя открыть для fsync
+            return
+        directory = os.path.dirname(os.path.abspath(DATA_FILES['words_journal']))
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    @staticmethod
+    def _end_marker(block):
+        """Строка завершения пакета"""
+        line_count = block.count('\n')
+        return f"#END {line_count} {zlib.crc32(block.encode('utf-8')):08x}\n"
+    
+    @staticmethod
+    def write(base_size, block):
+        """Записать пакет строк block (каждая оканчивается переводом строки)"""
+        with open(DATA_FILES['words_journal'], 'w', encoding='utf-8', newline='\n') as f:
+            f.write(f"@{base_size}\n")
+            f.write(block)
+            f.write(WordJournal._end_marker(block))
+            WordJournal._fsync(f)
+        WordJournal._fsync_directory()
+    
+    @staticmethod
+    def read():
+        """
+        Чтение журнала
+        
+        Returns:
+            (размер словаря до записи, блок строк) или None, если журнала нет
+            либо он записан не полностью
+        """
+        try:
+            with open(DATA_FILES['words_journal'], 'r', encoding='utf-8', newline='\n') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Предупреждение: журнал словаря не читается ({e})")
+            return None
+        
+        header, _, rest = content.partition('\n')
+        block, marker, tail = rest.rpartition('#END ')
+        if not header.startswith('@') or not marker or not tail.endswith('\n'):
+            return None
+        if WordJournal._end_marker(block) != marker + tail:
+            return None
+        try:
+            return int(header[1:]), block
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def clear():
+        """Удалить журнал"""
+        try:
+            os.remove(DATA_FILES['words_journal'])
+        except FileNotFoundError:
+            return
+        WordJournal._fsync_directory()
+    
+    @staticmethod
+    def exists():
+        """Есть ли незавершенный журнал"""
+        return os.path.exists(DATA_FILES['words_journal'])
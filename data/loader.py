@@ -2,41 +2,96 @@
 Загрузка данных из файлов
 """
 
+import os
+from array import array
 from config import DATA_FILES
+from data.cache import DataCache
+from data.cross_reference import CrossReference
+from data.exercise_bank import ExerciseBank
+from data.journal import WordJournal
+from data.rule_book import RuleBook
+from data.store import WordEntry, ExerciseEntry, WordStore
 
 class DataLoader:
     """Класс для загрузки данных из файлов"""
     
+    @staticmethod
+    def ensure_data_files():
+        """
+        Создать файлы с примерами, если словаря или упражнений нет,
+        и восстановить словарь по журналу после сбоя
+        
+        Вызывается до параллельной загрузки, чтобы несколько потоков
+        не создавали файлы одновременно.
+        """
+        if not (os.path.exists(DATA_FILES['words']) and os.path.exists(DATA_FILES['exercises'])):
+            from data.sample_creator import SampleCreator
+            SampleCreator.create_all_files()
+        
+        DataLoader.recover_words()
+    
     @staticmethod
     def load_words():
-        """Загрузка слов из файла"""
+        """Загрузка слов (WordStore) из кэша или из файла"""
+        cached = DataCache.get('words')
+        if cached is not None:
+            return cached
+        
         try:
-            with open(DATA_FILES['words'], 'r', encoding='utf-8') as f:
-                words = []
-                line_number = 0
-                for line in f:
-                    line_number += 1
-                    if line.strip():
-                        parts = line.strip().split('|')
-                        if len(parts) >= 3:
-                            word_dict = {
-                                'word': parts[0].strip(),
-                                'translation': parts[1].strip(),
-                                'transcription': parts[2].strip(),
-                                'example': parts[3].strip() if len(parts) > 3 else '',
-                                'example_translation': parts[4].strip() if len(parts) > 4 else ''
-                            }
-                            words.append(word_dict)
-                        else:
-                            print(f"Предупреждение: неверный формат в строке {line_number}")
-                return words if words else DataLoader.get_default_words()
+            stamps = DataCache.stamps(('words',))
+            words = WordStore(word for _, word in DataLoader.iter_words())
+            if not words:
+                return WordStore(DataLoader.get_default_words())
+            DataCache.put('words', words, stamps)
+            return words
         except FileNotFoundError:
             from data.sample_creator import SampleCreator
             SampleCreator.create_all_files()
             return DataLoader.load_words()
         except Exception as e:
             print(f"Ошибка загрузки слов: {e}")
-            return DataLoader.get_default_words()
+            return WordStore(DataLoader.get_default_words())
+    
+    @staticmethod
+    def parse_word_line(line):
+        """
+        Разбор строки словаря «word | translation | transcription | example | example_translation»
+        
+        Returns:
+            WordEntry или None, если в строке меньше трех полей
+        """
+        parts = line.strip().split('|')
+        if len(parts) < 3:
+            return None
+        return WordEntry(
+            parts[0].strip(),
+            parts[1].strip(),
+            parts[2].strip(),
+            parts[3].strip() if len(parts) > 3 else '',
+            parts[4].strip() if len(parts) > 4 else ''
+        )
+    
+    @staticmethod
+    def iter_words(path=None):
+        """
+        Потоковое чтение словаря
+        
+        Файл читается буферизованно, в памяти одновременно находится
+        только одна запись, поэтому генератор подходит для словарей
+        любого размера.
+        
+        Yields:
+            кортежи (номер строки, WordEntry)
+        """
+        with open(path or DATA_FILES['words'], 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                word = DataLoader.parse_word_line(line)
+                if word is None:
+                    print(f"Предупреждение: неверный формат в строке {line_number}")
+                    continue
+                yield line_number, word
     
     @staticmethod
     def get_default_words():
@@ -67,72 +122,323 @@ class DataLoader:
     
     @staticmethod
     def load_exercises():
-        """Загрузка упражнений из файла"""
+        """
+        Загрузка упражнений
+        
+        Возвращает ExerciseBank: количество упражнений по темам берется
+        из индекса заголовков, а сами темы разбираются при первом выборе.
+        """
+        path = DATA_FILES['exercises']
+        # Отпечаток снимается до индекса: если файл изменится позже,
+        # смещения индекса не будут использованы
+        stamp = DataLoader.file_version(path)
+        index = DataLoader.load_exercise_index()
+        topic_counts = {topic: count for topic, (count, _) in index.items()}
+        
+        def load_topic(topic):
+            nonlocal stamp, index
+            if DataLoader.file_version(path) == stamp:
+                try:
+                    return DataLoader.load_exercise_topic(path, topic, index[topic][1])
+                except (OSError, UnicodeDecodeError) as e:
+                    print(f"Ошибка чтения темы упражнений ({topic}): {e}")
+            
+            # Файл изменился после построения индекса (до перезагрузки
+            # банка): индекс строится заново по текущему содержимому
+            try:
+                stamp = DataLoader.file_version(path)
+                index = DataLoader.build_exercise_index(path)
+                if topic not in index:
+                    return []
+                return DataLoader.load_exercise_topic(path, topic, index[topic][1])
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Ошибка загрузки упражнений: {e}")
+                return []
+        
+        return ExerciseBank(topic_counts, load_topic)
+    
+    @staticmethod
+    def file_version(path):
+        """Размер и время изменения файла (None, если файла нет)"""
         try:
-            with open(DATA_FILES['exercises'], 'r', encoding='utf-8') as f:
-                exercises = {}
-                current_rule = None
-                
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    if line.startswith('###'):
-                        current_rule = line.replace('###', '').strip()
-                        if current_rule not in exercises:
-                            exercises[current_rule] = []
-                    elif current_rule and '|' in line:
-                        parts = line.split('|')
-                        if len(parts) >= 2:
-                            exercises[current_rule].append({
-                                'rule': current_rule,
-                                'sentence': parts[0].strip(),
-                                'answer': parts[1].strip(),
-                                'hint': parts[2].strip() if len(parts) > 2 else ''
-                            })
-                
-                return exercises
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+    
+    @staticmethod
+    def load_exercise_index():
+        """
+        Индекс тем упражнений из кэша или из файла
+        
+        Returns:
+            словарь {тема: (количество упражнений, array смещений)}, где
+            смещения - пары (начало, конец) байтовых диапазонов тела темы
+            (тема может встречаться в файле несколько раз)
+        """
+        cached = DataCache.get('exercises')
+        if cached is not None:
+            return cached
+        
+        try:
+            stamps = DataCache.stamps(('exercises',))
+            index = DataLoader.build_exercise_index(DATA_FILES['exercises'])
         except FileNotFoundError:
             from data.sample_creator import SampleCreator
             SampleCreator.create_all_files()
-            return DataLoader.load_exercises()
+            return DataLoader.load_exercise_index()
+        
+        DataCache.put('exercises', index, stamps)
+        return index
+    
+    @staticmethod
+    def build_exercise_index(path):
+        """Построение индекса заголовков '###' одним проходом по байтам файла"""
+        index = {}
+        current_rule = None
+        body_start = 0
+        offset = 0
+        
+        with open(path, 'rb') as f:
+            for line in f:
+                line_start = offset
+                offset += len(line)
+                stripped = line.strip()
+                
+                if stripped.startswith(b'###'):
+                    if current_rule is not None:
+                        index[current_rule][1].extend((body_start, line_start))
+                    current_rule = stripped.decode('utf-8').replace('###', '').strip()
+                    if current_rule not in index:
+                        index[current_rule] = [0, array('Q')]
+                    body_start = offset
+                elif current_rule and b'|' in stripped:
+                    index[current_rule][0] += 1
+        
+        if current_rule is not None:
+            index[current_rule][1].extend((body_start, offset))
+        
+        return {topic: (count, spans) for topic, (count, spans) in index.items()}
+    
+    @staticmethod
+    def load_exercise_topic(path, topic, spans):
+        """Разбор упражнений одной темы по байтовым диапазонам из индекса"""
+        exercises = []
+        if not topic:
+            return exercises
+        
+        with open(path, 'rb') as f:
+            for i in range(0, len(spans), 2):
+                f.seek(spans[i])
+                body = f.read(spans[i + 1] - spans[i]).decode('utf-8')
+                for line in body.split('\n'):
+                    line = line.strip()
+                    if '|' not in line:
+                        continue
+                    parts = line.split('|')
+                    exercises.append(ExerciseEntry(
+                        topic,
+                        parts[0].strip(),
+                        parts[1].strip(),
+                        parts[2].strip() if len(parts) > 2 else ''
+                    ))
+        
+        return exercises
     
     @staticmethod
     def load_rules():
-        """Загрузка правил из файла"""
+        """
+        Загрузка правил
+        
+        Возвращает RuleBook: заголовки берутся из индекса разделов,
+        текст правила читается с диска при первом открытии.
+        """
+        index = DataLoader.load_rules_index()
+        path = DATA_FILES['rules']
+        titles = [title for title, _, _ in index]
+        
+        def load_content(rule_index):
+            _, start, end = index[rule_index]
+            return DataLoader.load_rule_content(path, start, end)
+        
+        return RuleBook(titles, load_content)
+    
+    @staticmethod
+    def load_rules_index():
+        """
+        Индекс разделов правил из кэша или из файла
+        
+        Returns:
+            список кортежей (заголовок, начало, конец) - байтовые границы текста правила
+        """
+        cached = DataCache.get('rules')
+        if cached is not None:
+            return cached
+        
         try:
-            with open(DATA_FILES['rules'], 'r', encoding='utf-8') as f:
-                rules = []
-                current_rule = {'title': '', 'content': ''}
-                
-                for line in f:
-                    if line.startswith('###'):
-                        if current_rule['title']:
-                            rules.append(current_rule)
-                        current_rule = {'title': line.replace('###', '').strip(), 'content': ''}
-                    else:
-                        current_rule['content'] += line
-                
-                if current_rule['title']:
-                    rules.append(current_rule)
-                
-                return rules
+            stamps = DataCache.stamps(('rules',))
+            index = DataLoader.build_rules_index(DATA_FILES['rules'])
         except FileNotFoundError:
             return []
+        
+        DataCache.put('rules', index, stamps)
+        return index
+    
+    @staticmethod
+    def load_cross_reference(exercise_bank, rule_book):
+        """
+        Связь слов с упражнениями и правилами из кэша или построением
+        
+        Запись кэша действительна, пока не изменились файлы упражнений и правил.
+        Она сохраняется с отпечатками тех версий файлов, из которых разобраны
+        exercise_bank и rule_book, а не с текущими.
+        """
+        sources = ('exercises', 'rules')
+        cached = DataCache.get('cross_reference', sources)
+        if cached is not None:
+            return CrossReference(*cached)
+        
+        stamps = DataCache.entry_stamps(sources)
+        reference = CrossReference.build(exercise_bank, rule_book)
+        DataCache.put(
+            'cross_reference',
+            (reference.topic_counts, reference.exercise_postings, reference.rule_postings),
+            stamps
+        )
+        return reference
+    
+    @staticmethod
+    def build_rules_index(path):
+        """Построение индекса заголовков '###' одним проходом по байтам файла"""
+        index = []
+        current_title = ''
+        body_start = 0
+        offset = 0
+        
+        with open(path, 'rb') as f:
+            for line in f:
+                if line.startswith(b'###'):
+                    if current_title:
+                        index.append((current_title, body_start, offset))
+                    current_title = line.decode('utf-8').replace('###', '').strip()
+                    body_start = offset + len(line)
+                offset += len(line)
+        
+        if current_title:
+            index.append((current_title, body_start, offset))
+        
+        return index
+    
+    @staticmethod
+    def load_rule_content(path, start, end):
+        """Чтение текста одного правила по байтовым границам из индекса"""
+        with open(path, 'rb') as f:
+            f.seek(start)
+            content = f.read(end - start).decode('utf-8')
+        # Как при чтении в текстовом режиме: переводы строк приводятся к '\n'
+        return content.replace('\r\n', '\n').replace('\r', '\n')
+    
+    @staticmethod
+    def format_word_line(word_data):
+        """Строка словаря для записи в файл (без перевода строки)"""
+        fields = [word_data['word'], word_data['translation'], word_data.get('transcription', '')]
+        if word_data.get('example') or word_data.get('example_translation'):
+            fields.append(word_data.get('example', ''))
+        if word_data.get('example_translation'):
+            fields.append(word_data['example_translation'])
+        # Разделитель и переводы строк внутри полей испортили бы формат файла
+        return ' | '.join(' '.join(str(field).replace('|', '/').split()) for field in fields)
     
     @staticmethod
     def save_word(word_data):
         """Сохранение нового слова в файл"""
+        return DataLoader.save_words([word_data])
+    
+    @staticmethod
+    def save_words(words):
+        """
+        Пакетное сохранение слов в файл
+        
+        Пакет сначала записывается в журнал (fsync журнала и каталога), затем
+        одним вызовом дописывается в словарь (fsync словаря), после чего
+        журнал удаляется (снова fsync каталога). Пакет из одного слова стоит столько же fsync, что и
+        большой, поэтому импорт сохраняет слова пакетами.
+        
+        Args:
+            words: итерируемый набор словарей (или WordEntry) слов
+        
+        Returns:
+            True, если пакет сохранен
+        """
+        lines = ''.join(DataLoader.format_word_line(word) + '\n' for word in words)
+        if not lines:
+            return True
+        
         try:
-            with open(DATA_FILES['words'], 'a', encoding='utf-8') as f:
-                line = f"\n{word_data['word']} | {word_data['translation']} | {word_data['transcription']}"
-                if word_data.get('example'):
-                    line += f" | {word_data['example']}"
-                if word_data.get('example_translation'):
-                    line += f" | {word_data['example_translation']}"
-                f.write(line)
+            DataLoader.recover_words()
+            
+            with open(DATA_FILES['words'], 'a+b') as f:
+                base_size = f.seek(0, os.SEEK_END)
+                needs_newline = False
+                if base_size:
+                    f.seek(base_size - 1)
+                    needs_newline = f.read(1) != b'\n'
+                block = ('\n' if needs_newline else '') + lines
+                
+                WordJournal.write(base_size, block)
+                f.write(block.encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+            
+            WordJournal.clear()
             return True
         except Exception as e:
-            print(f"Ошибка сохранения слова: {e}")
+            print(f"Ошибка сохранения слов: {e}")
             return False
+    
+    @staticmethod
+    def recover_words():
+        """
+        Восстановление словаря после сбоя по журналу добавления слов
+        
+        Полный журнал дописывает в словарь недостающую часть пакета,
+        недописанный журнал отбрасывается.
+        """
+        if not WordJournal.exists():
+            return
+        
+        entry = WordJournal.read()
+        if entry is None:
+            print("Предупреждение: недописанный журнал словаря отброшен")
+            WordJournal.clear()
+            return
+        
+        base_size, block = entry
+        data = block.encode('utf-8')
+        with open(DATA_FILES['words'], 'a+b') as f:
+            size = f.seek(0, os.SEEK_END)
+            tail = b''
+            if size >= base_size:
+                f.seek(base_size)
+                tail = f.read()
+            
+            if tail == data:
+                missing = b''
+            elif data.startswith(tail):
+                missing = data[len(tail):]
+            else:
+                # Словарь менялся после сбоя - дописываем пакет целиком
+                missing = data.lstrip(b'\n')
+                if size:
+                    f.seek(size - 1)
+                    if f.read(1) != b'\n':
+                        missing = b'\n' + missing
+            
+            if missing:
+                f.write(missing)
+                f.flush()
+                os.fsync(f.fileno())
+                recovered = missing.count(b'\n')
+                print(f"Восстановлено слов из журнала: {recovered}")
+        
+        WordJournal.clear()
@@ -0,0 +1,62 @@
+"""
+Книга правил с ленивой загрузкой текста
+"""
+
+from collections import OrderedDict
+from collections.abc import Sequence
+from config import RULES_CACHE_SIZE
+
+class RuleBook(Sequence):
+    """
+    Последовательность правил {'title', 'content'}, где текст читается по требованию
+    
+    Заголовки известны сразу (их достаточно для списка правил), а текст
+    правила загружается при первом обращении и хранится в ограниченном
+    LRU-кэше последних открытых правил.
+    """
+    
+    def __init__(self, titles, content_loader, cache_size=RULES_CACHE_SIZE):
+        """
+        Args:
+            titles: список заголовков правил
+            content_loader: функция index -> текст правила
+            cache_size: сколько текстов правил держать в памяти
+        """
+        self.titles = list(titles)
+        self._content_loader = content_loader
+        self._cache_size = cache_size
+        self._contents = OrderedDict()
+    
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.titles)
+        if not 0 <= index < len(self.titles):
+            raise IndexError(index)
+        return {'title': self.titles[index], 'content': self.content(index)}
+    
+    def __len__(self):
+        return len(self.titles)
+    
+    def content(self, index):
+        """Текст правила (из LRU-кэша или с диска)"""
+        if index in self._contents:
+            self._contents.move_to_end(index)
+            return self._contents[index]
+        
+        content = self._content_loader(index)
+        self._contents[index] = content
+        if len(self._contents) > self._cache_size:
+            self._contents.popitem(last=False)
+        return content
+    
+    def iter_contents(self):
+        """Тексты всех правил по порядку (для индексации, кэш не заполняется)"""
+        for index in range(len(self.titles)):
+            content = self._contents.get(index)
+            yield content if content is not None else self._content_loader(index)
+    
+    def replace(self, other):
+        """Заменить содержимое книги на месте (при перезагрузке файла)"""
+        self.titles = list(other.titles)
+        self._content_loader = other._content_loader
+        self._contents = OrderedDict()
@@ -0,0 +1,218 @@
+"""
+Интервальное повторение слов (алгоритм SM-2)
+"""
+
+import heapq
+import itertools
+import json
+import os
+import random
+import time
+from config import (DATA_FILES, REVIEW_INITIAL_EASE, REVIEW_MIN_EASE,
+                    REVIEW_RELEARN_MINUTES, REVIEW_MAX_INTERVAL_DAYS)
+from data.store import word_key
+from utils.helpers import VERDICT_CORRECT, VERDICT_ALMOST, VERDICT_WRONG
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# Оценка ответа по шкале SM-2 (0-5) для вердикта проверки
+QUALITY_BY_VERDICT = {
+    VERDICT_CORRECT: 5,
+    VERDICT_ALMOST: 3,
+    VERDICT_WRONG: 1,
+}
+QUALITY_SKIPPED = 0
+
+# Ответы с оценкой ниже этой начинают повторение слова заново
+MIN_PASSING_QUALITY = 3
+
+# Поля состояния карточки
+REPETITIONS, EASE, INTERVAL, DUE, SERIAL = range(5)
+
+# Во сколько раз куча может превысить число карточек из-за устаревших записей
+HEAP_COMPACT_RATIO = 2
+
+class ReviewScheduler:
+    """
+    Очередь повторения слов
+    
+    Для каждого изученного слова хранится состояние SM-2 (число успешных
+    повторений подряд, легкость, интервал в днях и время следующего
+    повторения), а время повторения лежит в куче с ленивым удалением:
+    после ответа в кучу добавляется новая запись, а прежняя пропускается
+    по несовпадающему номеру. Поэтому ответ обрабатывается за O(log M),
+    а N самых «просроченных» слов выбираются за O(N log M).
+    
+    Слова, которые еще не встречались в тестах, хранятся отдельным
+    перемешанным списком и идут после просроченных, но раньше тех, чье
+    время повторения еще не наступило.
+    """
+    
+    def __init__(self, cards=None):
+        """
+        Args:
+            cards: {ключ слова: [повторений, легкость, интервал, время повторения]}
+        """
+        self._serials = itertools.count()
+        self._cards = {}
+        for key, (repetitions, ease, interval, due) in (cards or {}).items():
+            self._cards[key] = [repetitions, ease, interval, due, next(self._serials)]
+        self._words = {}
+        self._new = []
+        self._heap = []
+        self._rebuild_heap()
+    
+    def __len__(self):
+        return len(self._cards)
+    
+    def _rebuild_heap(self):
+        """Построение кучи заново по текущим карточкам (O(M))"""
+        self._heap = [(card[DUE], card[SERIAL], key) for key, card in self._cards.items()]
+        heapq.heapify(self._heap)
+    
+    def sync(self, words):
+        """Привязка к словам словаря (после загрузки или перезагрузки словаря)"""
+        self._words = {}
+        for word in words:
+            self._words.setdefault(word_key(word), word)
+        self._new = [key for key in self._words if key not in self._cards]
+        random.shuffle(self._new)
+    
+    def add(self, word):
+        """Новое слово словаря"""
+        key = word_key(word)
+        if key in self._words:
+            return
+        self._words[key] = word
+        if key not in self._cards:
+            # Случайное место, чтобы новые слова не шли строго первыми
+            self._new.append(key)
+            position = random.randrange(len(self._new))
+            self._new[position], self._new[-1] = self._new[-1], self._new[position]
+    
+    def _is_current(self, entry):
+        """Актуальна ли запись кучи (слово есть в словаре, карточка не менялась)"""
+        due, serial, key = entry
+        card = self._cards.get(key)
+        return card is not None and card[SERIAL] == serial and key in self._words
+    
+    def due_words(self, count, now=None):
+        """
+        count слов, которые пора повторить: сначала просроченные (раньше
+        всех - самые давние), затем новые, затем ближайшие по времени
+        
+        Выбранные записи возвращаются в кучу, так что очередь меняется
+        только ответами (review).
+        """
+        now = time.time() if now is None else now
+        chosen = []
+        popped = []
+        
+        def take_from_heap(until):
+            while self._heap and len(chosen) < count:
+                entry = self._heap[0]
+                if not self._is_current(entry):
+                    heapq.heappop(self._heap)
+                    continue
+                if entry[0] > until:
+                    return
+                popped.append(heapq.heappop(self._heap))
+                chosen.append(entry[2])
+        
+        take_from_heap(now)
+        
+        position = len(self._new) - 1
+        while position >= 0 and len(chosen) < count:
+            key = self._new[position]
+            if key in self._cards or key not in self._words:
+                # Слово уже повторялось или удалено из словаря
+                if position == len(self._new) - 1:
+                    self._new.pop()
+            else:
+                chosen.append(key)
+            position -= 1
+        
+        take_from_heap(float('inf'))
+        
+        for entry in popped:
+            heapq.heappush(self._heap, entry)
+        return [self._words[key] for key in chosen]
+    
+    def review(self, word, quality, now=None):
+        """
+        Обновление состояния слова по оценке ответа (0-5) по правилам SM-2
+        
+        Returns:
+            время следующего повторения
+        """
+        now = time.time() if now is None else now
+        key = word_key(word)
+        card = self._cards.get(key)
+        if card is None:
+            card = self._cards[key] = [0, REVIEW_INITIAL_EASE, 0, now, 0]
+        
+        if quality >= MIN_PASSING_QUALITY:
+            if card[REPETITIONS] == 0:
+                interval = 1
+            elif card[REPETITIONS] == 1:
+                interval = 6
+            else:
+                interval = card[INTERVAL] * card[EASE]
+            card[REPETITIONS] += 1
+            card[INTERVAL] = min(interval, REVIEW_MAX_INTERVAL_DAYS)
+            card[DUE] = now + card[INTERVAL] * SECONDS_PER_DAY
+        else:
+            # Слово повторяется заново, а в этой же сессии - через несколько минут
+            card[REPETITIONS] = 0
+            card[INTERVAL] = 0
+            card[DUE] = now + REVIEW_RELEARN_MINUTES * 60
+        
+        penalty = 5 - quality
+        card[EASE] = max(REVIEW_MIN_EASE, card[EASE] + 0.1 - penalty * (0.08 + penalty * 0.02))
+        
+        card[SERIAL] = next(self._serials)
+        heapq.heappush(self._heap, (card[DUE], card[SERIAL], key))
+        if len(self._heap) > HEAP_COMPACT_RATIO * len(self._cards) + 64:
+            self._rebuild_heap()
+        return card[DUE]
+    
+    def merge(self, other):
+        """
+        Перенести карточки из другой очереди (ответы до окончания загрузки)
+        
+        Карточки other новее сохраненных и заменяют их.
+        """
+        if not other._cards:
+            return
+        for key, card in other._cards.items():
+            self._cards[key] = card[:SERIAL] + [next(self._serials)]
+        self._rebuild_heap()
+    
+    def review_verdict(self, word, verdict):
+        """Обновление состояния слова по вердикту проверки (None - вопрос пропущен)"""
+        quality = QUALITY_SKIPPED if verdict is None else QUALITY_BY_VERDICT[verdict]
+        return self.review(word, quality)
+    
+    @staticmethod
+    def load():
+        """Загрузка состояния повторения"""
+        try:
+            if os.path.exists(DATA_FILES['schedule']):
+                with open(DATA_FILES['schedule'], 'r', encoding='utf-8') as f:
+                    return ReviewScheduler(json.load(f).get('cards', {}))
+        except Exception as e:
+            print(f"Ошибка загрузки расписания повторений: {e}")
+        return ReviewScheduler()
+    
+    def save(self):
+        """Атомарное сохранение состояния повторения"""
+        cards = {key: card[:SERIAL] for key, card in self._cards.items()}
+        tmp_path = DATA_FILES['schedule'] + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'cards': cards}, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, DATA_FILES['schedule'])
+            return True
+        except OSError as e:
+            print(f"Ошибка сохранения расписания повторений: {e}")
+            return False
@@ -0,0 +1,250 @@
+"""
+Хранение данных в SQLite
+"""
+
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from config import DATA_FILES
+from data.cross_reference import CrossReference
+from data.exercise_bank import ExerciseBank
+from data.rule_book import RuleBook
+from data.store import WordEntry, ExerciseEntry, WordStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY,
+    word TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    transcription TEXT NOT NULL DEFAULT '',
+    example TEXT NOT NULL DEFAULT '',
+    example_translation TEXT NOT NULL DEFAULT ''
+);
+-- Поиск по словам идет по индексу в памяти: индексы базы только замедляли вставку
+DROP INDEX IF EXISTS idx_words_word;
+DROP INDEX IF EXISTS idx_words_translation;
+CREATE TABLE IF NOT EXISTS topics (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS exercises (
+    id INTEGER PRIMARY KEY,
+    topic_id INTEGER NOT NULL REFERENCES topics(id),
+    sentence TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    hint TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_exercises_topic ON exercises(topic_id);
+CREATE TABLE IF NOT EXISTS rules (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS progress (
+    key TEXT PRIMARY KEY,
+    value
+);
+"""
+
+_init_lock = threading.Lock()
+_initialized = False
+
+def connect():
+    """
+    Соединение с базой данных
+    
+    При первом обращении создается схема и выполняется однократная
+    миграция из текстовых файлов. Соединение открывается на каждый вызов,
+    поэтому функции можно вызывать из потоков загрузки.
+    """
+    global _initialized
+    connection = sqlite3.connect(DATA_FILES['database'])
+    if not _initialized:
+        with _init_lock:
+            if not _initialized:
+                connection.executescript(SCHEMA)
+                SQLiteDataLoader.migrate_from_text(connection)
+                _initialized = True
+    return connection
+
+class SQLiteDataLoader:
+    """Загрузка данных из SQLite (тот же интерфейс, что и у DataLoader)"""
+    
+    @staticmethod
+    def migrate_from_text(connection):
+        """Однократный перенос слов, упражнений, правил и прогресса из текстовых файлов"""
+        if connection.execute("SELECT 1 FROM meta WHERE key = 'migrated'").fetchone():
+            return
+        
+        from data.loader import DataLoader
+        from data.progress import ProgressManager
+        
+        DataLoader.ensure_data_files()
+        print(f"Перенос данных в базу {DATA_FILES['database']}...")
+        
+        with connection:
+            connection.executemany(
+                "INSERT INTO words (word, translation, transcription, example, example_translation) "
+                "VALUES (?, ?, ?, ?, ?)",
+                ((entry.word, entry.translation, entry.transcription, entry.example,
+                  entry.example_translation) for _, entry in DataLoader.iter_words())
+            )
+            
+            exercises = DataLoader.load_exercises()
+            for topic in exercises:
+                connection.execute("INSERT OR IGNORE INTO topics (name) VALUES (?)", (topic,))
+                topic_id = connection.execute(
+                    "SELECT id FROM topics WHERE name = ?", (topic,)
+                ).fetchone()[0]
+                connection.executemany(
+                    "INSERT INTO exercises (topic_id, sentence, answer, hint) VALUES (?, ?, ?, ?)",
+                    ((topic_id, ex['sentence'], ex['answer'], ex['hint']) for ex in exercises[topic])
+                )
+            
+            connection.executemany(
+                "INSERT INTO rules (title, content) VALUES (?, ?)",
+                ((rule['title'], rule['content']) for rule in DataLoader.load_rules())
+            )
+            
+            progress = ProgressManager.load()
+            connection.executemany(
+                "INSERT OR REPLACE INTO progress (key, value) VALUES (?, ?)",
+                progress.items()
+            )
+            
+            connection.execute("INSERT INTO meta (key, value) VALUES ('migrated', ?)",
+                               (datetime.now().strftime('%Y-%m-%d %H:%M:%S'),))
+        
+        word_count = connection.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+        print(f"✓ Перенесено слов: {word_count}")
+    
+    @staticmethod
+    def ensure_data_files():
+        """Создание базы и миграция при первом запуске"""
+        connect().close()
+    
+    @staticmethod
+    def recover_words():
+        """Восстановление не требуется: целостность обеспечивает журнал SQLite"""
+    
+    @staticmethod
+    def load_words():
+        """Загрузка слов"""
+        return WordStore(entry for _, entry in SQLiteDataLoader.iter_words())
+    
+    @staticmethod
+    def iter_words(path=None):
+        """
+        Потоковое чтение словаря
+        
+        Yields:
+            кортежи (id слова, WordEntry)
+        """
+        with closing(connect()) as connection:
+            cursor = connection.execute(
+                "SELECT id, word, translation, transcription, example, example_translation "
+                "FROM words ORDER BY id"
+            )
+            for row in cursor:
+                yield row[0], WordEntry(*row[1:])
+    
+    @staticmethod
+    def load_exercises():
+        """Загрузка упражнений: количество по темам сразу, сами темы - по требованию"""
+        with closing(connect()) as connection:
+            topic_counts = dict(connection.execute(
+                "SELECT topics.name, COUNT(exercises.id) FROM topics "
+                "LEFT JOIN exercises ON exercises.topic_id = topics.id "
+                "GROUP BY topics.id ORDER BY topics.id"
+            ))
+        return ExerciseBank(topic_counts, SQLiteDataLoader.load_exercise_topic)
+    
+    @staticmethod
+    def load_exercise_topic(topic):
+        """Упражнения одной темы"""
+        with closing(connect()) as connection:
+            rows = connection.execute(
+                "SELECT sentence, answer, hint FROM exercises "
+                "WHERE topic_id = (SELECT id FROM topics WHERE name = ?) ORDER BY id",
+                (topic,)
+            ).fetchall()
+        return [ExerciseEntry(topic, *row) for row in rows]
+    
+    @staticmethod
+    def load_rules():
+        """Загрузка заголовков правил, текст правила читается при первом открытии"""
+        with closing(connect()) as connection:
+            rows = connection.execute("SELECT id, title FROM rules ORDER BY id").fetchall()
+        rule_ids = [rule_id for rule_id, _ in rows]
+        
+        def load_content(rule_index):
+            with closing(connect()) as connection:
+                return connection.execute(
+                    "SELECT content FROM rules WHERE id = ?", (rule_ids[rule_index],)
+                ).fetchone()[0]
+        
+        return RuleBook([title for _, title in rows], load_content)
+    
+    @staticmethod
+    def load_cross_reference(exercise_bank, rule_book):
+        """Связь слов с упражнениями и правилами"""
+        return CrossReference.build(exercise_bank, rule_book)
+    
+    @staticmethod
+    def save_word(word_data):
+        """Сохранение нового слова"""
+        return SQLiteDataLoader.save_words([word_data])
+    
+    @staticmethod
+    def save_words(words):
+        """Пакетное сохранение слов одной транзакцией"""
+        try:
+            with closing(connect()) as connection, connection:
+                connection.executemany(
+                    "INSERT INTO words (word, translation, transcription, example, example_translation) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    ((word['word'], word['translation'], word.get('transcription', ''),
+                      word.get('example', ''), word.get('example_translation', '')) for word in words)
+                )
+            return True
+        except sqlite3.Error as e:
+            print(f"Ошибка сохранения слов: {e}")
+            return False
+
+class SQLiteProgressManager:
+    """Прогресс пользователя в SQLite (тот же интерфейс, что и у ProgressManager)"""
+    
+    @staticmethod
+    def load():
+        """Загрузка сохраненного прогресса"""
+        try:
+            with closing(connect()) as connection:
+                progress = dict(connection.execute("SELECT key, value FROM progress"))
+        except sqlite3.Error as e:
+            print(f"Ошибка загрузки прогресса: {e}")
+            progress = {}
+        progress.setdefault('score', 0)
+        progress.setdefault('total_attempts', 0)
+        return progress
+    
+    @staticmethod
+    def save(score, total_attempts):
+        """Сохранение прогресса"""
+        try:
+            with closing(connect()) as connection, connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO progress (key, value) VALUES (?, ?)",
+                    (('score', score),
+                     ('total_attempts', total_attempts),
+                     ('last_session', datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+                )
+            print("Прогресс сохранен")
+            return True
+        except sqlite3.Error as e:
+            print(f"Ошибка сохранения прогресса: {e}")
+            return False
@@ -0,0 +1,130 @@
+"""
+Компактное хранение слов и упражнений
+"""
+
+import sys
+from collections.abc import Sequence
+
+WORD_FIELDS = ('word', 'translation', 'transcription', 'example', 'example_translation')
+EXERCISE_FIELDS = ('rule', 'sentence', 'answer', 'hint')
+
+def word_key(word):
+    """Постоянный ключ слова: само слово в нижнем регистре без лишних пробелов"""
+    return ' '.join(word['word'].lower().split())
+
+def exercise_key(exercise):
+    """
+    Постоянный ключ упражнения: тема и предложение (без ответа, чтобы
+    исправление ответа в файле не сбрасывало историю)
+    """
+    return f"{exercise['rule']}\n{' '.join(exercise['sentence'].split())}"
+
+class Record:
+    """
+    Базовый класс записи со __slots__
+    
+    Запись поддерживает тот же доступ, что и словарь: record['word'],
+    record.get('example'), поэтому интерфейс работает с ней без изменений,
+    но не хранит собственный __dict__ и ключи-строки в каждом объекте.
+    """
+    
+    __slots__ = ()
+    
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __contains__(self, key):
+        return key in self.__slots__
+    
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+    
+    def __hash__(self):
+        return hash(tuple(getattr(self, field) for field in self.__slots__))
+    
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+    
+    def get(self, key, default=None):
+        """Значение поля или default"""
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key)
+    
+    def keys(self):
+        """Имена полей"""
+        return self.__slots__
+    
+    def to_dict(self):
+        """Преобразование записи в обычный словарь"""
+        return {field: getattr(self, field) for field in self.__slots__}
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Создание записи из словаря (или другой записи)"""
+        if isinstance(data, cls):
+            return data
+        return cls(**{field: data.get(field, '') for field in cls.__slots__})
+
+class WordEntry(Record):
+    """Слово словаря"""
+    
+    __slots__ = WORD_FIELDS
+    
+    def __init__(self, word, translation, transcription='', example='', example_translation=''):
+        self.word = word
+        self.translation = translation
+        self.transcription = transcription
+        self.example = example
+        self.example_translation = example_translation
+
+class ExerciseEntry(Record):
+    """Грамматическое упражнение"""
+    
+    __slots__ = EXERCISE_FIELDS
+    
+    def __init__(self, rule, sentence, answer, hint=''):
+        # Название темы интернируется: все упражнения темы ссылаются на одну строку
+        self.rule = sys.intern(rule)
+        self.sentence = sentence
+        self.answer = answer
+        self.hint = hint
+
+class WordStore(Sequence):
+    """
+    Словарь в виде компактной последовательности записей WordEntry
+    
+    Поддерживает доступ по индексу, len(), итерацию и random.sample(),
+    то есть все операции, которые вкладки выполняли над списком словарей.
+    """
+    
+    def __init__(self, words=()):
+        self._entries = [WordEntry.from_dict(word) for word in words]
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return WordStore(self._entries[index])
+        return self._entries[index]
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __iter__(self):
+        return iter(self._entries)
+    
+    def append(self, word):
+        """Добавить слово (словарь или WordEntry), вернуть его индекс"""
+        self._entries.append(WordEntry.from_dict(word))
+        return len(self._entries) - 1
+    
+    def extend(self, words):
+        """Добавить несколько слов"""
+        self._entries.extend(WordEntry.from_dict(word) for word in words)
+    
+    def replace(self, words):
+        """Заменить содержимое хранилища на месте (при перезагрузке файла)"""
+        self._entries = [WordEntry.from_dict(word) for word in words]
@@ -0,0 +1,74 @@
+"""
+Отслеживание изменений файлов данных
+"""
+
+import os
+from config import WATCH_INTERVAL_MS
+
+class FileWatcher:
+    """
+    Наблюдатель за файлами данных на основе опроса os.stat в цикле Tk
+    
+    Раз в interval_ms для каждого файла сравниваются размер и mtime.
+    Изменение сообщается только после того, как отпечаток файла не менялся
+    между двумя опросами: так недописанный файл не будет перезагружен.
+    """
+    
+    def __init__(self, root, paths, on_change, interval_ms=WATCH_INTERVAL_MS):
+        """
+        Args:
+            root: корневое окно Tk (для планирования опроса через after)
+            paths: словарь {ключ: путь к файлу}
+            on_change: функция, вызываемая с ключом измененного файла
+            interval_ms: интервал опроса в миллисекундах
+        """
+        self.root = root
+        self.paths = dict(paths)
+        self.on_change = on_change
+        self.interval_ms = interval_ms
+        self._stamps = {key: FileWatcher.file_stamp(path) for key, path in self.paths.items()}
+        self._pending = {}
+        self._after_id = None
+    
+    @staticmethod
+    def file_stamp(path):
+        """Отпечаток файла (размер, mtime) или None, если файла нет"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+    
+    def start(self):
+        """Начать опрос"""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._poll)
+    
+    def stop(self):
+        """Остановить опрос"""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+    
+    def acknowledge(self, key):
+        """Принять текущее состояние файла (например, после записи самим приложением)"""
+        self._stamps[key] = FileWatcher.file_stamp(self.paths[key])
+        self._pending.pop(key, None)
+    
+    def _poll(self):
+        """Один цикл опроса"""
+        for key, path in self.paths.items():
+            stamp = FileWatcher.file_stamp(path)
+            if stamp is None or stamp == self._stamps[key]:
+                self._pending.pop(key, None)
+                continue
+            
+            if self._pending.get(key) == stamp:
+                # Файл перестал меняться - можно перезагружать
+                del self._pending[key]
+                self._stamps[key] = stamp
+                self.on_change(key)
+            else:
+                self._pending[key] = stamp
+        
+        self._after_id = self.root.after(self.interval_ms, self._poll)
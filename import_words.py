@@ -0,0 +1,63 @@
+"""
+Импорт слов в словарь из CSV, TSV или текстового экспорта Anki
+
+Примеры:
+    python import_words.py deck.csv
+    python import_words.py anki_export.txt --format anki --columns word,translation
+    python import_words.py words.tsv --dry-run
+"""
+
+import argparse
+import sys
+from data.backend import get_data_loader
+from data.importer import WordImporter
+from data.store import WORD_FIELDS
+
+def parse_args():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Импорт слов в словарь приложения")
+    parser.add_argument('path', help="файл для импорта")
+    parser.add_argument(
+        '--format',
+        choices=WordImporter.FORMATS,
+        help="формат файла (по умолчанию определяется автоматически)"
+    )
+    parser.add_argument(
+        '--columns',
+        default=','.join(WORD_FIELDS),
+        help="поля словаря в порядке столбцов через запятую, пустое имя - пропустить столбец "
+             f"(по умолчанию {','.join(WORD_FIELDS)})"
+    )
+    parser.add_argument('--dry-run', action='store_true', help="проверить файл без записи в словарь")
+    parser.add_argument(
+        '--show-skipped',
+        type=int,
+        default=20,
+        help="сколько пропущенных строк показать в отчете"
+    )
+    return parser.parse_args()
+
+def main():
+    """Запуск импорта"""
+    args = parse_args()
+    columns = [column.strip() for column in args.columns.split(',')]
+    unknown = [column for column in columns if column and column not in WORD_FIELDS]
+    if unknown:
+        print(f"Неизвестные поля: {', '.join(unknown)}")
+        return 2
+    
+    get_data_loader().ensure_data_files()
+    importer = WordImporter(columns=columns, dry_run=args.dry_run)
+    try:
+        report = importer.import_file(args.path, args.format)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Ошибка импорта: {e}")
+        return 1
+    
+    print(report.summary(args.show_skipped))
+    if args.dry_run:
+        print("Пробный запуск: словарь не изменен")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
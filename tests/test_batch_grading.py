@@ -0,0 +1,91 @@
+"""
+Пакетная проверка ответов совпадает с проверкой по одной строке
+
+Запуск: python -m pytest tests
+"""
+
+import pytest
+from utils import helpers
+from utils.helpers import (AnswerMatcher, check_answer_match, grade_answers_batch,
+                           VERDICT_CORRECT, VERDICT_ALMOST, VERDICT_WRONG)
+
+CORRECT_ANSWERS = [
+    'собака',
+    'дом, здание',
+    'красивый / прекрасный',
+    'the apple',
+    'ёлка',
+    "doesn't work",
+    'will not go',
+    'cannot swim',
+    'received',
+    'beautiful',
+    'works',
+]
+
+# (ответ пользователя, номер правильного ответа)
+ATTEMPTS = [
+    ('собака', 0),
+    ('Собака!', 0),
+    ('кошка', 0),
+    ('', 0),
+    ('дом', 1),
+    ('здание, дом', 1),
+    ('дом / здание', 1),
+    ('дом, сарай', 1),
+    ('прекрасный', 2),
+    ('красивый; прекрасный', 2),
+    ('apple', 3),
+    ('an apple', 3),
+    ('The apple.', 3),
+    ('елка', 4),
+    ('Ёлка', 4),
+    ('does not work', 5),
+    ('doesn’t work', 5),
+    ('do not work', 5),
+    ("won't go", 6),
+    ('will not  go', 6),
+    ("can't swim", 7),
+    ('can not swim', 7),
+    ('recieved', 8),
+    ('beatiful', 9),
+    ('beatiful, prety', 9),
+    ('work', 10),
+    ('worsk', 10),
+]
+
+@pytest.fixture(params=['numpy', 'python'])
+def backend(request, monkeypatch):
+    """Проверка идет и через NumPy (если установлен), и на списках"""
+    if request.param == 'numpy':
+        if helpers.np is None:
+            pytest.skip("NumPy не установлен")
+    else:
+        monkeypatch.setattr(helpers, 'np', None)
+    return request.param
+
+def run_batch(attempts, verdicts=False):
+    user_answers = [user for user, _ in attempts]
+    answer_ids = [answer_id for _, answer_id in attempts]
+    return list(grade_answers_batch(user_answers, answer_ids, CORRECT_ANSWERS, verdicts=verdicts))
+
+def test_matches_scalar_check(backend):
+    expected = [check_answer_match(user, CORRECT_ANSWERS[answer_id]) for user, answer_id in ATTEMPTS]
+    assert [bool(value) for value in run_batch(ATTEMPTS)] == expected
+
+def test_verdicts_match_scalar_grade(backend):
+    expected = [AnswerMatcher(CORRECT_ANSWERS[answer_id]).grade(user) for user, answer_id in ATTEMPTS]
+    assert run_batch(ATTEMPTS, verdicts=True) == expected
+
+def test_all_verdicts_covered():
+    verdicts = {AnswerMatcher(CORRECT_ANSWERS[answer_id]).grade(user) for user, answer_id in ATTEMPTS}
+    assert verdicts == {VERDICT_CORRECT, VERDICT_ALMOST, VERDICT_WRONG}
+
+def test_empty_input(backend):
+    assert run_batch([]) == []
+    assert run_batch([], verdicts=True) == []
+
+def test_repeated_rows(backend):
+    attempts = ATTEMPTS * 3
+    expected = [AnswerMatcher(CORRECT_ANSWERS[answer_id]).grade(user) for user, answer_id in attempts]
+    assert run_batch(attempts, verdicts=True) == expected
@@ -3,9 +3,15 @@
 """
 
 import tkinter as tk
-from tkinter import messagebox, scrolledtext
+from tkinter import messagebox, scrolledtext, font as tkfont
 import random
-from config import COLORS, FONTS, EXERCISE_MIN_COUNT, EXERCISE_MAX_COUNT, EXERCISE_DEFAULT_COUNT
+from config import (COLORS, FONTS, EXERCISE_MIN_COUNT, EXERCISE_MAX_COUNT, EXERCISE_DEFAULT_COUNT,
+                    ALMOST_CORRECT_COUNTS)
+from ui.word_links import WordLinks
+from utils.helpers import compile_answer, VERDICT_CORRECT, VERDICT_ALMOST, VERDICT_WRONG
+
+# Ширина поля предложения (в символах «0» шрифта предложения)
+SENTENCE_WIDTH = 40
 
 class ExercisesTab:
     """Класс для вкладки упражнений"""
@@ -49,27 +55,14 @@ class ExercisesTab:
         ).pack(pady=10, padx=10)
         
         # Фрейм для чекбоксов
-        checkbox_frame = tk.Frame(left_panel, bg='white')
-        checkbox_frame.pack(padx=10, pady=5)
+        self.checkbox_frame = tk.Frame(left_panel, bg='white')
+        self.checkbox_frame.pack(padx=10, pady=5)
         
         # Словарь для хранения переменных чекбоксов
         self.topic_vars = {}
         
-        # Создаем чекбоксы для каждой темы
-        for topic in self.app.exercises_data.keys():
-            var = tk.BooleanVar()
-            self.topic_vars[topic] = var
-            
-            cb = tk.Checkbutton(
-                checkbox_frame,
-                text=f"{topic} ({len(self.app.exercises_data[topic])})",
-                variable=var,
-                font=FONTS['small'],
-                bg='white',
-                anchor='w',
-                command=self.update_selected_topics
-            )
-            cb.pack(fill='x', pady=3)
+        # Чекбоксы появятся после загрузки упражнений
+        self.populate_topics()
         
         # Кнопки выбора всех/сброса
         button_frame = tk.Frame(left_panel, bg='white')
@@ -130,6 +123,17 @@ class ExercisesTab:
         )
         self.exercise_count_scale.pack(pady=5)
         
+        # Чаще давать упражнения с ошибками и давно не решавшиеся
+        # (по умолчанию - прежнее равномерное перемешивание)
+        self.weighted_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            settings_frame,
+            text="🎯 Чаще - с ошибками",
+            variable=self.weighted_var,
+            font=FONTS['tiny'],
+            bg='white'
+        ).pack()
+        
         # Кнопка начала упражнений
         tk.Button(
             left_panel,
@@ -141,6 +145,45 @@ class ExercisesTab:
             padx=20,
             pady=10
         ).pack(pady=15)
+        
+        # Упражнения по поисковому запросу
+        self.create_search_panel(left_panel)
+    
+    def create_search_panel(self, parent):
+        """Создание поля поиска упражнений по тексту"""
+        tk.Label(
+            parent,
+            text="🔎 Упражнения со словами:",
+            font=FONTS['small'],
+            bg='white',
+            fg=COLORS['dark']
+        ).pack(pady=(5, 0))
+        
+        search_frame = tk.Frame(parent, bg='white')
+        search_frame.pack(pady=5, padx=10)
+        
+        self.search_entry = tk.Entry(search_frame, font=FONTS['small'], width=18)
+        self.search_entry.pack(side='left', padx=(0, 5))
+        self.search_entry.bind('<Return>', lambda e: self.start_search_exercises())
+        
+        tk.Button(
+            search_frame,
+            text="Начать",
+            command=self.start_search_exercises,
+            font=FONTS['tiny'],
+            bg=COLORS['purple'],
+            fg='white',
+            padx=8,
+            pady=3
+        ).pack(side='left')
+        
+        tk.Label(
+            parent,
+            text='например: since или "have been"',
+            font=FONTS['tiny'],
+            bg='white',
+            fg=COLORS['gray']
+        ).pack(pady=(0, 10))
     
     def create_right_panel(self, parent):
         """Создание правой панели с упражнениями"""
@@ -181,16 +224,26 @@ class ExercisesTab:
         )
         self.exercise_instruction_label.pack(pady=5)
         
-        # Предложение
-        self.sentence_label = tk.Label(
+        # Предложение (Text, чтобы слова словаря были ссылками; высота
+        # подбирается под текст, как у метки с переносом строк)
+        self.sentence_font = tkfont.Font(family='Arial', size=18)
+        self.sentence_text = tk.Text(
             exercise_frame,
-            text="",
-            font=('Arial', 18),
+            font=self.sentence_font,
             bg='white',
             fg='#34495e',
-            wraplength=500
+            width=SENTENCE_WIDTH,
+            height=1,
+            wrap=tk.WORD,
+            relief='flat',
+            bd=0,
+            highlightthickness=0,
+            cursor='arrow',
+            state='disabled'
         )
-        self.sentence_label.pack(pady=20, padx=20)
+        self.sentence_text.tag_config('center', justify='center')
+        self.sentence_text.pack(pady=20, padx=20)
+        self.sentence_links = WordLinks(self.app, self.sentence_text)
         
         # Подсказка
         self.hint_label = tk.Label(
@@ -288,10 +341,47 @@ class ExercisesTab:
         )
         self.score_label.pack(side='left', padx=10)
     
+    def populate_topics(self):
+        """Создание чекбоксов тем по загруженным упражнениям (выбор сохраняется)"""
+        selected = {topic for topic, var in self.topic_vars.items() if var.get()}
+        
+        for widget in self.checkbox_frame.winfo_children():
+            widget.destroy()
+        self.topic_vars = {}
+        
+        if not self.app.exercises_data:
+            tk.Label(
+                self.checkbox_frame,
+                text="Загрузка упражнений...",
+                font=FONTS['small'],
+                bg='white',
+                fg=COLORS['gray']
+            ).pack(pady=3)
+            return
+        
+        # Создаем чекбоксы для каждой темы
+        for topic in self.app.exercises_data.keys():
+            var = tk.BooleanVar(value=topic in selected)
+            self.topic_vars[topic] = var
+            
+            cb = tk.Checkbutton(
+                self.checkbox_frame,
+                text=f"{topic} ({self.app.exercises_data.topic_count(topic)})",
+                variable=var,
+                font=FONTS['small'],
+                bg='white',
+                anchor='w',
+                command=self.update_selected_topics
+            )
+            cb.pack(fill='x', pady=3)
+        
+        if selected:
+            self.update_selected_topics()
+    
     def update_selected_topics(self):
         """Обновить информацию о выбранных темах"""
         selected = [topic for topic, var in self.topic_vars.items() if var.get()]
-        total_exercises = sum(len(self.app.exercises_data[topic]) for topic in selected)
+        total_exercises = self.app.exercises_data.total_count(selected)
         
         self.selected_info_label.config(
             text=f"Выбрано тем: {len(selected)}\nВсего упражнений: {total_exercises}"
@@ -323,6 +413,14 @@ class ExercisesTab:
             messagebox.showwarning("Внимание", "Выберите хотя бы одну тему!")
             return
         
+        # Выбор по истории ответов: O(N) таблицами псевдонимов
+        if self.weighted_var.get():
+            exercises = self.app.exercise_sampler.draw(
+                self.selected_topics, self.exercise_count_var.get(), self.app.item_stats
+            )
+            self.start_exercise_set(exercises, "🎯 Упражнения с учетом ошибок")
+            return
+        
         # Собираем все упражнения из выбранных тем
         all_exercises = []
         for topic in self.selected_topics:
@@ -331,14 +429,47 @@ class ExercisesTab:
         # Перемешиваем и выбираем нужное количество
         random.shuffle(all_exercises)
         exercise_count = min(self.exercise_count_var.get(), len(all_exercises))
-        self.mixed_exercises = all_exercises[:exercise_count]
+        self.start_exercise_set(all_exercises[:exercise_count], "📚 Смешанные упражнения")
+    
+    def start_search_exercises(self):
+        """Начать упражнения, найденные по словам или фразе в кавычках"""
+        query = self.search_entry.get().strip()
+        if not query:
+            messagebox.showwarning("Внимание", "Введите слово или фразу для поиска!")
+            return
+        
+        if self.app.exercises_data and not self.app.exercises_search:
+            messagebox.showinfo("Поиск", "Индекс упражнений еще строится, попробуйте через секунду")
+            return
+        
+        # Самые подходящие упражнения из всех тем, без учета выбранных
+        exercises = []
+        for topic, number in self.app.exercises_search.search(query, limit=self.exercise_count_var.get()):
+            topic_exercises = self.app.exercises_data.get(topic, [])
+            if number < len(topic_exercises):
+                exercises.append(topic_exercises[number])
+        
+        if not exercises:
+            messagebox.showinfo("Поиск", f"Упражнения по запросу «{query}» не найдены")
+            return
+        
+        random.shuffle(exercises)
+        self.start_exercise_set(exercises, f"🔎 Упражнения: {query}")
+    
+    def start_exercise_set(self, exercises, title):
+        """Начать прохождение списка упражнений"""
+        self.mixed_exercises = exercises
+        
+        # Правильные ответы разбираются заранее, при проверке они уже готовы
+        for exercise in exercises:
+            compile_answer(exercise['answer'])
         
         # Сбрасываем счетчики и флаги
         self.current_exercise_index = 0
         self.exercise_results = []
         self.answer_checked = False
         
-        self.rule_title_label.config(text="📚 Смешанные упражнения")
+        self.rule_title_label.config(text=title)
         self.exercise_instruction_label.config(text="Поставьте глагол в правильную форму:")
         
         self.show_mixed_exercise()
@@ -353,7 +484,7 @@ class ExercisesTab:
         self.current_exercise = self.mixed_exercises[self.current_exercise_index]
         
         self.current_topic_label.config(text=f"📌 Тема: {self.current_exercise['rule']}")
-        self.sentence_label.config(text=self.current_exercise['sentence'])
+        self.show_sentence(self.current_exercise['sentence'])
         
         self.answer_entry.delete(0, tk.END)
         self.answer_entry.config(state='normal')
@@ -367,6 +498,40 @@ class ExercisesTab:
         
         self.answer_entry.focus()
     
+    def show_sentence(self, sentence):
+        """Показать предложение упражнения со ссылками на слова словаря"""
+        self.sentence_text.config(state='normal')
+        self.sentence_text.delete('1.0', tk.END)
+        self.sentence_text.insert('1.0', sentence, 'center')
+        self.sentence_links.highlight(sentence)
+        self.sentence_text.config(state='disabled', height=self.sentence_line_count(sentence))
+    
+    def sentence_line_count(self, sentence):
+        """Число строк предложения при переносе по словам на ширину поля"""
+        measure = self.sentence_font.measure
+        width = SENTENCE_WIDTH * measure('0')
+        space = measure(' ')
+        lines = 0
+        for paragraph in sentence.split('\n'):
+            lines += 1
+            line_width = 0
+            for word in paragraph.split():
+                word_width = measure(word)
+                if line_width and line_width + space + word_width > width:
+                    lines += 1
+                    line_width = 0
+                if line_width:
+                    line_width += space
+                # Слово длиннее строки переносится по буквам
+                lines += word_width // width
+                line_width += word_width % width if word_width > width else word_width
+        return max(1, lines)
+    
+    def refresh_word_links(self):
+        """Обновить ссылки на слова после загрузки словаря"""
+        if self.current_exercise:
+            self.sentence_links.highlight(self.current_exercise['sentence'])
+    
     def show_hint(self):
         """Показать подсказку"""
         if self.current_exercise and self.current_exercise['hint']:
@@ -384,30 +549,38 @@ class ExercisesTab:
         
         self.answer_checked = True
         
-        # Используем улучшенную проверку с поддержкой вариантов
-        from utils.helpers import check_answer_match, format_correct_answer
-        
-        is_correct = check_answer_match(user_answer, self.current_exercise['answer'])
+        # Проверка по заранее разобранным вариантам ответа
+        matcher = compile_answer(self.current_exercise['answer'])
+        verdict = matcher.grade(user_answer)
+        is_correct = verdict == VERDICT_CORRECT or (verdict == VERDICT_ALMOST and ALMOST_CORRECT_COUNTS)
         
         self.app.total_attempts += 1
+        self.app.item_stats.record_exercise(self.current_exercise, is_correct)
+        self.app.exercise_sampler.update(self.current_exercise, self.app.item_stats)
         
         self.exercise_results.append({
             'exercise': self.current_exercise,
             'user_answer': user_answer,
-            'is_correct': is_correct
+            'is_correct': is_correct,
+            'verdict': verdict
         })
         
         if is_correct:
             self.app.score += 1
-            formatted_answer = format_correct_answer(self.current_exercise['answer'])
+        
+        if verdict == VERDICT_CORRECT:
             self.result_label.config(
-                text=f"✅ Правильно! {formatted_answer}",
+                text=f"✅ Правильно! {matcher.display}",
                 fg=COLORS['success']
             )
+        elif verdict == VERDICT_ALMOST:
+            self.result_label.config(
+                text=f"⚠️ Почти правильно (опечатка). Правильное написание: {matcher.display}",
+                fg=COLORS['warning']
+            )
         else:
-            formatted_answer = format_correct_answer(self.current_exercise['answer'])
             self.result_label.config(
-                text=f"❌ Неправильно. Правильный ответ: {formatted_answer}",
+                text=f"❌ Неправильно. Правильный ответ: {matcher.display}",
                 fg=COLORS['danger']
             )
         
@@ -477,12 +650,13 @@ class ExercisesTab:
         
         for i, result in enumerate(self.exercise_results, 1):
             exercise = result['exercise']
-            symbol = "✓" if result['is_correct'] else "✗"
+            verdict = result.get('verdict', VERDICT_CORRECT if result['is_correct'] else VERDICT_WRONG)
+            symbol = {VERDICT_CORRECT: "✓", VERDICT_ALMOST: "≈ опечатка"}.get(verdict, "✗")
             
             text_widget.insert(tk.END, f"{i}. [{exercise['rule']}]\n")
             text_widget.insert(tk.END, f"   {exercise['sentence']}\n")
             text_widget.insert(tk.END, f"   Правильный ответ: {exercise['answer']}\n")
-            if not result['is_correct']:
+            if verdict != VERDICT_CORRECT:
                 text_widget.insert(tk.END, f"   Ваш ответ: {result['user_answer']}\n")
             text_widget.insert(tk.END, f"   {symbol}\n\n")
         
@@ -509,7 +683,7 @@ class ExercisesTab:
         self.exercise_results = []
         self.answer_checked = False
         
-        self.sentence_label.config(text="")
+        self.show_sentence("")
         self.exercise_progress_label.config(text="")
         self.result_label.config(text="")
         self.hint_label.config(text="")
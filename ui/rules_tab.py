@@ -5,6 +5,7 @@
 import tkinter as tk
 from tkinter import scrolledtext
 from config import COLORS, FONTS
+from ui.word_links import WordLinks
 
 class RulesTab:
     """Класс для вкладки правил"""
@@ -12,6 +13,12 @@ class RulesTab:
     def __init__(self, parent, app):
         self.parent = parent
         self.app = app
+        
+        # Результаты последнего поиска по правилам
+        self.search_query = ''
+        self.search_hits = []
+        self.search_position = 0
+        
         self.create_ui()
     
     def create_ui(self):
@@ -27,6 +34,9 @@ class RulesTab:
             bg=COLORS['light']
         ).pack(pady=5)
         
+        # Поиск по заголовкам и текстам правил
+        self.create_search_panel(list_frame)
+        
         # Listbox для выбора правила
         self.rules_listbox = tk.Listbox(
             list_frame,
@@ -38,8 +48,7 @@ class RulesTab:
         self.rules_listbox.bind('<<ListboxSelect>>', self.show_rule)
         
         # Заполнение списка правил
-        for rule in self.app.rules_data:
-            self.rules_listbox.insert(tk.END, rule['title'])
+        self.populate_rules()
         
         # Область отображения правила
         content_frame = tk.Frame(self.parent, bg='white', relief='raised', bd=2)
@@ -63,13 +72,112 @@ class RulesTab:
             bg='white'
         )
         self.rules_text_widget.pack(padx=10, pady=10, fill='both', expand=True)
+        self.rules_links = WordLinks(self.app, self.rules_text_widget)
+    
+    def create_search_panel(self, parent):
+        """Создание поля поиска по правилам"""
+        search_frame = tk.Frame(parent, bg=COLORS['light'])
+        search_frame.pack(fill='x', pady=5)
+        
+        self.search_entry = tk.Entry(search_frame, font=FONTS['small'], width=24)
+        self.search_entry.pack(side='left', padx=(0, 5))
+        self.search_entry.bind('<Return>', lambda e: self.search_rules())
+        
+        tk.Button(
+            search_frame,
+            text="🔍",
+            command=self.search_rules,
+            font=FONTS['tiny'],
+            bg=COLORS['primary'],
+            fg='white',
+            padx=5
+        ).pack(side='left')
+        
+        self.search_info_label = tk.Label(
+            parent,
+            text="",
+            font=FONTS['tiny'],
+            bg=COLORS['light'],
+            fg=COLORS['gray']
+        )
+        self.search_info_label.pack()
+    
+    def search_rules(self):
+        """
+        Поиск правила по словам или фразе в кавычках
+        
+        Повторный поиск того же запроса переходит к следующему найденному правилу.
+        """
+        query = self.search_entry.get().strip()
+        if not query:
+            self.search_info_label.config(text="")
+            return
+        
+        if query == self.search_query and self.search_hits:
+            self.search_position = (self.search_position + 1) % len(self.search_hits)
+        else:
+            self.search_query = query
+            self.search_hits = self.app.rules_search.search(query)
+            self.search_position = 0
+        
+        if not self.search_hits:
+            if self.app.rules_data and not self.app.rules_search:
+                self.search_info_label.config(text="Индекс правил еще строится...")
+                self.search_query = ''
+            else:
+                self.search_info_label.config(text="Ничего не найдено")
+            return
+        
+        self.show_search_hit()
+    
+    def show_rules(self, indices, query):
+        """Показать правила indices как результаты поиска query (переход из словаря)"""
+        self.search_entry.delete(0, tk.END)
+        self.search_entry.insert(0, query)
+        self.search_query = query
+        self.search_hits = list(indices)
+        self.search_position = 0
+        if self.search_hits:
+            self.show_search_hit()
+    
+    def show_search_hit(self):
+        """Открыть текущее найденное правило"""
+        index = self.search_hits[self.search_position]
+        if index >= len(self.app.rules_data):
+            return
+        self.search_info_label.config(
+            text=f"Найдено правил: {len(self.search_hits)} "
+                 f"({self.search_position + 1} из {len(self.search_hits)}, Enter - следующее)"
+        )
+        self.rules_listbox.selection_clear(0, tk.END)
+        self.rules_listbox.selection_set(index)
+        self.rules_listbox.see(index)
+        self.show_rule(None)
+    
+    def populate_rules(self):
+        """Заполнение списка правил (выбранное правило остается открытым)"""
+        selection = self.rules_listbox.curselection()
+        self.search_query = ''
+        
+        self.rules_listbox.delete(0, tk.END)
+        for title in self.app.rules_data.titles:
+            self.rules_listbox.insert(tk.END, title)
+        
+        if selection and selection[0] < len(self.app.rules_data):
+            self.rules_listbox.selection_set(selection[0])
+            self.show_rule(None)
     
     def show_rule(self, event):
         """Отображение выбранного правила"""
         selection = self.rules_listbox.curselection()
         if selection:
             index = selection[0]
-            rule = self.app.rules_data[index]
-            self.rules_title_label.config(text=rule['title'])
+            self.rules_title_label.config(text=self.app.rules_data.titles[index])
             self.rules_text_widget.delete('1.0', tk.END)
-            self.rules_text_widget.insert('1.0', rule['content'])
+            content = self.app.rules_data.content(index)
+            self.rules_text_widget.insert('1.0', content)
+            self.rules_links.highlight(content)
+    
+    def refresh_word_links(self):
+        """Обновить ссылки на слова после загрузки словаря"""
+        self.rules_links.highlight(self.rules_text_widget.get('1.0', 'end-1c'))
@@ -38,22 +38,23 @@ class StatsTab:
             bg=COLORS['light']
         ).pack(pady=5)
         
-        tk.Label(
+        self.words_total_label = tk.Label(
             words_frame,
-            text=f"Всего слов: {len(self.app.words_data)}",
+            text="",
             font=FONTS['normal'],
             bg=COLORS['light']
-        ).pack(pady=3)
+        )
+        self.words_total_label.pack(pady=3)
         
         # Подсчет слов с примерами
-        words_with_examples = sum(1 for word in self.app.words_data if word.get('example'))
-        tk.Label(
+        self.words_examples_label = tk.Label(
             words_frame,
-            text=f"Слов с примерами: {words_with_examples}",
+            text="",
             font=FONTS['small'],
             bg=COLORS['light'],
             fg=COLORS['gray']
-        ).pack(pady=2)
+        )
+        self.words_examples_label.pack(pady=2)
         
         # Статистика по упражнениям
         exercises_frame = tk.Frame(stats_container, bg=COLORS['light'], relief='raised', bd=1)
@@ -93,14 +94,14 @@ class StatsTab:
         self.accuracy_label.pack(pady=3)
         
         # Последняя сессия
-        if 'last_session' in self.app.progress_data:
-            tk.Label(
-                stats_container,
-                text=f"🕒 Последняя сессия: {self.app.progress_data['last_session']}",
-                font=FONTS['small'],
-                bg='white',
-                fg=COLORS['gray']
-            ).pack(pady=10)
+        self.last_session_label = tk.Label(
+            stats_container,
+            text="",
+            font=FONTS['small'],
+            bg='white',
+            fg=COLORS['gray']
+        )
+        self.last_session_label.pack(pady=10)
         
         # Кнопки
         button_frame = tk.Frame(stats_container, bg='white')
@@ -129,10 +130,16 @@ class StatsTab:
         ).pack(side='left', padx=5)
         
         # Обновляем статистику
+        self.update_words()
         self.update()
     
     def update(self):
         """Обновление статистики"""
+        if 'last_session' in self.app.progress_data:
+            self.last_session_label.config(
+                text=f"🕒 Последняя сессия: {self.app.progress_data['last_session']}"
+            )
+        
         self.stats_score_label.config(text=f"✅ Правильных ответов: {self.app.score}")
         self.stats_total_label.config(text=f"📝 Всего попыток: {self.app.total_attempts}")
         
@@ -140,6 +147,12 @@ class StatsTab:
             accuracy = (self.app.score / self.app.total_attempts) * 100
             self.accuracy_label.config(text=f"📈 Точность: {accuracy:.1f}%")
     
+    def update_words(self):
+        """Обновление статистики словаря (после загрузки или изменения слов)"""
+        words_with_examples = sum(1 for word in self.app.words_data if word.get('example'))
+        self.words_total_label.config(text=f"Всего слов: {len(self.app.words_data)}")
+        self.words_examples_label.config(text=f"Слов с примерами: {words_with_examples}")
+    
     def reset_stats(self):
         """Сброс статистики"""
         if messagebox.askyesno("Подтверждение", "Вы уверены, что хотите сбросить статистику?"):
@@ -0,0 +1,44 @@
+"""
+Ссылки на карточки слов в текстовых виджетах
+"""
+
+from config import COLORS
+
+LINK_TAG = 'dictionary_word'
+WORD_TAG_PREFIX = 'word:'
+
+class WordLinks:
+    """Подсветка слов словаря в Text-виджете и переход к карточке слова по щелчку"""
+    
+    def __init__(self, app, widget):
+        self.app = app
+        self.widget = widget
+        
+        widget.tag_config(LINK_TAG, foreground=COLORS['primary'], underline=True)
+        widget.tag_bind(LINK_TAG, '<Button-1>', self.on_click)
+        widget.tag_bind(LINK_TAG, '<Enter>', lambda e: widget.config(cursor='hand2'))
+        widget.tag_bind(LINK_TAG, '<Leave>', lambda e: widget.config(cursor=''))
+    
+    def highlight(self, text, start='1.0'):
+        """
+        Подсветить слова словаря в тексте text, вставленном с позиции start
+        
+        Вхождения находятся одним проходом автомата app.word_highlighter,
+        каждое получает общий тег ссылки и тег с индексом слова.
+        """
+        for tag in self.widget.tag_names():
+            if tag.startswith(WORD_TAG_PREFIX):
+                self.widget.tag_delete(tag)
+        self.widget.tag_remove(LINK_TAG, '1.0', 'end')
+        
+        for begin, end, word_index in self.app.word_highlighter.find(text):
+            first, last = f"{start}+{begin}c", f"{start}+{end}c"
+            self.widget.tag_add(LINK_TAG, first, last)
+            self.widget.tag_add(f"{WORD_TAG_PREFIX}{word_index}", first, last)
+    
+    def on_click(self, event):
+        """Открыть карточку слова, по которому щелкнули"""
+        for tag in self.widget.tag_names(f"@{event.x},{event.y}"):
+            if tag.startswith(WORD_TAG_PREFIX):
+                self.app.words_tab.open_word(int(tag[len(WORD_TAG_PREFIX):]))
+                return 'break'
@@ -5,9 +5,11 @@
 import tkinter as tk
 from tkinter import messagebox, scrolledtext
 import random
-from config import COLORS, FONTS, TEST_MIN_WORDS, TEST_MAX_WORDS, TEST_DEFAULT_WORDS
-from data.loader import DataLoader
-from utils.helpers import normalize_answer
+from config import (COLORS, FONTS, TEST_MIN_WORDS, TEST_MAX_WORDS, TEST_DEFAULT_WORDS,
+                    SEARCH_DEBOUNCE_MS, SEARCH_VISIBLE_ROWS, FUZZY_SUGGESTIONS,
+                    EXERCISE_MAX_COUNT, ALMOST_CORRECT_COUNTS, ACCEPT_SYNONYMS)
+from utils.helpers import (normalize_answer, compile_answer,
+                           VERDICT_CORRECT, VERDICT_ALMOST, VERDICT_WRONG)
 
 class WordsTab:
     """Класс для вкладки словаря"""
@@ -111,21 +113,23 @@ class WordsTab:
     
     def create_search_panel(self):
         """Создание панели поиска"""
-        search_frame = tk.Frame(self.container, bg=COLORS['light'])
-        search_frame.pack(pady=10)
+        self.search_frame = tk.Frame(self.container, bg=COLORS['light'])
+        self.search_frame.pack(pady=10)
         
         tk.Label(
-            search_frame,
+            self.search_frame,
             text="🔍 Поиск:",
             font=FONTS['small'],
             bg=COLORS['light']
         ).pack(side='left', padx=5)
         
-        self.search_entry = tk.Entry(search_frame, font=FONTS['small'], width=20)
+        self.search_entry = tk.Entry(self.search_frame, font=FONTS['small'], width=20)
         self.search_entry.pack(side='left', padx=5)
+        self.search_entry.bind('<KeyRelease>', self.schedule_search)
+        self.search_entry.bind('<Return>', lambda e: self.search_word())
         
         tk.Button(
-            search_frame,
+            self.search_frame,
             text="Найти",
             command=self.search_word,
             font=FONTS['tiny'],
@@ -134,6 +138,51 @@ class WordsTab:
             padx=10,
             pady=5
         ).pack(side='left', padx=5)
+        
+        self.create_search_results()
+    
+    def create_search_results(self):
+        """
+        Создание списка результатов поиска по мере ввода
+        
+        Список виртуальный: в Listbox находятся только видимые строки,
+        а полоса прокрутки управляется вручную по полному списку результатов.
+        """
+        self.search_results = []
+        self.search_results_offset = 0
+        self.search_job = None
+        self.search_generation = 0
+        
+        self.results_frame = tk.Frame(self.container, bg=COLORS['light'])
+        
+        self.results_title_label = tk.Label(
+            self.results_frame,
+            text="",
+            font=FONTS['tiny'],
+            bg=COLORS['light'],
+            fg=COLORS['gray']
+        )
+        self.results_title_label.pack(anchor='w')
+        
+        self.results_listbox = tk.Listbox(
+            self.results_frame,
+            font=FONTS['small'],
+            width=60,
+            height=SEARCH_VISIBLE_ROWS,
+            activestyle='none'
+        )
+        self.results_listbox.pack(side='left')
+        self.results_listbox.bind('<<ListboxSelect>>', self.on_search_result_select)
+        self.results_listbox.bind('<MouseWheel>', self.on_search_results_wheel)
+        self.results_listbox.bind('<Button-4>', lambda e: self.scroll_search_results('scroll', -1, 'units'))
+        self.results_listbox.bind('<Button-5>', lambda e: self.scroll_search_results('scroll', 1, 'units'))
+        
+        self.results_scrollbar = tk.Scrollbar(
+            self.results_frame,
+            orient='vertical',
+            command=self.scroll_search_results
+        )
+        self.results_scrollbar.pack(side='left', fill='y')
     
     def create_word_card(self):
         """Создание карточки слова"""
@@ -191,6 +240,45 @@ class WordsTab:
             wraplength=600
         )
         self.example_translation_label.pack(pady=5)
+        
+        # Упражнения и правила, в которых встречается слово
+        reference_frame = tk.Frame(card_frame, bg='white')
+        reference_frame.pack(pady=10)
+        
+        self.cross_reference_label = tk.Label(
+            reference_frame,
+            text="",
+            font=FONTS['small'],
+            bg='white',
+            fg=COLORS['gray']
+        )
+        self.cross_reference_label.pack(side='left', padx=5)
+        
+        self.word_exercises_button = tk.Button(
+            reference_frame,
+            text="✏️ Тренировать",
+            command=self.drill_word_exercises,
+            font=FONTS['tiny'],
+            bg=COLORS['purple'],
+            fg='white',
+            padx=8,
+            pady=3,
+            state='disabled'
+        )
+        self.word_exercises_button.pack(side='left', padx=3)
+        
+        self.word_rules_button = tk.Button(
+            reference_frame,
+            text="📋 Правила",
+            command=self.open_word_rules,
+            font=FONTS['tiny'],
+            bg=COLORS['primary'],
+            fg='white',
+            padx=8,
+            pady=3,
+            state='disabled'
+        )
+        self.word_rules_button.pack(side='left', padx=3)
     
     def create_control_buttons(self):
         """Создание кнопок управления"""
@@ -271,18 +359,75 @@ class WordsTab:
     # ==================== МЕТОДЫ ДЛЯ РЕЖИМА ИЗУЧЕНИЯ ====================
     
     def show_word(self):
-        """Отображение текущего слова"""
+        """Отображение текущего слова (в том числе после перезагрузки словаря)"""
         if self.app.words_data:
+            # После перезагрузки словарь мог стать короче
+            self.current_word_index = min(self.current_word_index, len(self.app.words_data) - 1)
             word_data = self.app.words_data[self.current_word_index]
             self.word_label.config(text=word_data['word'])
             self.transcription_label.config(text=word_data['transcription'])
             self.translation_label.config(text="")
             self.example_label.config(text="")
             self.example_translation_label.config(text="")
-            
-            self.word_progress_label.config(
-                text=f"Слово {self.current_word_index + 1} из {len(self.app.words_data)}"
-            )
+        
+        self.refresh_word_counter()
+        self.refresh_cross_reference()
+    
+    def refresh_cross_reference(self):
+        """Показать, в скольких упражнениях и правилах встречается текущее слово"""
+        if not self.app.words_data or not self.app.cross_reference.topic_counts:
+            self.cross_reference_label.config(text="")
+            self.word_exercises_button.config(state='disabled')
+            self.word_rules_button.config(state='disabled')
+            return
+        
+        word = self.app.words_data[self.current_word_index]['word']
+        exercise_count, rule_count = self.app.cross_reference.counts(word)
+        self.cross_reference_label.config(
+            text=f"🔗 Встречается в упражнениях: {exercise_count}, в правилах: {rule_count}"
+        )
+        self.word_exercises_button.config(state='normal' if exercise_count else 'disabled')
+        self.word_rules_button.config(state='normal' if rule_count else 'disabled')
+    
+    def drill_word_exercises(self):
+        """Начать упражнения, в которых встречается текущее слово"""
+        if not self.app.words_data:
+            return
+        
+        word = self.app.words_data[self.current_word_index]['word']
+        exercises = []
+        for topic, number in self.app.cross_reference.exercise_refs(word):
+            topic_exercises = self.app.exercises_data.get(topic, [])
+            if number < len(topic_exercises):
+                exercises.append(topic_exercises[number])
+        if not exercises:
+            return
+        
+        random.shuffle(exercises)
+        self.app.exercises_tab.start_exercise_set(
+            exercises[:EXERCISE_MAX_COUNT], f"🔗 Упражнения со словом «{word}»"
+        )
+        self.app.notebook.select(self.app.exercises_frame)
+    
+    def open_word_rules(self):
+        """Открыть правила, в которых встречается текущее слово"""
+        if not self.app.words_data:
+            return
+        
+        word = self.app.words_data[self.current_word_index]['word']
+        self.app.rules_tab.show_rules(self.app.cross_reference.rule_refs(word), word)
+        self.app.notebook.select(self.app.rules_frame)
+    
+    def refresh_word_counter(self):
+        """Обновление счетчика слов (в том числе после перезагрузки словаря)"""
+        if not self.app.words_data:
+            self.word_progress_label.config(text="Загрузка словаря...")
+            return
+        
+        self.current_word_index = min(self.current_word_index, len(self.app.words_data) - 1)
+        self.word_progress_label.config(
+            text=f"Слово {self.current_word_index + 1} из {len(self.app.words_data)}"
+        )
     
     def show_translation(self):
         """Показать перевод текущего слова"""
@@ -341,20 +486,126 @@ class WordsTab:
             self.show_word()
     
     def search_word(self):
-        """Поиск слова в словаре"""
-        from utils.helpers import search_in_list
-        
+        """Поиск слова в словаре и переход к лучшему совпадению"""
+        if self.search_job is not None:
+            self.parent.after_cancel(self.search_job)
+            self.search_job = None
+        self.search_generation += 1
+        
+        # Точные совпадения, затем по началу слова, затем по подстроке,
+        # а если ничего нет - слова с опечатками
+        self.update_search_results()
+        if self.search_results:
+            self.current_word_index = self.search_results[0]
+            self.show_word()
+    
+    def schedule_search(self, event=None):
+        """
+        Отложенный поиск по мере ввода
+        
+        Каждое нажатие отменяет ранее запланированный поиск, поэтому при
+        быстром наборе запрос выполняется один раз - после паузы.
+        """
+        if self.search_job is not None:
+            self.parent.after_cancel(self.search_job)
+        self.search_generation += 1
+        self.search_job = self.parent.after(
+            SEARCH_DEBOUNCE_MS, self.run_search, self.search_generation
+        )
+    
+    def run_search(self, generation):
+        """Выполнение запланированного поиска и обновление списка результатов"""
+        self.search_job = None
+        # Поле изменилось после планирования - ждем следующего запуска
+        if generation != self.search_generation:
+            return
+        self.update_search_results()
+    
+    def update_search_results(self):
+        """Поиск по текущему тексту поля и показ результатов"""
         search_term = self.search_entry.get().strip()
         if not search_term:
+            self.search_results = []
+            self.results_frame.pack_forget()
             return
         
-        index = search_in_list(search_term, self.app.words_data, ['word', 'translation'])
-        if index >= 0:
-            self.current_word_index = index
-            self.show_word()
-            messagebox.showinfo("Найдено", f"Слово найдено: {self.app.words_data[index]['word']}")
+        # Индекс может опережать словарь, пока идет перезагрузка: строки
+        # списка должны соответствовать позициям search_results
+        word_count = len(self.app.words_data)
+        self.search_results = [
+            index for index in self.app.word_index.search(search_term) if index < word_count
+        ]
+        if self.search_results:
+            title = f"Найдено совпадений: {len(self.search_results)}"
         else:
-            messagebox.showinfo("Не найдено", "Слово не найдено в словаре")
+            suggestions = self.app.word_index.fuzzy_search(search_term, limit=FUZZY_SUGGESTIONS)
+            self.search_results = [index for index in suggestions if index < word_count]
+            title = "Не найдено. Возможно, вы имели в виду:" if self.search_results else "Не найдено"
+        
+        self.results_title_label.config(text=title)
+        self.search_results_offset = 0
+        self.render_search_results()
+        self.results_frame.pack(after=self.search_frame, pady=(0, 10))
+    
+    def render_search_results(self):
+        """Заполнение видимых строк списка результатов"""
+        total = len(self.search_results)
+        first = self.search_results_offset
+        visible = self.search_results[first:first + SEARCH_VISIBLE_ROWS]
+        
+        self.results_listbox.delete(0, tk.END)
+        for index in visible:
+            if index >= len(self.app.words_data):
+                # Строка остается, чтобы номера строк совпадали с позициями
+                self.results_listbox.insert(tk.END, "—")
+                continue
+            word_data = self.app.words_data[index]
+            self.results_listbox.insert(tk.END, f"{word_data['word']} — {word_data['translation']}")
+        
+        if total:
+            self.results_scrollbar.set(first / total, (first + len(visible)) / total)
+        else:
+            self.results_scrollbar.set(0, 1)
+    
+    def scroll_search_results(self, action, amount, unit=None):
+        """Прокрутка виртуального списка (команда полосы прокрутки)"""
+        max_offset = max(0, len(self.search_results) - SEARCH_VISIBLE_ROWS)
+        if action == 'moveto':
+            offset = round(float(amount) * len(self.search_results))
+        elif unit == 'pages':
+            offset = self.search_results_offset + int(amount) * SEARCH_VISIBLE_ROWS
+        else:
+            offset = self.search_results_offset + int(amount)
+        
+        offset = min(max(offset, 0), max_offset)
+        if offset != self.search_results_offset:
+            self.search_results_offset = offset
+            self.render_search_results()
+    
+    def on_search_results_wheel(self, event):
+        """Прокрутка списка результатов колесом мыши"""
+        self.scroll_search_results('scroll', -1 if event.delta > 0 else 1, 'units')
+        return 'break'
+    
+    def on_search_result_select(self, event=None):
+        """Переход к выбранному в списке слову"""
+        selection = self.results_listbox.curselection()
+        if not selection:
+            return
+        
+        position = self.search_results_offset + selection[0]
+        if position < len(self.search_results):
+            self.open_word(self.search_results[position])
+    
+    def open_word(self, index):
+        """Открыть карточку слова (из результатов поиска или по ссылке в тексте)"""
+        if index >= len(self.app.words_data):
+            return
+        if self.test_mode:
+            self.switch_to_study_mode()
+        self.current_word_index = index
+        self.show_word()
+        self.app.notebook.select(self.app.words_frame)
     
     def show_add_word_dialog(self):
         """Диалог добавления нового слова"""
@@ -399,9 +650,24 @@ class WordsTab:
                 messagebox.showwarning("Внимание", "Заполните обязательные поля!")
                 return
             
-            self.app.words_data.append(word_data)
+            # Проверка дубликата по поисковому индексу словаря в памяти
+            if self.app.word_index.find_word(word_data['word'], self.app.words_data) is not None:
+                if not messagebox.askyesno(
+                    "Дубликат",
+                    f"Слово «{word_data['word']}» уже есть в словаре. Добавить еще раз?",
+                    parent=dialog
+                ):
+                    return
+            
+            index = self.app.words_data.append(word_data)
+            self.app.word_index.add(index, self.app.words_data[index])
+            if self.app.word_highlighter.add(index, self.app.words_data[index]):
+                self.app.rebuild_word_highlighter()
+            self.app.scheduler.add(self.app.words_data[index])
             
-            if DataLoader.save_word(word_data):
+            if self.app.data_loader.save_word(word_data):
+                self.app.mark_data_saved('words')
+                self.app.stats_tab.update_words()
                 messagebox.showinfo("Успешно", "Слово добавлено!")
                 dialog.destroy()
                 self.show_word()
@@ -538,8 +804,13 @@ class WordsTab:
         self.test_answers = []
         self.test_answer_checked = False
         
-        # Выбираем случайные слова для теста
-        self.test_words = random.sample(self.app.words_data, min(words_count, len(self.app.words_data)))
+        # Слова, которые пора повторить: просроченные, затем новые
+        self.test_words = self.app.scheduler.due_words(min(words_count, len(self.app.words_data)))
+        
+        # Правильные ответы разбираются заранее, при проверке они уже готовы
+        for word in self.test_words:
+            compile_answer(word['word'])
+            compile_answer(word['translation'])
         
         # Скрываем режим изучения и показываем режим теста
         self.study_container.pack_forget()
@@ -821,29 +1092,56 @@ class WordsTab:
         
         self.test_answer_checked = True
         
-        # Используем улучшенную проверку с поддержкой вариантов
-        from utils.helpers import check_answer_match, format_correct_answer
-        
-        is_correct = check_answer_match(user_answer, self.current_correct_answer)
+        # Проверка по заранее разобранным вариантам ответа
+        matcher = compile_answer(self.current_correct_answer)
+        verdict = matcher.grade(user_answer)
+        
+        # При переводе на английский можно засчитывать и синонимы: слова
+        # словаря с тем же переводом (с точностью до окончаний)
+        if (ACCEPT_SYNONYMS and verdict != VERDICT_CORRECT
+                and self.current_question_type == "rus_to_eng"):
+            translation = self.test_words[self.test_current_index]['translation']
+            for index in self.app.word_index.reverse_lookup(translation):
+                if index >= len(self.app.words_data):
+                    continue
+                synonym_verdict = compile_answer(self.app.words_data[index]['word']).grade(user_answer)
+                if synonym_verdict == VERDICT_CORRECT:
+                    verdict = VERDICT_CORRECT
+                    break
+                if synonym_verdict == VERDICT_ALMOST:
+                    verdict = VERDICT_ALMOST
+        
+        is_correct = verdict == VERDICT_CORRECT or (verdict == VERDICT_ALMOST and ALMOST_CORRECT_COUNTS)
         
         self.test_answers.append({
             'word': self.test_words[self.test_current_index],
             'user_answer': user_answer,
             'correct_answer': self.current_correct_answer,
             'is_correct': is_correct,
+            'verdict': verdict,
             'question_type': self.current_question_type
         })
         
         if is_correct:
             self.test_score += 1
+        
+        self.app.scheduler.review_verdict(self.test_words[self.test_current_index], verdict)
+        self.app.item_stats.record_word(self.test_words[self.test_current_index], is_correct)
+        
+        if verdict == VERDICT_CORRECT:
             self.test_result_label.config(text="✅ Правильно!", fg=COLORS['success'])
             self.test_answer_entry.config(bg='#d4edda')
+        elif verdict == VERDICT_ALMOST:
+            self.test_result_label.config(text="⚠️ Почти правильно (опечатка)", fg=COLORS['warning'])
+            self.test_correct_answer_label.config(
+                text=f"Правильное написание: {matcher.display}"
+            )
+            self.test_answer_entry.config(bg='#fff3cd')
         else:
             self.test_result_label.config(text="❌ Неправильно", fg=COLORS['danger'])
-            # Используем форматирование для отображения всех вариантов
-            formatted_answer = format_correct_answer(self.current_correct_answer)
+            # Показываем все варианты правильного ответа
             self.test_correct_answer_label.config(
-                text=f"Правильный ответ: {formatted_answer}"
+                text=f"Правильный ответ: {matcher.display}"
             )
             self.test_answer_entry.config(bg='#f8d7da')
         
@@ -870,8 +1168,11 @@ class WordsTab:
             'user_answer': '',
             'correct_answer': self.current_correct_answer,
             'is_correct': False,
+            'verdict': VERDICT_WRONG,
             'question_type': self.current_question_type
         })
+        self.app.scheduler.review_verdict(self.test_words[self.test_current_index], None)
+        self.app.item_stats.record_word(self.test_words[self.test_current_index], False)
         
         self.test_result_label.config(text="⏭️ Вопрос пропущен", fg=COLORS['warning'])
         self.test_correct_answer_label.config(
@@ -974,7 +1275,8 @@ class WordsTab:
         # Заполняем детальными результатами
         for i, result in enumerate(self.test_answers, 1):
             word_data = result['word']
-            symbol = "✅" if result['is_correct'] else "❌"
+            verdict = result.get('verdict', VERDICT_CORRECT if result['is_correct'] else VERDICT_WRONG)
+            symbol = {VERDICT_CORRECT: "✅", VERDICT_ALMOST: "⚠️"}.get(verdict, "❌")
             
             if result['question_type'] == 'eng_to_rus':
                 question = f"{word_data['word']} {word_data['transcription']}"
@@ -983,8 +1285,11 @@ class WordsTab:
             
             text_widget.insert(tk.END, f"{i}. {question}\n", "question")
             
-            if result['is_correct']:
+            if verdict == VERDICT_CORRECT:
                 text_widget.insert(tk.END, f"   {symbol} Ваш ответ: {result['user_answer']}\n", "correct")
+            elif verdict == VERDICT_ALMOST:
+                text_widget.insert(tk.END, f"   {symbol} Ваш ответ: {result['user_answer']} (опечатка)\n", "almost")
+                text_widget.insert(tk.END, f"   ✓ Правильное написание: {result['correct_answer']}\n", "correct_answer")
             else:
                 if result['user_answer']:
                     text_widget.insert(tk.END, f"   {symbol} Ваш ответ: {result['user_answer']}\n", "wrong")
@@ -1004,6 +1309,7 @@ class WordsTab:
         text_widget.tag_config("question", foreground=COLORS['dark'], font=(FONTS['small'][0], FONTS['small'][1], 'bold'))
         text_widget.tag_config("correct", foreground=COLORS['success'])
         text_widget.tag_config("wrong", foreground=COLORS['danger'])
+        text_widget.tag_config("almost", foreground=COLORS['warning'])
         text_widget.tag_config("skipped", foreground=COLORS['warning'])
         text_widget.tag_config("correct_answer", foreground=COLORS['success'], font=(FONTS['small'][0], FONTS['small'][1], 'italic'))
         text_widget.tag_config("example", foreground=COLORS['primary'], font=(FONTS['tiny'][0], FONTS['tiny'][1], 'italic'))
@@ -3,5 +3,7 @@
 """
 
 from .helpers import normalize_answer, search_in_list
+from .search_index import WordSearchIndex
+from .text_index import TextIndex
 
-__all__ = ['normalize_answer', 'search_in_list']
+__all__ = ['normalize_answer', 'search_in_list', 'WordSearchIndex', 'TextIndex']
@@ -0,0 +1,197 @@
+"""
+Поиск слов словаря в тексте автоматом Ахо-Корасик
+"""
+
+from utils.lemmas import word_forms
+
+# Сколько добавленных слов держать в малом автомате до переноса в основной
+PENDING_REBUILD_WORDS = 64
+
+class AhoCorasick:
+    """
+    Автомат для одновременного поиска множества строк за один проход
+    
+    Состояния хранятся в параллельных списках: переходы (dict), ссылка
+    неудачи и ссылка на ближайшее по суффиксу конечное состояние, поэтому
+    все совпадения в тексте находятся за O(длина текста + число совпадений).
+    """
+    
+    def __init__(self, patterns=()):
+        """
+        Args:
+            patterns: пары (строка, значение)
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._output_link = [0]
+        self._values = [None]
+        self._depth = [0]
+        for pattern, value in patterns:
+            self._insert(pattern, value)
+        self._build_links()
+    
+    def __len__(self):
+        return sum(1 for values in self._values if values)
+    
+    def _insert(self, pattern, value):
+        """Добавить строку в дерево переходов"""
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output_link.append(0)
+                self._values.append(None)
+                self._depth.append(self._depth[state] + 1)
+            state = next_state
+        if self._values[state] is None:
+            self._values[state] = []
+        self._values[state].append(value)
+    
+    def _build_links(self):
+        """Вычисление ссылок неудачи обходом в ширину"""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+            self._output_link[state] = 0
+        
+        position = 0
+        while position < len(queue):
+            state = queue[position]
+            position += 1
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                fail = self._goto[fallback].get(char, 0)
+                self._fail[child] = fail
+                self._output_link[child] = fail if self._values[fail] else self._output_link[fail]
+    
+    def iter_matches(self, text):
+        """
+        Все вхождения строк в text
+        
+        Yields:
+            тройки (начало, конец, значение)
+        """
+        goto, fail, output_link, values, depth = (
+            self._goto, self._fail, self._output_link, self._values, self._depth
+        )
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            
+            match = state if values[state] else output_link[state]
+            while match:
+                start = position + 1 - depth[match]
+                for value in values[match]:
+                    yield start, position + 1, value
+                match = output_link[match]
+
+class DictionaryHighlighter:
+    """
+    Поиск слов словаря (и их форм: books, went) в тексте
+    
+    Основной автомат строится один раз по всему словарю, а слова,
+    добавленные позже, попадают в малый автомат, который строится заново
+    только при следующем поиске (это быстро). Когда добавлено
+    PENDING_REBUILD_WORDS слов, основной автомат перестраивается в фоновом
+    потоке (start_rebuild), а до подстановки (finish_rebuild) поиск идет
+    по прежним автоматам.
+    """
+    
+    def __init__(self, words=()):
+        self._patterns = []
+        for index, word in enumerate(words):
+            self._patterns.extend(DictionaryHighlighter.patterns_for(index, word))
+        self._main = AhoCorasick(self._patterns)
+        self._main_size = len(self._patterns)
+        self._pending = AhoCorasick()
+        self._pending_words = 0
+        self._rebuilding = False
+    
+    @staticmethod
+    def patterns_for(word_index, word):
+        """
+        Пары (форма слова в нижнем регистре, (приоритет, индекс слова))
+        
+        Сама словарная форма имеет приоритет перед образованными: «bed»
+        ведет на слово bed, а не на be, даже если оба есть в словаре.
+        """
+        text = ' '.join(word['word'].lower().split())
+        if not text:
+            return []
+        return [(form, (form != text, word_index)) for form in word_forms(text)]
+    
+    def add(self, word_index, word):
+        """
+        Добавить слово с индексом word_index в словаре
+        
+        Returns:
+            пора ли перестроить основной автомат (start_rebuild)
+        """
+        self._patterns.extend(DictionaryHighlighter.patterns_for(word_index, word))
+        self._pending = None
+        self._pending_words += 1
+        return self._pending_words >= PENDING_REBUILD_WORDS and not self._rebuilding
+    
+    def start_rebuild(self):
+        """
+        Начало переноса добавленных слов в основной автомат
+        
+        Returns:
+            функция без аргументов для фонового потока; ее результат
+            передается в finish_rebuild (в потоке Tk)
+        """
+        self._rebuilding = True
+        patterns, count, words = self._patterns, len(self._patterns), self._pending_words
+        return lambda: (AhoCorasick(patterns[:count]), count, words)
+    
+    def finish_rebuild(self, rebuilt):
+        """Подстановка основного автомата, построенного в фоновом потоке"""
+        self._main, self._main_size, words = rebuilt
+        self._pending = None
+        self._pending_words -= words
+        self._rebuilding = False
+    
+    @staticmethod
+    def _lowercase(text):
+        """Нижний регистр с сохранением длины строки (позиции совпадают с исходным текстом)"""
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            return lowered
+        return ''.join(char.lower()[:1] or char for char in text)
+    
+    def find(self, text):
+        """
+        Вхождения слов словаря в text целыми словами, без пересечений
+        (из пересекающихся выбирается самое левое, затем самое длинное)
+        
+        Returns:
+            список троек (начало, конец, индекс слова) по возрастанию начала
+        """
+        lowered = DictionaryHighlighter._lowercase(text)
+        if self._pending is None:
+            self._pending = AhoCorasick(self._patterns[self._main_size:])
+        matches = []
+        for automaton in (self._main, self._pending):
+            for start, end, (priority, word_index) in automaton.iter_matches(lowered):
+                if start > 0 and lowered[start - 1].isalpha():
+                    continue
+                if end < len(lowered) and lowered[end].isalpha():
+                    continue
+                matches.append((start, -end, priority, word_index))
+        
+        spans = []
+        last_end = 0
+        for start, negative_end, _, word_index in sorted(matches):
+            if start >= last_end:
+                spans.append((start, -negative_end, word_index))
+                last_end = -negative_end
+        return spans
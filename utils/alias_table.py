@@ -0,0 +1,56 @@
+"""
+Выбор случайного элемента с заданными весами методом Уолкера
+"""
+
+import random
+from array import array
+
+class AliasTable:
+    """
+    Таблица псевдонимов (метод Уолкера, вариант Воуза)
+    
+    Строится за O(n) по весам, после чего каждый случайный выбор стоит
+    O(1): случайная ячейка и одно сравнение с ее вероятностью.
+    """
+    
+    __slots__ = ('probabilities', 'aliases', 'total')
+    
+    def __init__(self, weights):
+        """
+        Args:
+            weights: неотрицательные веса элементов
+        """
+        weights = list(weights)
+        count = len(weights)
+        self.total = sum(weights)
+        self.probabilities = array('d', bytes(8 * count))
+        self.aliases = array('I', bytes(4 * count))
+        if not count or self.total <= 0:
+            return
+        
+        scaled = [weight * count / self.total for weight in weights]
+        small = [index for index, value in enumerate(scaled) if value < 1]
+        large = [index for index, value in enumerate(scaled) if value >= 1]
+        
+        # Каждая ячейка: своя доля и «псевдоним», добирающий ее до 1
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probabilities[less] = scaled[less]
+            self.aliases[less] = more
+            scaled[more] += scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+        
+        # Остатки равны 1 с точностью до погрешности округления
+        for index in large + small:
+            self.probabilities[index] = 1.0
+            self.aliases[index] = index
+    
+    def __len__(self):
+        return len(self.probabilities)
+    
+    def draw(self, rng=random):
+        """Номер случайного элемента с вероятностью, пропорциональной весу"""
+        column = int(rng.random() * len(self.probabilities))
+        if rng.random() < self.probabilities[column]:
+            return column
+        return self.aliases[column]
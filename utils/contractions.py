@@ -0,0 +1,68 @@
+"""
+Сокращенные и полные формы вспомогательных глаголов
+"""
+
+# Сокращения, которые раскрываются целиком
+IRREGULAR_CONTRACTIONS = {
+    "won't": 'will not',
+    "can't": 'can not',
+    'cannot': 'can not',
+    "shan't": 'shall not',
+    "let's": 'let us',
+}
+
+# Окончания сокращений и их полная форма (doesn't → does not, I've → I have).
+# 's (is/has/притяжательный падеж) и 'd (would/had) неоднозначны и не раскрываются
+CONTRACTION_SUFFIXES = (
+    ("n't", ' not'),
+    ("'m", ' am'),
+    ("'re", ' are'),
+    ("'ve", ' have'),
+    ("'ll", ' will'),
+)
+
+# Вспомогательные и модальные глаголы: замена одного на другой - грамматическая
+# ошибка, а не опечатка
+AUXILIARIES = frozenset({
+    'am', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'do', 'does', 'did', 'have', 'has', 'had',
+    'will', 'would', 'shall', 'should', 'can', 'could', 'may', 'might', 'must', 'not',
+})
+
+def needs_expansion(text):
+    """Может ли в нормализованном тексте быть сокращение"""
+    return "'" in text or 'cannot' in text
+
+def expand_token(token):
+    """Полная форма одного слова: doesn't → does not"""
+    expanded = IRREGULAR_CONTRACTIONS.get(token)
+    if expanded is not None:
+        return expanded
+    for suffix, replacement in CONTRACTION_SUFFIXES:
+        if token.endswith(suffix) and len(token) > len(suffix):
+            return token[:-len(suffix)] + replacement
+    return token
+
+def canonical_form(text):
+    """
+    Каноническая форма нормализованного ответа: все сокращения раскрыты
+    
+    «doesn't work» и «does not work», «won't» и «will not», «can't»,
+    «cannot» и «can not» дают одну и ту же строку.
+    """
+    if not needs_expansion(text):
+        return text
+    return ' '.join(map(expand_token, text.split()))
+
+def swaps_auxiliary(first, second):
+    """
+    Заменен ли в одной канонической форме вспомогательный глагол другим
+    («do not work» и «does not work»)
+    """
+    first_tokens, second_tokens = first.split(), second.split()
+    if len(first_tokens) != len(second_tokens):
+        return False
+    return any(
+        token1 != token2 and token1 in AUXILIARIES and token2 in AUXILIARIES
+        for token1, token2 in zip(first_tokens, second_tokens)
+    )
@@ -2,23 +2,101 @@
 Вспомогательные функции
 """
 
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from config import ANSWER_CACHE_SIZE, ALMOST_CORRECT_TYPOS
+from utils.contractions import canonical_form, swaps_auxiliary
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен: без него пакетная проверка идет на списках
+    np = None
+
+# Артикли, которые отбрасываются в начале ответа
+ARTICLES = ('a ', 'an ', 'the ')
+
+# Замены символов при нормализации ответа (после NFKC и нижнего регистра)
+ANSWER_REPLACEMENTS = {
+    'ё': 'е', '\u03c2': '\u03c3',
+    '\u2018': "'", '\u2019': "'", '\u02bc': "'", '\u00b4': "'", '\u2032': "'",
+    '\u2010': '-', '\u2012': '-', '\u2013': '-', '\u2014': '-',
+    '«': '', '»': '', '\u201c': '', '\u201d': '', '\u201e': '',
+    '¡': '', '¿': '',
+}
+
+# Блоки Unicode, символы которых приводятся к NFKC (лигатуры, индексы,
+# типографские пробелы и знаки, полноширинные буквы)
+NFKC_RANGES = (
+    (0x80, 0x250), (0x2000, 0x2190), (0x2460, 0x2500),
+    (0x3000, 0x3001), (0xFB00, 0xFB07), (0xFF01, 0xFF5F),
+)
+
+def _answer_translation():
+    """Таблица для str.translate: нижний регистр, NFKC и замены по коду символа"""
+    table = [chr(code).lower() for code in range(max(end for _, end in NFKC_RANGES))]
+    for start, end in NFKC_RANGES:
+        table[start:end] = [unicodedata.normalize('NFKC', folded).lower() for folded in table[start:end]]
+    replacements = str.maketrans(ANSWER_REPLACEMENTS)
+    # Кортеж по коду символа выбирается быстрее словаря
+    return tuple(' ' if folded.isspace() else folded.translate(replacements) for folded in table)
+
+ANSWER_TRANSLATION = _answer_translation()
+
+# Символы, для которых таблица дает не то же, что str.lower() (длинные строки
+# без них таблицу не проходят). Σ здесь потому, что в конце слова
+# str.lower() превращает ее в ς
+TRANSLATED_PATTERN = re.compile('[{}]'.format(re.escape(''.join(
+    chr(code) for code, folded in enumerate(ANSWER_TRANSLATION) if folded != chr(code).lower()
+) + '\u03a3')))
+
+# Строки не длиннее этой сразу проходят таблицу: поиск по ним дороже замены
+SHORT_ANSWER_LENGTH = 8
+
+# Знаки по краям ответа, которые не влияют на проверку
+EDGE_CHARACTERS = ' .!?"'
+
+# Разделители вариантов ответа (используется первый найденный)
+VARIANT_SEPARATORS = (',', '/', ';')
+
+# Окончания, замена которых меняет форму слова (work → works, watched →
+# watches), а не является опечаткой
+INFLECTION_ENDINGS = frozenset({'', 's', 'es', 'd', 'ed', 'ing', 'e', 'y', 'ies', 'ied'})
+
+# Вердикты проверки ответа
+VERDICT_CORRECT = 'correct'
+VERDICT_ALMOST = 'almost'
+VERDICT_WRONG = 'wrong'
+
 def normalize_answer(answer):
-    """Нормализация ответа для более гибкой проверки"""
-    # Приводим к нижнему регистру
-    normalized = answer.lower().strip()
-    
-    # Удаляем лишние пробелы
-    normalized = ' '.join(normalized.split())
-    
-    # Для английских слов - убираем артикли в начале
-    articles = ['a ', 'an ', 'the ']
-    for article in articles:
-        if normalized.startswith(article):
-            normalized = normalized[len(article):]
-            break
+    """
+    Нормализация ответа для более гибкой проверки
+    
+    Одинаково применяется к правильным ответам (при разборе) и к ответам
+    пользователя. Строки не из ASCII проходят одну таблицу str.translate,
+    которая сразу дает нижний регистр, форму NFKC и замены (ё → е,
+    типографские апострофы и тире, кавычки). Длинные строки проходят
+    таблицу, только если TRANSLATED_PATTERN нашел в них заменяемый символ.
+    Затем пробелы схлопываются, знаки по краям отбрасываются, а артикль в
+    начале снимается вместе со знаками после него.
+    """
+    if answer.isascii():
+        normalized = answer.lower()
+    elif len(answer) <= SHORT_ANSWER_LENGTH or TRANSLATED_PATTERN.search(answer):
+        normalized = answer.translate(ANSWER_TRANSLATION)
+    else:
+        normalized = answer.lower()
+    
+    # Одно слово из букв: ни пробелов, ни знаков, ни артикля
+    if normalized.isalpha():
+        return normalized
     
-    # Убираем точку в конце, если есть
-    normalized = normalized.rstrip('.')
+    normalized = ' '.join(normalized.split()).strip(EDGE_CHARACTERS)
+    
+    # Для английских слов - убираем артикль в начале
+    if normalized.startswith(ARTICLES):
+        normalized = normalized.partition(' ')[2].lstrip(EDGE_CHARACTERS)
     
     return normalized
 
@@ -37,12 +115,9 @@ def parse_answer_variants(answer_string):
     Returns:
         список нормализованных вариантов ответа
     """
-    # Разделители для вариантов
-    separators = [',', '/', ';']
-    
     # Пробуем найти разделитель
     variants = [answer_string]
-    for separator in separators:
+    for separator in VARIANT_SEPARATORS:
         if separator in answer_string:
             variants = answer_string.split(separator)
             break
@@ -56,15 +131,175 @@ def parse_answer_variants(answer_string):
     
     return normalized_variants
 
+def allowed_typos(length):
+    """Допустимое число опечаток для правильного ответа длины length"""
+    allowed = 0
+    for min_length, typos in ALMOST_CORRECT_TYPOS:
+        if length >= min_length:
+            allowed = typos
+    return allowed
+
+def changes_inflection(first, second):
+    """
+    Отличаются ли формы только окончаниями слов (work и works,
+    watched и watches) - это грамматическая ошибка, а не опечатка
+    """
+    first_tokens, second_tokens = first.split(), second.split()
+    if len(first_tokens) != len(second_tokens):
+        return False
+    for token1, token2 in zip(first_tokens, second_tokens):
+        if token1 == token2:
+            continue
+        prefix = len(os.path.commonprefix((token1, token2)))
+        if token1[prefix:] in INFLECTION_ENDINGS and token2[prefix:] in INFLECTION_ENDINGS:
+            return True
+    return False
+
+def bounded_edit_distance(first, second, max_distance):
+    """
+    Расстояние Дамерау-Левенштейна (с перестановкой соседних букв),
+    ограниченное сверху
+    
+    Считаются только клетки таблицы в полосе |i - j| <= max_distance, а
+    расчет прекращается, как только вся строка таблицы превысила порог,
+    поэтому время O(len(first) * max_distance) даже для длинных фраз.
+    
+    Returns:
+        расстояние или max_distance + 1, если оно больше max_distance
+    """
+    if first == second:
+        return 0
+    
+    limit = max_distance + 1
+    len1, len2 = len(first), len(second)
+    if abs(len1 - len2) > max_distance:
+        return limit
+    
+    # Три строки таблицы по кругу; вне полосы клетки равны limit
+    before_previous = [limit] * (len2 + 1)
+    previous = [j if j <= max_distance else limit for j in range(len2 + 1)]
+    current = [limit] * (len2 + 1)
+    
+    for i in range(1, len1 + 1):
+        low = max(1, i - max_distance)
+        high = min(len2, i + max_distance)
+        current[low - 1] = i if low == 1 and i <= max_distance else limit
+        if high < len2:
+            current[high + 1] = limit
+        
+        char1 = first[i - 1]
+        row_min = current[low - 1]
+        for j in range(low, high + 1):
+            char2 = second[j - 1]
+            distance = previous[j - 1] + (char1 != char2)
+            if previous[j] + 1 < distance:
+                distance = previous[j] + 1
+            if current[j - 1] + 1 < distance:
+                distance = current[j - 1] + 1
+            if (i > 1 and j > 1 and char1 == second[j - 2] and first[i - 2] == char2
+                    and before_previous[j - 2] + 1 < distance):
+                distance = before_previous[j - 2] + 1
+            current[j] = distance
+            if distance < row_min:
+                row_min = distance
+        
+        if row_min > max_distance:
+            return limit
+        before_previous, previous, current = previous, current, before_previous
+    
+    return min(previous[len2], limit)
+
+class AnswerMatcher:
+    """
+    Заранее разобранный правильный ответ
+    
+    Варианты нормализуются один раз и хранятся во frozenset вместе с
+    каноническими формами (сокращения раскрыты: doesn't → does not),
+    строка для показа тоже готова заранее, поэтому при проверке
+    разбирается только ответ пользователя.
+    """
+    
+    __slots__ = ('variants', 'canonical', 'display')
+    
+    def __init__(self, answer_string):
+        ordered = parse_answer_variants(answer_string)
+        self.variants = frozenset(ordered)
+        canonical = frozenset(map(canonical_form, ordered))
+        self.canonical = self.variants if canonical == self.variants else canonical
+        self.display = format_answer_variants(ordered)
+    
+    def matches(self, user_answer):
+        """
+        Проверка ответа пользователя
+        
+        Правильными считаются:
+        1. Один из вариантов правильного ответа
+        2. Несколько вариантов в любом порядке
+        3. Все варианты в любом порядке
+        
+        Варианты сравниваются в канонической форме, поэтому «does not work»
+        совпадает с «doesn't work».
+        """
+        user_variants = parse_answer_variants(user_answer)
+        
+        # Если пользователь ввел один вариант
+        if len(user_variants) == 1:
+            return canonical_form(user_variants[0]) in self.canonical
+        
+        # Все введенные варианты должны быть правильными
+        return bool(user_variants) and self.canonical.issuperset(map(canonical_form, user_variants))
+    
+    def is_almost(self, variant):
+        """
+        Отличается ли вариант (в канонической форме) от одного из правильных
+        не больше чем на допустимое число опечаток
+        
+        Замена вспомогательного глагола (do вместо does) или окончания
+        (work вместо works) опечаткой не считается.
+        """
+        for correct in self.canonical:
+            typos = allowed_typos(len(correct))
+            if (typos and bounded_edit_distance(variant, correct, typos) <= typos
+                    and not swaps_auxiliary(variant, correct)
+                    and not changes_inflection(variant, correct)):
+                return True
+        return False
+    
+    def grade(self, user_answer):
+        """
+        Вердикт проверки ответа
+        
+        Returns:
+            VERDICT_CORRECT, VERDICT_ALMOST (все введенные варианты правильные
+            или с опечатками в пределах допуска) или VERDICT_WRONG
+        """
+        user_variants = parse_answer_variants(user_answer)
+        if not user_variants:
+            return VERDICT_WRONG
+        
+        verdict = VERDICT_CORRECT
+        for variant in map(canonical_form, user_variants):
+            if variant in self.canonical:
+                continue
+            if not self.is_almost(variant):
+                return VERDICT_WRONG
+            verdict = VERDICT_ALMOST
+        return verdict
+
+@lru_cache(maxsize=ANSWER_CACHE_SIZE)
+def compile_answer(answer_string):
+    """
+    Разобранный правильный ответ (кэшируется для каждой строки ответа)
+    
+    Вкладки вызывают функцию для всех вопросов при начале теста или
+    набора упражнений, чтобы при проверке ответ уже был готов.
+    """
+    return AnswerMatcher(answer_string)
+
 def check_answer_match(user_answer, correct_answer):
     """
     Проверка соответствия ответа с учетом множественных вариантов
     
-    Правильными считаются:
-    1. Один из вариантов правильного ответа
-    2. Несколько вариантов в любом порядке
-    3. Все варианты в любом порядке
-    
     Args:
         user_answer: ответ пользователя
         correct_answer: правильный ответ (может содержать варианты через запятую/слеш)
@@ -72,38 +307,121 @@ def check_answer_match(user_answer, correct_answer):
     Returns:
         True если ответ правильный, False иначе
     """
-    # Получаем варианты правильного ответа
-    correct_variants = parse_answer_variants(correct_answer)
+    return compile_answer(correct_answer).matches(user_answer)
+
+def _encode_batch(user_answers, correct_answers):
+    """
+    Номера вариантов (в канонической форме) для пакетной проверки
     
-    # Получаем варианты ответа пользователя
-    user_variants = parse_answer_variants(user_answer)
+    Returns:
+        (допустимые ключи пар «номер ответа << 32 | номер варианта»,
+         номер различной строки для каждого ответа пользователя,
+         номера вариантов для каждой различной строки)
+    """
+    variant_ids = {}
+    valid_keys = []
+    for answer_id, answer in enumerate(correct_answers):
+        for variant in AnswerMatcher(answer).canonical:
+            variant_id = variant_ids.setdefault(variant, len(variant_ids))
+            valid_keys.append(answer_id << 32 | variant_id)
+    
+    # Каждая различная строка ответа разбирается один раз; неизвестный
+    # вариант получает номер, которого нет ни в одном правильном ответе
+    unknown = len(variant_ids)
+    string_codes = {}
+    unique_variants = []
+    row_codes = []
+    for user_answer in user_answers:
+        code = string_codes.get(user_answer)
+        if code is None:
+            code = string_codes[user_answer] = len(unique_variants)
+            unique_variants.append([
+                variant_ids.get(canonical_form(variant), unknown)
+                for variant in parse_answer_variants(user_answer)
+            ])
+        row_codes.append(code)
+    return valid_keys, row_codes, unique_variants
+
+def _match_batch_numpy(answer_ids, valid_keys, row_codes, unique_variants):
+    """Сравнение пар (ответ, вариант) массивами NumPy"""
+    lengths = np.fromiter(map(len, unique_variants), dtype=np.int64, count=len(unique_variants))
+    offsets = np.cumsum(lengths) - lengths
+    flat_variants = np.fromiter(
+        (variant_id for variants in unique_variants for variant_id in variants),
+        dtype=np.int64, count=int(lengths.sum())
+    )
     
-    # Если пользователь ввел один вариант
-    if len(user_variants) == 1:
-        # Проверяем, совпадает ли с одним из правильных вариантов
-        return user_variants[0] in correct_variants
+    codes = np.asarray(row_codes, dtype=np.int64)
+    ids = np.asarray(answer_ids, dtype=np.int64)
+    row_lengths = lengths[codes]
     
-    # Если пользователь ввел несколько вариантов
-    # Проверяем, что все введенные варианты есть в правильных
-    # и хотя бы один правильный вариант присутствует
-    user_set = set(user_variants)
-    correct_set = set(correct_variants)
+    # Разворачиваем строки по вариантам: (номер строки, номер варианта)
+    rows = np.repeat(np.arange(len(codes)), row_lengths)
+    positions = np.arange(int(row_lengths.sum())) - np.repeat(np.cumsum(row_lengths) - row_lengths, row_lengths)
+    variants = flat_variants[np.repeat(offsets[codes], row_lengths) + positions]
     
-    # Все введенные варианты должны быть правильными
-    return user_set.issubset(correct_set) and len(user_set) > 0
+    found = np.isin(ids[rows] << 32 | variants, np.asarray(valid_keys, dtype=np.int64))
+    missing = np.bincount(rows[~found], minlength=len(codes))
+    return (row_lengths > 0) & (missing == 0)
 
-def format_correct_answer(answer_string):
+def grade_answers_batch(user_answers, answer_ids, correct_answers, verdicts=False):
     """
-    Форматирование правильного ответа для отображения
+    Пакетная проверка журнала ответов (например, после исправления
+    ответа в exercises.txt)
+    
+    Различные строки разбираются по одному разу, варианты заменяются
+    номерами, а пары (номер ответа, номер варианта) сверяются с допустимыми
+    целиком массивами NumPy. Результат построчно совпадает с
+    check_answer_match, а при verdicts=True - с AnswerMatcher.grade.
     
     Args:
-        answer_string: строка с ответом
+        user_answers: ответы пользователя
+        answer_ids: номер правильного ответа в correct_answers для каждой строки
+        correct_answers: строки правильных ответов
+        verdicts: вернуть вердикты VERDICT_* вместо признаков правильности
     
     Returns:
-        отформатированная строка
+        массив bool (или вердиктов); без NumPy - список
     """
-    variants = parse_answer_variants(answer_string)
+    user_answers = list(user_answers)
+    answer_ids = list(answer_ids)
+    valid_keys, row_codes, unique_variants = _encode_batch(user_answers, correct_answers)
     
+    if np is not None:
+        matched = _match_batch_numpy(answer_ids, valid_keys, row_codes, unique_variants)
+        if not verdicts:
+            return matched
+        result = np.where(matched, VERDICT_CORRECT, VERDICT_WRONG).astype(object)
+        unmatched = np.flatnonzero(~matched).tolist()
+    else:
+        valid = set(valid_keys)
+        matched = []
+        for answer_id, code in zip(answer_ids, row_codes):
+            variants = unique_variants[code]
+            matched.append(bool(variants) and all(answer_id << 32 | variant in valid for variant in variants))
+        if not verdicts:
+            return matched
+        result = [VERDICT_CORRECT if is_correct else VERDICT_WRONG for is_correct in matched]
+        unmatched = [row for row, is_correct in enumerate(matched) if not is_correct]
+    
+    # Опечатки ищутся только среди неправильных, по разу на пару (строка, ответ)
+    matchers = {}
+    graded = {}
+    for row in unmatched:
+        answer_id = answer_ids[row]
+        key = (row_codes[row], answer_id)
+        if key not in graded:
+            matcher = matchers.get(answer_id)
+            if matcher is None:
+                matcher = matchers[answer_id] = AnswerMatcher(correct_answers[answer_id])
+            graded[key] = matcher.grade(user_answers[row])
+        result[row] = graded[key]
+    return result
+
+def format_answer_variants(variants):
+    """Строка для показа списка вариантов: «a», «a или b», «a, b или c»"""
+    if not variants:
+        return ""
     if len(variants) == 1:
         return variants[0]
     elif len(variants) == 2:
@@ -111,6 +429,18 @@ def format_correct_answer(answer_string):
     else:
         return ", ".join(variants[:-1]) + f" или {variants[-1]}"
 
+def format_correct_answer(answer_string):
+    """
+    Форматирование правильного ответа для отображения
+    
+    Args:
+        answer_string: строка с ответом
+    
+    Returns:
+        отформатированная строка
+    """
+    return compile_answer(answer_string).display
+
 def search_in_list(search_term, items, fields):
     """
     Поиск в списке словарей
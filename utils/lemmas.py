@@ -0,0 +1,108 @@
+"""
+Начальные формы английских слов
+"""
+
+# Неправильные формы: глаголы, множественное число, степени сравнения
+IRREGULAR_FORMS = {
+    'am': 'be', 'is': 'be', 'are': 'be', 'was': 'be', 'were': 'be', 'been': 'be', 'being': 'be',
+    'has': 'have', 'had': 'have', 'having': 'have',
+    'does': 'do', 'did': 'do', 'done': 'do',
+    'went': 'go', 'gone': 'go', 'goes': 'go',
+    'ate': 'eat', 'eaten': 'eat', 'began': 'begin', 'begun': 'begin',
+    'bought': 'buy', 'brought': 'bring', 'built': 'build', 'came': 'come',
+    'caught': 'catch', 'chose': 'choose', 'chosen': 'choose', 'drank': 'drink',
+    'drunk': 'drink', 'drove': 'drive', 'driven': 'drive', 'fell': 'fall',
+    'fallen': 'fall', 'felt': 'feel', 'found': 'find', 'flew': 'fly', 'flown': 'fly',
+    'forgot': 'forget', 'forgotten': 'forget', 'gave': 'give', 'given': 'give',
+    'got': 'get', 'gotten': 'get', 'grew': 'grow', 'grown': 'grow', 'heard': 'hear',
+    'held': 'hold', 'kept': 'keep', 'knew': 'know', 'known': 'know', 'left': 'leave',
+    'lent': 'lend', 'lost': 'lose', 'made': 'make', 'meant': 'mean', 'met': 'meet',
+    'paid': 'pay', 'ran': 'run', 'rang': 'ring', 'rung': 'ring', 'rode': 'ride',
+    'ridden': 'ride', 'rose': 'rise', 'risen': 'rise', 'said': 'say', 'sang': 'sing',
+    'sung': 'sing', 'sat': 'sit', 'saw': 'see', 'seen': 'see', 'sent': 'send',
+    'sold': 'sell', 'shook': 'shake', 'shaken': 'shake', 'shone': 'shine',
+    'slept': 'sleep', 'spent': 'spend', 'spoke': 'speak', 'spoken': 'speak',
+    'stood': 'stand', 'stole': 'steal', 'stolen': 'steal', 'swam': 'swim',
+    'swum': 'swim', 'taught': 'teach', 'took': 'take', 'taken': 'take',
+    'told': 'tell', 'thought': 'think', 'threw': 'throw', 'thrown': 'throw',
+    'understood': 'understand', 'woke': 'wake', 'woken': 'wake', 'wore': 'wear',
+    'worn': 'wear', 'won': 'win', 'wrote': 'write', 'written': 'write',
+    'broke': 'break', 'broken': 'break', 'drew': 'draw', 'drawn': 'draw',
+    'fought': 'fight', 'hid': 'hide', 'hidden': 'hide', 'led': 'lead', 'read': 'read',
+    'children': 'child', 'men': 'man', 'women': 'woman', 'people': 'person',
+    'feet': 'foot', 'teeth': 'tooth', 'mice': 'mouse', 'geese': 'goose',
+    'better': 'good', 'best': 'good', 'worse': 'bad', 'worst': 'bad',
+}
+
+# Окончания и возможные замены при их отбрасывании
+SUFFIX_RULES = (
+    ('ies', ('y',)),
+    ('ied', ('y',)),
+    ('ing', ('', 'e')),
+    ('est', ('', 'e')),
+    ('ed', ('', 'e')),
+    ('er', ('', 'e')),
+    ('es', ('',)),
+    ("'s", ('',)),
+    ('s', ('',)),
+)
+
+# Минимальная длина основы после отбрасывания окончания
+MIN_BASE_LENGTH = 3
+
+def lemma_candidates(token):
+    """
+    Возможные начальные формы слова в нижнем регистре
+    
+    Правила намеренно избыточны («running» → run, runn, running):
+    лишние варианты не совпадут со словами словаря, а нужный найдется
+    без морфологического словаря.
+    """
+    candidates = {token}
+    if token in IRREGULAR_FORMS:
+        candidates.add(IRREGULAR_FORMS[token])
+    
+    for suffix, replacements in SUFFIX_RULES:
+        if not token.endswith(suffix) or len(token) - len(suffix) < MIN_BASE_LENGTH:
+            continue
+        base = token[:-len(suffix)]
+        candidates.update(base + replacement for replacement in replacements)
+        # Удвоенная согласная: stopped → stop, bigger → big
+        if suffix in ('ing', 'ed', 'er', 'est') and base[-1] == base[-2]:
+            candidates.add(base[:-1])
+    return candidates
+
+# Обратная таблица неправильных форм: начальная форма → формы
+IRREGULAR_BY_LEMMA = {}
+for _form, _lemma in IRREGULAR_FORMS.items():
+    IRREGULAR_BY_LEMMA.setdefault(_lemma, []).append(_form)
+
+VOWEL_LETTERS = frozenset('aeiou')
+
+def word_forms(text):
+    """
+    Формы слова или выражения в нижнем регистре (изменяется первое слово)
+    
+    book → books, booked, booking; go → goes, went, gone, going;
+    look up → looks up, looked up, looking up
+    """
+    first, space, rest = text.partition(' ')
+    forms = {first}
+    forms.update(IRREGULAR_BY_LEMMA.get(first, ()))
+    
+    if first.isalpha() and len(first) >= 2:
+        if first.endswith('y') and first[-2] not in VOWEL_LETTERS:
+            forms.update((first[:-1] + 'ies', first[:-1] + 'ied', first + 'ing'))
+        else:
+            plural = 'es' if first.endswith(('s', 'x', 'z', 'ch', 'sh', 'o')) else 's'
+            forms.add(first + plural)
+            if first.endswith('e'):
+                forms.update((first + 'd', first[:-1] + 'ing'))
+            else:
+                forms.update((first + 'ed', first + 'ing'))
+                # Удвоение согласной: stop → stopped, stopping
+                if (len(first) >= 3 and first[-1] not in VOWEL_LETTERS and first[-1] not in 'wxy'
+                        and first[-2] in VOWEL_LETTERS and first[-3] not in VOWEL_LETTERS):
+                    forms.update((first + first[-1] + 'ed', first + first[-1] + 'ing'))
+    
+    return {form + space + rest for form in forms}
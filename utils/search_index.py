@@ -0,0 +1,279 @@
+"""
+Поисковый индекс словаря
+"""
+
+from config import FUZZY_MAX_DISTANCE
+from utils.stemmer import is_russian, stem_russian
+from utils.text_index import tokenize
+
+SEARCH_FIELDS = ('word', 'translation')
+VARIANT_SEPARATORS = str.maketrans({',': '\n', '/': '\n', ';': '\n'})
+NGRAM_SIZE = 3
+
+# Ранги совпадений: чем меньше, тем выше в выдаче
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_STEM = 2
+RANK_SUBSTRING = 3
+
+class WordSearchIndex:
+    """
+    Индекс для поиска по английским словам и переводам
+    
+    Ключи индекса - значения полей word и translation в нижнем регистре,
+    а также отдельные варианты перевода ("кот, кошка" → "кот", "кошка").
+    Префиксный поиск идет по дереву (trie), поиск подстроки - по индексу
+    триграмм, поэтому время запроса зависит от числа совпадений, а не от
+    размера словаря (кроме запросов из одной-двух букв: подстроку такой
+    длины ищет просмотр всех ключей). Поиск с опечатками обходит то же дерево.
+    
+    Русские ключи дополнительно индексируются по основам слов, поэтому
+    «книги» и «кошку» находят «книга» и «кошка».
+    """
+    
+    def __init__(self, words=()):
+        self._keys = []
+        self._key_words = []
+        self._key_ids = {}
+        self._trie = {}
+        self._ngrams = {}
+        self._stem_keys = {}
+        self._stem_tokens = {}
+        for index, word in enumerate(words):
+            self.add(index, word)
+    
+    def __len__(self):
+        return len(self._keys)
+    
+    @staticmethod
+    def normalize(text):
+        """Приведение строки к виду, в котором она хранится в индексе"""
+        return ' '.join(text.lower().split())
+    
+    @staticmethod
+    def keys_for(word):
+        """Ключи индекса для слова"""
+        keys = set()
+        for field in SEARCH_FIELDS:
+            value = WordSearchIndex.normalize(word.get(field, ''))
+            if not value:
+                continue
+            keys.add(value)
+            for variant in value.translate(VARIANT_SEPARATORS).split('\n'):
+                variant = variant.strip()
+                if variant:
+                    keys.add(variant)
+        return keys
+    
+    def add(self, word_index, word):
+        """Добавить слово с индексом word_index в словаре"""
+        for key in WordSearchIndex.keys_for(word):
+            self._add_key(key, word_index)
+    
+    def _add_key(self, key, word_index):
+        """Добавить ключ в дерево и индекс n-грамм"""
+        key_id = len(self._keys)
+        self._keys.append(key)
+        self._key_words.append(word_index)
+        self._key_ids.setdefault(key, []).append(key_id)
+        
+        node = self._trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault('', []).append(key_id)
+        
+        for ngram in {key[i:i + NGRAM_SIZE] for i in range(len(key) - NGRAM_SIZE + 1)}:
+            self._ngrams.setdefault(ngram, []).append(key_id)
+        
+        stems = WordSearchIndex.stems(key)
+        if stems:
+            self._stem_keys.setdefault(' '.join(stems), []).append(key_id)
+            for stem in set(stems):
+                self._stem_tokens.setdefault(stem, []).append(key_id)
+    
+    @staticmethod
+    def stems(text):
+        """Основы слов русского текста (пустой список для английского)"""
+        tokens = tokenize(text)
+        if not any(is_russian(token) for token in tokens):
+            return []
+        return [stem_russian(token) for token in tokens]
+    
+    def _prefix_key_ids(self, prefix):
+        """Все ключи, начинающиеся с prefix (обход поддерева)"""
+        node = self._trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        
+        key_ids = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for char, child in node.items():
+                if char == '':
+                    key_ids.extend(child)
+                else:
+                    stack.append(child)
+        return key_ids
+    
+    def _substring_key_ids(self, query):
+        """
+        Ключи, содержащие query (кандидаты по самой редкой триграмме;
+        запрос короче триграммы сверяется со всеми ключами)
+        """
+        if len(query) < NGRAM_SIZE:
+            return [key_id for key_id, key in enumerate(self._keys) if query in key]
+        
+        postings = []
+        for i in range(len(query) - NGRAM_SIZE + 1):
+            posting = self._ngrams.get(query[i:i + NGRAM_SIZE])
+            if posting is None:
+                return []
+            postings.append(posting)
+        
+        candidates = min(postings, key=len)
+        return [key_id for key_id in candidates if query in self._keys[key_id]]
+    
+    def _stem_key_ids(self, query):
+        """Ключи, содержащие все слова запроса с точностью до окончаний"""
+        stems = WordSearchIndex.stems(query)
+        if not stems:
+            return []
+        
+        postings = []
+        for stem in set(stems):
+            posting = self._stem_tokens.get(stem)
+            if posting is None:
+                return []
+            postings.append(posting)
+        
+        postings.sort(key=len)
+        if len(postings) == 1:
+            return postings[0]
+        return set(postings[0]).intersection(*postings[1:])
+    
+    def search(self, query, limit=None):
+        """
+        Поиск слов
+        
+        Args:
+            query: строка поиска
+            limit: максимальное количество результатов (None - все)
+        
+        Returns:
+            список индексов слов: сначала точные совпадения, затем по
+            префиксу, по основам русских слов и по подстроке
+        """
+        query = WordSearchIndex.normalize(query)
+        if not query:
+            return []
+        
+        best = {}
+        
+        def collect(key_ids, rank):
+            for key_id in key_ids:
+                word_index = self._key_words[key_id]
+                order = (rank, len(self._keys[key_id]), word_index)
+                if word_index not in best or order < best[word_index]:
+                    best[word_index] = order
+        
+        collect(self._key_ids.get(query, ()), RANK_EXACT)
+        collect(self._prefix_key_ids(query), RANK_PREFIX)
+        collect(self._stem_key_ids(query), RANK_STEM)
+        collect(self._substring_key_ids(query), RANK_SUBSTRING)
+        
+        ranked = sorted(best, key=best.get)
+        return ranked if limit is None else ranked[:limit]
+    
+    def reverse_lookup(self, translation):
+        """
+        Обратный поиск: слова, у которых один из вариантов перевода совпадает
+        с одним из вариантов translation с точностью до окончаний
+        
+        Returns:
+            список индексов слов
+        """
+        word_indices = []
+        value = WordSearchIndex.normalize(translation)
+        for variant in value.translate(VARIANT_SEPARATORS).split('\n'):
+            stems = WordSearchIndex.stems(variant)
+            for key_id in self._stem_keys.get(' '.join(stems), ()) if stems else ():
+                word_index = self._key_words[key_id]
+                if word_index not in word_indices:
+                    word_indices.append(word_index)
+        return word_indices
+    
+    def find_word(self, word, words):
+        """
+        Индекс слова словаря words, английское написание которого совпадает
+        с word (без учета регистра и лишних пробелов), или None
+        """
+        key = WordSearchIndex.normalize(word)
+        for key_id in self._key_ids.get(key, ()):
+            word_index = self._key_words[key_id]
+            if (word_index < len(words)
+                    and WordSearchIndex.normalize(words[word_index]['word']) == key):
+                return word_index
+        return None
+    
+    def fuzzy_search(self, query, max_distance=FUZZY_MAX_DISTANCE, limit=None):
+        """
+        Поиск слов с опечатками
+        
+        Дерево ключей обходится вместе с таблицей расстояния Дамерау-Левенштейна
+        (вставка, удаление, замена, перестановка соседних букв): строка таблицы
+        считается один раз на узел, и ветка отбрасывается, как только минимум
+        строки превысит max_distance. Поэтому просматривается лишь малая часть
+        дерева, а не весь словарь.
+        
+        Args:
+            query: строка поиска
+            max_distance: максимальное число опечаток
+            limit: максимальное количество результатов (None - все)
+        
+        Returns:
+            список индексов слов по возрастанию числа опечаток
+        """
+        query = WordSearchIndex.normalize(query)
+        if not query or max_distance <= 0:
+            return []
+        
+        size = len(query)
+        best = {}
+        first_row = list(range(size + 1))
+        stack = [(char, child, first_row, None, '')
+                 for char, child in self._trie.items() if char != '']
+        
+        while stack:
+            char, node, previous_row, before_previous, previous_char = stack.pop()
+            
+            row = [previous_row[0] + 1]
+            for column in range(1, size + 1):
+                query_char = query[column - 1]
+                distance = min(
+                    row[column - 1] + 1,
+                    previous_row[column] + 1,
+                    previous_row[column - 1] + (query_char != char)
+                )
+                # Перестановка двух соседних букв
+                if (before_previous is not None and column > 1 and query_char == previous_char
+                        and query[column - 2] == char):
+                    distance = min(distance, before_previous[column - 2] + 1)
+                row.append(distance)
+            
+            if row[size] <= max_distance and '' in node:
+                for key_id in node['']:
+                    word_index = self._key_words[key_id]
+                    order = (row[size], len(self._keys[key_id]), word_index)
+                    if word_index not in best or order < best[word_index]:
+                        best[word_index] = order
+            
+            if min(row) <= max_distance:
+                for child_char, child in node.items():
+                    if child_char != '':
+                        stack.append((child_char, child, row, previous_row, char))
+        
+        ranked = sorted(best, key=best.get)
+        return ranked if limit is None else ranked[:limit]
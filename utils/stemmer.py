@@ -0,0 +1,57 @@
+"""
+Компактный стеммер для русских слов
+"""
+
+VOWELS = frozenset('аеиоуыэюя')
+CYRILLIC = frozenset('абвгдежзийклмнопрстуфхцчшщъыьэюя')
+
+REFLEXIVE_ENDINGS = ('ся', 'сь')
+
+# Окончания прилагательных, причастий, глаголов и существительных
+# (упрощенный набор из алгоритма Портера для русского языка)
+ENDINGS = tuple(sorted({
+    # прилагательные
+    'ее', 'ие', 'ые', 'ое', 'ими', 'ыми', 'ей', 'ий', 'ый', 'ой', 'ем', 'им', 'ым',
+    'ом', 'его', 'ого', 'ему', 'ому', 'их', 'ых', 'ую', 'юю', 'ая', 'яя', 'ою', 'ею',
+    # глаголы
+    'ла', 'на', 'ете', 'йте', 'ли', 'й', 'л', 'н', 'ло', 'но', 'ет', 'ют', 'ны', 'ть',
+    'ешь', 'ила', 'ыла', 'ена', 'ейте', 'уйте', 'ите', 'или', 'ыли', 'уй', 'ил', 'ыл',
+    'ен', 'ило', 'ыло', 'ено', 'ят', 'ует', 'уют', 'ит', 'ыт', 'ены', 'ить', 'ыть',
+    'ишь', 'ю',
+    # существительные
+    'а', 'ев', 'ов', 'ье', 'е', 'иями', 'ями', 'ами', 'еи', 'ии', 'и', 'ией', 'ий',
+    'иям', 'ям', 'ием', 'ам', 'о', 'у', 'ах', 'иях', 'ях', 'ы', 'ь', 'ию', 'ью',
+    'ия', 'ья', 'я',
+}, key=len, reverse=True))
+
+# Основа не короче двух букв, чтобы короткие слова не сливались
+MIN_STEM_LENGTH = 2
+
+def is_russian(word):
+    """Состоит ли слово из русских букв"""
+    return bool(word) and all(char in CYRILLIC or char == 'ё' for char in word)
+
+def stem_russian(word):
+    """
+    Основа русского слова: «книги», «книгу», «книгами» → «книг»
+    
+    Окончание (самое длинное из подходящих) отрезается только после первой
+    гласной, как в области RV алгоритма Портера. Слова не на русском
+    возвращаются без изменений.
+    """
+    word = word.lower().replace('ё', 'е')
+    if not is_russian(word):
+        return word
+    
+    region = next((i + 1 for i, char in enumerate(word) if char in VOWELS), len(word))
+    min_length = max(region, MIN_STEM_LENGTH)
+    
+    for ending in REFLEXIVE_ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= min_length:
+            word = word[:-len(ending)]
+            break
+    
+    for ending in ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= min_length:
+            return word[:-len(ending)]
+    return word
@@ -0,0 +1,147 @@
+"""
+Полнотекстовый индекс правил и упражнений
+"""
+
+import math
+import re
+
+TOKEN_PATTERN = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)*")
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+TOKEN_TRANSLATION = str.maketrans({'’': "'", '‘': "'", 'ё': 'е'})
+
+# Вес совпадения в заголовке правила относительно совпадения в тексте
+TITLE_WEIGHT = 3.0
+
+# Во сколько раз совпадение целой фразы ценнее совпадения отдельных слов
+PHRASE_BOOST = 2.0
+
+def tokenize(text):
+    """Разбиение текста на слова в нижнем регистре (ё → е, ’ → ')"""
+    return TOKEN_PATTERN.findall(text.lower().translate(TOKEN_TRANSLATION))
+
+class TextIndex:
+    """
+    Инвертированный индекс с позициями слов
+    
+    Для каждого слова хранится {документ: [вес, позиции]}. Позиции нужны
+    для поиска фраз в кавычках, вес - для ранжирования (совпадения в
+    заголовке весят больше). Документом может быть любой хэшируемый ключ:
+    номер правила или пара (тема, номер упражнения).
+    """
+    
+    def __init__(self):
+        self._postings = {}
+        self._lengths = {}
+        self._order = {}
+    
+    def __len__(self):
+        return len(self._order)
+    
+    def add(self, doc_id, text, weight=1.0):
+        """
+        Добавить текст к документу doc_id
+        
+        Текст можно добавлять по частям (заголовок, тело): между частями
+        остается пропуск позиции, чтобы фраза не склеивалась через границу.
+        """
+        self._order.setdefault(doc_id, len(self._order))
+        start = self._lengths.get(doc_id, 0)
+        tokens = tokenize(text)
+        
+        for offset, token in enumerate(tokens):
+            docs = self._postings.setdefault(token, {})
+            entry = docs.get(doc_id)
+            if entry is None:
+                entry = docs[doc_id] = [0.0, []]
+            entry[0] += weight
+            entry[1].append(start + offset)
+        
+        self._lengths[doc_id] = start + len(tokens) + 1
+    
+    def _idf(self, token):
+        """Редкость слова: чем реже встречается, тем ценнее совпадение"""
+        return math.log(1 + len(self._order) / len(self._postings[token]))
+    
+    def _term_scores(self, token):
+        """Оценки документов, содержащих слово"""
+        docs = self._postings.get(token)
+        if not docs:
+            return {}
+        idf = self._idf(token)
+        return {doc_id: entry[0] * idf for doc_id, entry in docs.items()}
+    
+    def _phrase_scores(self, tokens):
+        """Оценки документов, содержащих слова фразы подряд"""
+        postings = [self._postings.get(token) for token in tokens]
+        if not all(postings):
+            return {}
+        
+        idf = sum(self._idf(token) for token in tokens)
+        rarest = min(postings, key=len)
+        scores = {}
+        for doc_id in rarest:
+            if not all(doc_id in docs for docs in postings):
+                continue
+            following = [set(docs[doc_id][1]) for docs in postings[1:]]
+            matches = sum(
+                all(start + shift in positions for shift, positions in enumerate(following, 1))
+                for start in postings[0][doc_id][1]
+            )
+            if matches:
+                scores[doc_id] = matches * idf * PHRASE_BOOST
+        return scores
+    
+    def search(self, query, limit=None):
+        """
+        Поиск документов
+        
+        Слова запроса должны встретиться все (в любом месте документа),
+        фраза в кавычках - подряд: since "have been".
+        
+        Args:
+            query: строка поиска
+            limit: максимальное количество результатов (None - все)
+        
+        Returns:
+            список документов по убыванию релевантности
+        """
+        clauses = []
+        for phrase, word in QUERY_PATTERN.findall(query):
+            tokens = tokenize(phrase or word)
+            if len(tokens) > 1 and phrase:
+                clauses.append(self._phrase_scores(tokens))
+            else:
+                clauses.extend(self._term_scores(token) for token in tokens)
+        
+        if not clauses:
+            return []
+        
+        clauses.sort(key=len)
+        totals = dict(clauses[0])
+        for scores in clauses[1:]:
+            totals = {doc_id: total + scores[doc_id]
+                      for doc_id, total in totals.items() if doc_id in scores}
+            if not totals:
+                return []
+        
+        ranked = sorted(totals, key=lambda doc_id: (-totals[doc_id], self._order[doc_id]))
+        return ranked if limit is None else ranked[:limit]
+    
+    @staticmethod
+    def for_rules(rule_book):
+        """Индекс заголовков и текстов правил (документ - номер правила)"""
+        index = TextIndex()
+        for rule_index, (title, content) in enumerate(zip(rule_book.titles, rule_book.iter_contents())):
+            index.add(rule_index, title, TITLE_WEIGHT)
+            index.add(rule_index, content)
+        return index
+    
+    @staticmethod
+    def for_exercises(exercise_bank):
+        """Индекс предложений и подсказок упражнений (документ - (тема, номер))"""
+        index = TextIndex()
+        for topic, exercises in exercise_bank.iter_topics():
+            for number, exercise in enumerate(exercises):
+                index.add((topic, number), exercise['sentence'])
+                index.add((topic, number), exercise['hint'])
+        return index